@@ -0,0 +1,71 @@
+"""
+Gunicorn config for serving goal_maven in production.
+
+Run with ``gunicorn -c config/gunicorn.py``. Every value can be set from
+the environment; see the README for the serving modes and their
+measured throughput.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+
+# WSGI runs threaded workers; ASGI runs uvicorn workers on config.asgi.
+asgi = os.environ.get('GUNICORN_ASGI', 'false').lower() in ('1', 'true', 'yes')
+wsgi_app = 'config.asgi:application' if asgi else 'config.wsgi:application'
+worker_class = 'uvicorn.workers.UvicornWorker' if asgi else 'gthread'
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get(
+    'GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1,
+))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Each thread holds at most one database connection, so a threaded
+# worker's pool never needs more connections than it has threads. Uvicorn
+# workers serve requests concurrently on one thread, with the async stats
+# views holding a connection per query they run at once.
+os.environ.setdefault(
+    'DB_POOL_MAX_SIZE',
+    os.environ.get('GUNICORN_ASGI_POOL_SIZE', '10') if asgi else str(threads),
+)
+
+# Load Django once in the master so workers share its memory pages.
+# Code changes then need a new master: send USR2 to start one alongside
+# the old, then TERM to the old master once the new workers are up.
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers after a while to bound the growth of per-process caches.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def pre_fork(server, worker):
+    """Close connections the master opened while loading, before forking."""
+    from django.db import connections
+
+    connections.close_all()
+
+
+def on_starting(server):
+    """Refuse to run several workers on a cache each worker keeps apart.
+
+    Token users, season revisions and cached responses would then differ
+    between workers, each missing the writes seen by the others.
+    """
+    from django.conf import settings
+
+    backend = settings.CACHES['default']['BACKEND']
+    if server.cfg.workers > 1 and backend.endswith('.LocMemCache'):
+        raise RuntimeError(
+            f'{server.cfg.workers} workers cannot share the {backend} cache, '
+            'set CACHE_BACKEND and CACHE_LOCATION to a shared cache or run '
+            'a single worker.'
+        )
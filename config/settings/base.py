@@ -52,6 +52,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'goal_maven.core.middleware.QueryProfilingMiddleware',
+    'goal_maven.core.middleware.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,18 +86,86 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+# Connections closed at the end of a request go back to a pool of up to
+# DB_POOL_MAX_SIZE per process, checked with a round trip before reuse.
+# DB_POOL_MAX_SIZE=0 connects per request; DB_CONN_MAX_AGE keeps a
+# connection on its thread across requests instead.
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'goal_maven.core.db',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', 0),
+        'POOL': {
+            'MAX_SIZE': env.int('DB_POOL_MAX_SIZE', 10),
+            'TIMEOUT': env.float('DB_POOL_TIMEOUT', 10.0),
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'goal-maven'),
     }
 }
 
 
+# Query profiling
+# Fraction of requests profiled by QueryProfilingMiddleware, 0 turns it off.
+
+QUERY_PROFILING_SAMPLE_RATE = env.float('QUERY_PROFILING_SAMPLE_RATE', 0.0)
+
+
+# N+1 detection
+# Requests running one query shape more than NPLUSONE_THRESHOLD times are
+# logged, or fail when NPLUSONE_RAISE is set. 0 turns detection off.
+
+NPLUSONE_THRESHOLD = env.int('NPLUSONE_THRESHOLD', 0)
+NPLUSONE_RAISE = env.bool('NPLUSONE_RAISE', False)
+
+TEST_RUNNER = 'goal_maven.core.test_runner.NPlusOneTestRunner'
+
+
+# Token authentication cache
+# Seconds CachedTokenAuthentication keeps token users in the shared cache
+# and in each process. Other processes see a deactivated user within the
+# local timeout.
+
+TOKEN_AUTH_CACHE_TIMEOUT = env.int('TOKEN_AUTH_CACHE_TIMEOUT', 60)
+TOKEN_AUTH_LOCAL_CACHE_TIMEOUT = env.int('TOKEN_AUTH_LOCAL_CACHE_TIMEOUT', 5)
+
+
+# Logging
+# https://docs.djangoproject.com/en/3.2/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'goal_maven': {
+            'handlers': ['console'],
+            'level': os.environ.get('GOAL_MAVEN_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -143,6 +213,8 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'goal_maven.core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
     # 'DEFAULT_AUTHENTICATION_CLASSES': (
     #            'rest_framework.authentication.TokenAuthentication',
     # ),
@@ -1,3 +1,4 @@
 from .base import *  # noqa
 from .base import env
 
+ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["localhost", "127.0.0.1"])
@@ -1,11 +1,160 @@
 """
 Django admin customization.
 """
+import ast
+import functools
+import inspect
+import textwrap
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import FieldDoesNotExist
+from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
 from goal_maven.core import models
+from goal_maven.core.pagination import EstimatedCountPaginator
+
+
+# Query string parameter holding the primary key a keyset page starts after.
+KEYSET_VAR = 'after'
+
+
+def relation_field(model, name):
+    """Get the forward foreign key or one-to-one field of a model by name."""
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if (field.many_to_one or field.one_to_one) and field.concrete:
+        return field
+
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def str_relations(model, seen=frozenset()) -> tuple:
+    """Get the select_related paths the __str__ of a model follows.
+
+    Read from the source of __str__, so only relations reached as
+    self.<field> are found.
+    """
+    try:
+        source = textwrap.dedent(inspect.getsource(model.__str__))
+    except (OSError, TypeError):
+        return ()
+    paths = []
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.Attribute) or not isinstance(
+            node.value, ast.Name,
+        ) or node.value.id != 'self':
+            continue
+        field = relation_field(model, node.attr)
+        if field is not None and field.related_model not in seen:
+            paths += related_paths(field, seen | {model})
+
+    return tuple(dict.fromkeys(paths))
+
+
+def related_paths(field, seen=frozenset()) -> list:
+    """Get the paths to select a relation together with its __str__ ones."""
+    return [field.name] + [
+        f'{field.name}__{path}'
+        for path in str_relations(field.related_model, seen)
+    ]
+
+
+def list_display_relations(model, list_display) -> list:
+    """Get the select_related paths a changelist showing list_display needs."""
+    paths = []
+    for name in list_display:
+        if name == '__str__':
+            paths += str_relations(model)
+            continue
+        field = relation_field(model, name) if isinstance(name, str) else None
+        if field is not None:
+            paths += related_paths(field)
+
+    return list(dict.fromkeys(paths))
+
+
+class ModelAdmin(admin.ModelAdmin):
+    """Admin joining the relations its pages and choices display."""
+
+    def get_list_select_related(self, request):
+        if self.list_select_related is not False:
+            return self.list_select_related
+
+        return list_display_relations(self.model, self.get_list_display(request))
+
+    def get_queryset(self, request):
+        """Join what __str__ and the changelist columns show.
+
+        The changelist only applies list_select_related to querysets
+        without joins, so both sets of paths are joined here.
+        """
+        queryset = super().get_queryset(request)
+        list_select_related = self.get_list_select_related(request)
+        if list_select_related is True:
+            return queryset.select_related()
+        paths = list(str_relations(self.model)) + list(list_select_related or [])
+
+        return queryset.select_related(*dict.fromkeys(paths)) if paths else queryset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        paths = str_relations(db_field.related_model)
+        if paths and 'queryset' not in kwargs:
+            queryset = self.get_field_queryset(kwargs.get('using'), db_field, request)
+            if queryset is None:
+                queryset = db_field.remote_field.model._default_manager.all()
+            kwargs['queryset'] = queryset.select_related(*paths)
+
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class KeysetChangeList(ChangeList):
+    """Changelist which can page forward by primary key instead of offset."""
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYSET_VAR, None)
+
+        return lookup_params
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        after = self.params.get(KEYSET_VAR)
+        if after:
+            try:
+                queryset = queryset.filter(pk__gt=after)
+            except ValueError as e:
+                raise IncorrectLookupParameters(e)
+
+        return queryset
+
+    def next_page_url(self):
+        """Get the URL of the page after this one by key, None on the last."""
+        ordering = list(dict.fromkeys(self.queryset.query.order_by))
+        if not self.multi_page or ordering not in (['pk'], [self.lookup_opts.pk.name]):
+            return None
+        results = list(self.result_list)
+        if len(results) < self.list_per_page:
+            return None
+
+        return self.get_query_string({KEYSET_VAR: results[-1].pk})
+
+
+class LargeTableAdmin(ModelAdmin):
+    """Admin for tables too large to count exactly or page by offset."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
 
 
 class UserAdmin(BaseUserAdmin):
@@ -53,7 +202,7 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
-class ContinentAdmin(admin.ModelAdmin):
+class ContinentAdmin(ModelAdmin):
     """Define the admin pages for Continents."""
 
     def has_permission(self, request):
@@ -67,7 +216,7 @@ class ContinentAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class NationAdmin(admin.ModelAdmin):
+class NationAdmin(ModelAdmin):
     """Define the admin pages for Nations."""
     ordering = ['nation_id']
     list_display = ['nation_name']
@@ -77,7 +226,7 @@ class NationAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class CityAdmin(admin.ModelAdmin):
+class CityAdmin(ModelAdmin):
     """Define the admin pages for Cities."""
     ordering = ['city_id']
     list_display = ['city_name']
@@ -87,7 +236,7 @@ class CityAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class StadiumAdmin(admin.ModelAdmin):
+class StadiumAdmin(ModelAdmin):
     """Define the admin pages for Stadiums."""
     ordering = ['stadium_id']
     list_display = ['stadium_name', 'capacity', 'city']
@@ -97,7 +246,7 @@ class StadiumAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class TeamAdmin(admin.ModelAdmin):
+class TeamAdmin(ModelAdmin):
     """Define the admin pages for Teams."""
     ordering = ['team_id']
     list_display = ['team_name', 'manager', 'league']
@@ -109,7 +258,7 @@ class TeamAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class ManagerAdmin(admin.ModelAdmin):
+class ManagerAdmin(ModelAdmin):
     """Define the admin pages for Managers."""
     ordering = ['manager_id']
     list_display = ['manager_name', 'team', 'career_start']
@@ -122,10 +271,11 @@ class ManagerAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class PlayerAdmin(admin.ModelAdmin):
+class PlayerAdmin(ModelAdmin):
     """Define the admin pages for Players."""
     ordering = ['player_id']
     list_display = ['player_name', 'role', 'team', 'jersy_number']
+    search_fields = ['player_name']
     fieldsets = (
         (_('Details'), {'fields': (
             'player_name', 'jersy_number', 'team', 'date_of_birth',
@@ -135,7 +285,7 @@ class PlayerAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class PlayerRoleAdmin(admin.ModelAdmin):
+class PlayerRoleAdmin(ModelAdmin):
     """Define the admin pages for PlayerRoles."""
     ordering = ['role_id']
     list_display = ['role_name', 'role_key']
@@ -145,7 +295,7 @@ class PlayerRoleAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class RefereeAdmin(admin.ModelAdmin):
+class RefereeAdmin(ModelAdmin):
     """Define the admin pages for Referees."""
     ordering = ['referee_id']
     list_display = ['referee_name', 'nation', 'matches_officiated']
@@ -159,7 +309,7 @@ class RefereeAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class SeasonAdmin(admin.ModelAdmin):
+class SeasonAdmin(ModelAdmin):
     """Define the admin pages for Seasons."""
     ordering = ['season_id']
     list_display = ['season_name', 'start_date', 'end_date', 'is_concluded']
@@ -172,7 +322,7 @@ class SeasonAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class LeagueAdmin(admin.ModelAdmin):
+class LeagueAdmin(ModelAdmin):
     """Define the admin pages for Leagues."""
     ordering = ['league_id']
     list_display = ['league_name', 'nation', 'season', 'is_concluded', 'champion_team',
@@ -187,7 +337,7 @@ class LeagueAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class LeagueTableAdmin(admin.ModelAdmin):
+class LeagueTableAdmin(ModelAdmin):
     """Define the admin pages for LeagueTables."""
     ordering = ['table_id']
     list_display = ['position', 'team', 'points', 'matches_played', 'matches_won',
@@ -202,11 +352,13 @@ class LeagueTableAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class FixtureAdmin(admin.ModelAdmin):
+class FixtureAdmin(LargeTableAdmin):
     """Define the admin pages for Fixtures."""
     ordering = ['fixture_id']
     list_display = ['match_day', 'home_team', 'away_team', 'time', 'date',
                     'match_status']
+    list_filter = ['season', 'league', 'match_status']
+    search_fields = ['home_team__team_name', 'away_team__team_name']
     fieldsets = (
         (_('Details'), {'fields': (
             'season', 'league', 'match_day', 'home_team', 'away_team',
@@ -217,11 +369,14 @@ class FixtureAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class MatchAdmin(admin.ModelAdmin):
+class MatchAdmin(LargeTableAdmin):
     """Define the admin pages for Matches."""
     ordering = ['match_id']
     list_display = ['fixture', 'home_team_goals', 'away_team_goals',
-                    'result', 'winner_team']
+                    'result', 'winner_team', 'events']
+    list_filter = ['season', 'league']
+    search_fields = ['fixture__home_team__team_name', 'fixture__away_team__team_name']
+    autocomplete_fields = ['fixture']
     fieldsets = (
         (_('Details'), {'fields': (
             'fixture', 'attendance',
@@ -239,11 +394,21 @@ class MatchAdmin(admin.ModelAdmin):
     )
     readonly_fields = []
 
+    @admin.display(description=_('Events'))
+    def events(self, match):
+        """Link to the changelist of the events of a match."""
+        return format_html(
+            '<a href="{}?match__exact={}">{}</a>',
+            reverse('admin:core_matchevent_changelist'), match.pk, _('Events'),
+        )
 
-class MatchEventAdmin(admin.ModelAdmin):
+
+class MatchEventAdmin(LargeTableAdmin):
     """Define the admin pages for MatchEvents."""
     ordering = ['event_id']
     list_display = ['event_type', 'player', 'minute', 'match']
+    list_filter = ['event_type', 'season', 'league']
+    autocomplete_fields = ['match', 'player', 'associated_player']
     fieldsets = (
         (_('Details'), {'fields': (
             'event_type', 'match', 'player', 'minute', 'second',
@@ -253,7 +418,21 @@ class MatchEventAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class EventTypeAdmin(admin.ModelAdmin):
+class PlayerSeasonStatsAdmin(ModelAdmin):
+    """Define the admin pages for PlayerSeasonStats."""
+    ordering = ['stats_id']
+    list_display = ['player', 'season', 'goals', 'assists', 'appearances']
+    fieldsets = (
+        (_('Details'), {'fields': (
+            'player', 'season', 'goals', 'assists', 'fouls', 'yellow_cards',
+            'red_cards', 'shots_on', 'own_goals', 'appearances',
+        )}),
+    )
+    readonly_fields = ['goals', 'assists', 'fouls', 'yellow_cards', 'red_cards',
+                       'shots_on', 'own_goals', 'appearances']
+
+
+class EventTypeAdmin(ModelAdmin):
     """Define the admin pages for EventTypes."""
     ordering = ['event_type_id']
     list_display = ['event_name']
@@ -263,7 +442,7 @@ class EventTypeAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class PitchLocationAdmin(admin.ModelAdmin):
+class PitchLocationAdmin(ModelAdmin):
     """Define the admin pages for PitchLocations."""
     ordering = ['pitch_area_id']
     list_display = ['pitch_area_name']
@@ -273,7 +452,7 @@ class PitchLocationAdmin(admin.ModelAdmin):
     readonly_fields = []
 
 
-class MatchStatusAdmin(admin.ModelAdmin):
+class MatchStatusAdmin(ModelAdmin):
     """Define the admin pages for PitchLocations."""
     ordering = ['match_status_id']
     list_display = ['status_name']
@@ -299,6 +478,7 @@ admin.site.register(models.LeagueTable, LeagueTableAdmin)
 admin.site.register(models.Fixture, FixtureAdmin)
 admin.site.register(models.Match, MatchAdmin)
 admin.site.register(models.MatchEvent, MatchEventAdmin)
+admin.site.register(models.PlayerSeasonStats, PlayerSeasonStatsAdmin)
 admin.site.register(models.EventType, EventTypeAdmin)
 admin.site.register(models.PitchLocation, PitchLocationAdmin)
 admin.site.register(models.MatchStatus, MatchStatusAdmin)
@@ -6,3 +6,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goal_maven.core'
     # verbose_name = _("Users")
+
+    def ready(self):
+        from goal_maven.core import signals  # noqa: F401
@@ -0,0 +1,65 @@
+"""
+Async views running the independent queries of a request concurrently.
+"""
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import Http404, JsonResponse
+from django.views import View
+
+
+def run_query(query):
+    """Run a query callable, handing its thread's connections back after."""
+    try:
+        return query()
+    finally:
+        connections.close_all()
+
+
+async def gather_queries(*queries) -> list:
+    """Run query callables concurrently, each on its own thread and connection.
+
+    A request then waits for its slowest query rather than for all of
+    them in turn. Every query holds a pooled connection while it runs,
+    so the pool has to allow as many as a request gathers.
+    """
+    return await asyncio.gather(*[
+        sync_to_async(run_query, thread_sensitive=False)(query) for query in queries
+    ])
+
+
+async def run_sync_query(query):
+    """Run a single query callable off the event loop."""
+    return (await gather_queries(query))[0]
+
+
+class AsyncStatsView(View):
+    """Base of the async read-only stats views.
+
+    The stats APIs are public, so no authentication runs. Responses are
+    plain JSON, with Http404 rendered like the DRF views render it.
+    Django 3.2 only runs function views asynchronously, so as_view wraps
+    the view in a coroutine function.
+    """
+    http_method_names = ['get']
+    view_is_async = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return functools.update_wrapper(async_view, view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        except Http404 as error:
+            return JsonResponse({'detail': str(error) or 'Not found.'}, status=404)
@@ -0,0 +1,140 @@
+"""
+Token authentication with cached token lookups.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+LOCAL_TOKENS_SIZE = 10000
+
+# Token cache key -> (user, monotonic time the entry expires at).
+_local_tokens = {}
+_local_lock = threading.Lock()
+
+# Lookups of this process by the tier answering them.
+token_lookups = Counter()
+
+
+def token_cache_key(key) -> str:
+    """Get the shared cache key of a token, without the token itself."""
+    return f'auth-token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def token_cache_stats() -> dict:
+    """Get the token lookups of this process by tier and their hit rate."""
+    total = sum(token_lookups.values())
+    hits = token_lookups['local'] + token_lookups['shared']
+
+    return {
+        'local': token_lookups['local'],
+        'shared': token_lookups['shared'],
+        'database': token_lookups['database'],
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def shared_token_entry(user) -> dict:
+    """Get what the shared cache keeps of the user of a token.
+
+    Only the pk and the flags authentication checks are kept, never the
+    password hash or other credentials.
+    """
+    return {'pk': user.pk, 'is_active': user.is_active, 'is_staff': user.is_staff}
+
+
+def cached_token_user(key):
+    """Get the user of a token from this process or the shared cache, or None.
+
+    A shared cache hit reads the user by pk, which spares the token
+    lookup but keeps the user's fields out of the shared cache.
+    """
+    cache_key = token_cache_key(key)
+    with _local_lock:
+        entry = _local_tokens.get(cache_key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                token_lookups['local'] += 1
+                return copy.copy(entry[0])
+            del _local_tokens[cache_key]
+
+    entry = cache.get(cache_key)
+    if entry is None or not entry['is_active']:
+        return None
+    user = get_user_model().objects.filter(pk=entry['pk'], is_active=True).first()
+    if user is not None:
+        token_lookups['shared'] += 1
+        remember_token_user(cache_key, user)
+
+    return user
+
+
+def remember_token_user(cache_key, user):
+    """Keep the user of a token in this process for a few seconds.
+
+    The entry holds its own copy, so requests changing their user do not
+    change the one handed to later requests. It is never serialized.
+    """
+    now = time.monotonic()
+    with _local_lock:
+        if len(_local_tokens) >= LOCAL_TOKENS_SIZE:
+            for expired in [k for k, entry in _local_tokens.items() if entry[1] <= now]:
+                del _local_tokens[expired]
+            if len(_local_tokens) >= LOCAL_TOKENS_SIZE:
+                _local_tokens.clear()
+        _local_tokens[cache_key] = (
+            copy.copy(user), now + settings.TOKEN_AUTH_LOCAL_CACHE_TIMEOUT,
+        )
+
+
+def forget_tokens(keys):
+    """Drop tokens from this process and the shared cache."""
+    cache_keys = [token_cache_key(key) for key in keys]
+    with _local_lock:
+        for cache_key in cache_keys:
+            _local_tokens.pop(cache_key, None)
+    cache.delete_many(cache_keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication reading token users from a two tier cache.
+
+    Users are kept per process for TOKEN_AUTH_LOCAL_CACHE_TIMEOUT seconds,
+    and their pk and flags in the shared cache for TOKEN_AUTH_CACHE_TIMEOUT
+    seconds. Token deletes and user saves drop both tiers of the process
+    writing them, so other processes see a deactivated user within the
+    local timeout. request.auth is an unsaved Token carrying the key and
+    user.
+    """
+
+    def authenticate_credentials(self, key):
+        user = cached_token_user(key)
+        if user is None:
+            token_lookups['database'] += 1
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            user = token.user
+            if user.is_active:
+                cache.set(
+                    token_cache_key(key),
+                    shared_token_entry(user),
+                    settings.TOKEN_AUTH_CACHE_TIMEOUT,
+                )
+                remember_token_user(token_cache_key(key), user)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, Token(key=key, user=user))
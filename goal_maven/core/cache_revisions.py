@@ -0,0 +1,34 @@
+"""
+Revision counters kept in the cache to expire data cached under them.
+
+Readers cache data along with the revision it was read at and drop it
+once the revision has moved. Writers move a revision when they write and
+again when their transaction commits, so a reader caching the old rows
+before the write was visible does not keep them. Other processes only
+see a revision move when the cache backend is shared between them.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def cache_revision(key) -> int:
+    """Get the current value of a revision counter, starting it if missing.
+
+    Revisions start from the current time so that a counter lost by the
+    cache backend never restarts at a value which was already handed out.
+    """
+    revision = cache.get(key)
+    if revision is None:
+        cache.add(key, time.time_ns(), None)
+        revision = cache.get(key)
+
+    return revision
+
+
+def bump_cache_revision(key):
+    """Move a revision counter to a new value."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
@@ -0,0 +1,3 @@
+"""
+PostgreSQL backend returning connections to a per-process pool.
+"""
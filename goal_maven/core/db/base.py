@@ -0,0 +1,56 @@
+"""
+PostgreSQL database wrapper checking connections out of a per-process pool.
+"""
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgresDatabaseWrapper,
+)
+
+from goal_maven.core.db.creation import DatabaseCreation
+from goal_maven.core.db.pool import get_pool
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """PostgreSQL wrapper returning closed connections to a pool.
+
+    Configured by the POOL entry of the database settings, with MAX_SIZE
+    connections per process and a checkout TIMEOUT in seconds. Without a
+    MAX_SIZE it connects and closes like the stock backend. Django still
+    decides when a connection is closed through CONN_MAX_AGE; closing
+    only hands it back to the pool.
+    """
+    creation_class = DatabaseCreation
+
+    def pool(self, conn_params):
+        options = self.settings_dict.get('POOL') or {}
+        if not options.get('MAX_SIZE'):
+            return None
+
+        return get_pool(
+            self.alias, conn_params, options['MAX_SIZE'], options.get('TIMEOUT', 10),
+        )
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.checkout(lambda: super(
+            DatabaseWrapper, self,
+        ).get_new_connection(conn_params))
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level,
+        )
+        self.connection_pool = pool
+
+        return connection
+
+    def _close(self):
+        pool = getattr(self, 'connection_pool', None)
+        if self.connection is None or pool is None:
+            return super()._close()
+        self.connection_pool = None
+        # A connection closed inside an atomic block stays referenced until
+        # the block exits, so it cannot be handed to another thread.
+        if self.in_atomic_block:
+            pool.discard(self.connection)
+        else:
+            pool.checkin(self.connection)
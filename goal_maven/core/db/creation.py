@@ -0,0 +1,16 @@
+"""
+Test database creation for the pooled PostgreSQL backend.
+"""
+from django.db.backends.postgresql.creation import (
+    DatabaseCreation as PostgresDatabaseCreation,
+)
+
+from goal_maven.core.db.pool import close_pools
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        """Close the pooled connections to a test database before dropping it."""
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,30 @@
+"""
+Reading PostgreSQL query plans.
+"""
+import json
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def query_plan(sql, params=None, using=DEFAULT_DB_ALIAS, disabled=()) -> dict:
+    """Get the root node of the PostgreSQL EXPLAIN (FORMAT JSON) plan of a query.
+
+    disabled names planner settings, such as enable_seqscan, to turn off
+    for the rest of the transaction first.
+    """
+    with connections[using].cursor() as cursor:
+        for setting in disabled:
+            cursor.execute(f'SET LOCAL {setting} = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]['Plan']
+
+
+def plan_nodes(plan):
+    """Yield every node of a query plan."""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
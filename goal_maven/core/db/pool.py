@@ -0,0 +1,189 @@
+"""
+Per-process pools of PostgreSQL connections.
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No pooled connection was returned within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Up to max_size connections of one database, shared by the threads of a process.
+
+    Idle connections are checked with a round trip before being handed
+    out again and replaced when it fails. Checkouts past max_size wait up
+    to timeout seconds for a connection to be returned.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle = deque()
+        self.in_use = 0
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.counts = Counter()
+
+    def checkout(self, connect):
+        """Get a healthy connection, opening one with connect if none is idle."""
+        started = time.monotonic()
+        if not self.slots.acquire(timeout=self.timeout):
+            self.counts['timeouts'] += 1
+            raise PoolTimeout(
+                f'No connection returned to the pool within {self.timeout}s '
+                f'({self.max_size} in use).'
+            )
+        try:
+            connection = self.reuse()
+            if connection is None:
+                connection = connect()
+                self.counts['opened'] += 1
+        except BaseException:
+            self.slots.release()
+            raise
+        with self.lock:
+            self.in_use += 1
+        self.counts['wait_ms'] += round((time.monotonic() - started) * 1000)
+
+        return connection
+
+    def reuse(self):
+        """Get the most recently returned idle connection passing a health check."""
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection = self.idle.pop()
+            if self.healthy(connection):
+                self.counts['reused'] += 1
+                return connection
+            self.counts['discarded'] += 1
+            close_quietly(connection)
+
+    def healthy(self, connection) -> bool:
+        """Check a connection still reaches the server."""
+        if connection.closed:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+
+        return True
+
+    def checkin(self, connection):
+        """Return a connection, rolling back any transaction left open."""
+        try:
+            status = connection.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                raise psycopg2.InterfaceError('Connection lost.')
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            self.counts['discarded'] += 1
+            close_quietly(connection)
+        else:
+            with self.lock:
+                self.idle.append(connection)
+        self.release()
+
+    def discard(self, connection):
+        """Close a checked out connection instead of returning it."""
+        self.counts['discarded'] += 1
+        close_quietly(connection)
+        self.release()
+
+    def release(self):
+        with self.lock:
+            self.in_use -= 1
+        self.slots.release()
+
+    def close_idle(self):
+        """Close every idle connection."""
+        with self.lock:
+            idle, self.idle = list(self.idle), deque()
+        for connection in idle:
+            close_quietly(connection)
+
+    def stats(self) -> dict:
+        return {
+            'max_size': self.max_size,
+            'in_use': self.in_use,
+            'idle': len(self.idle),
+            'opened': self.counts['opened'],
+            'reused': self.counts['reused'],
+            'discarded': self.counts['discarded'],
+            'timeouts': self.counts['timeouts'],
+            'wait_ms': self.counts['wait_ms'],
+        }
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except psycopg2.Error:
+        pass
+
+
+# (alias, connection parameters) -> pool of this process.
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Pools inherited through a fork. Their sockets belong to the parent, so
+# they are kept referenced rather than closed, which would end the
+# parent's sessions.
+_inherited = []
+
+
+def get_pool(alias, conn_params, max_size, timeout) -> ConnectionPool:
+    """Get the pool of a database connection of this process, creating it."""
+    params = tuple(sorted((name, str(value)) for name, value in conn_params.items()))
+    key = (alias, params)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(max_size, timeout)
+
+    return pool
+
+
+def close_pools(database_name=None, alias=None):
+    """Close the idle connections of the pools of a database or alias, or all."""
+    with _pools_lock:
+        pools = [
+            pool for (pool_alias, params), pool in _pools.items()
+            if database_name is None or ('database', database_name) in params
+            if alias is None or pool_alias == alias
+        ]
+    for pool in pools:
+        pool.close_idle()
+
+
+def pool_stats() -> dict:
+    """Get the stats of the pools of this process by alias and database."""
+    with _pools_lock:
+        pools = list(_pools.items())
+
+    return {
+        f"{alias}:{dict(params).get('database', '')}": pool.stats()
+        for (alias, params), pool in pools
+    }
+
+
+def forget_inherited_pools():
+    with _pools_lock:
+        _inherited.extend(_pools.values())
+        _pools.clear()
+
+
+os.register_at_fork(after_in_child=forget_inherited_pools)
@@ -0,0 +1,11 @@
+"""
+Helpers shared by the benchmark commands.
+"""
+
+
+def percentile(values, fraction) -> float:
+    """Get a percentile of values by nearest rank."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+
+    return ordered[index]
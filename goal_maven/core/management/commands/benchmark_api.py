@@ -0,0 +1,408 @@
+"""
+Django command to benchmark every API route against the loaded dataset.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from goal_maven.core import models
+from goal_maven.core.authentication import token_cache_stats
+from goal_maven.core.db.pool import pool_stats
+from goal_maven.core.management.benchmarks import percentile
+
+
+# Budgets per URL name; '*' applies to every endpoint not listed.
+DEFAULT_BUDGETS = {
+    '*': {'queries': 10, 'p95_ms': 500, 'peak_kb': 20 * 1024},
+    'api-schema': {'queries': 10, 'p95_ms': 5000, 'peak_kb': 100 * 1024},
+    'player:player-season-stats': {'queries': 3, 'p95_ms': 100},
+    'team:team-season-stats': {'queries': 2, 'p95_ms': 100},
+    'team:league-team-stats': {'queries': 3, 'p95_ms': 250},
+}
+
+# Model of the pk of routes whose view has no queryset, by URL namespace.
+NAMESPACE_MODELS = {
+    'player': models.Player,
+    'team': models.Team,
+}
+
+
+def is_error(status_code) -> bool:
+    """Check whether a response status is a failed request."""
+    return not 200 <= status_code < 300
+
+
+class CacheKeyRecorder:
+    """Record the keys a cache backend is used with, to clear only those.
+
+    Clearing the whole cache would also drop the entries of every other
+    process sharing the backend.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.key_func = backend.key_func
+        self.keys = set()
+
+    def __enter__(self):
+        self.backend.key_func = self.make_key
+        return self
+
+    def __exit__(self, *exc_info):
+        self.backend.key_func = self.key_func
+
+    def make_key(self, key, key_prefix, version):
+        self.keys.add((key, version))
+        return self.key_func(key, key_prefix, version)
+
+    def clear(self):
+        """Delete every key used since the last clear."""
+        versions = defaultdict(list)
+        for key, version in self.keys:
+            versions[version].append(key)
+        for version, keys in versions.items():
+            self.backend.delete_many(keys, version=version)
+        self.keys = set()
+
+
+class Command(BaseCommand):
+    """Django command measuring latency, queries and memory per API route."""
+    help = 'Benchmark every GET API route and check it against budgets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=2,
+                            help='Unmeasured requests per endpoint.')
+        parser.add_argument('--warm', action='store_true',
+                            help='Keep the cache between requests.')
+        parser.add_argument('--budgets',
+                            help='JSON file of budgets overriding the defaults.')
+        parser.add_argument('--output',
+                            help='File to write the JSON results to, else stdout.')
+        parser.add_argument('--filter', default='',
+                            help='Only benchmark URL names containing this text.')
+        parser.add_argument('--url',
+                            help='Base URL of a running server to load instead of '
+                                 'calling the views in process.')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Requests in flight at once against --url.')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        budgets = dict(DEFAULT_BUDGETS)
+        if options['budgets']:
+            with open(options['budgets']) as f:
+                budgets.update(json.load(f))
+        self.options = options
+
+        if options['url']:
+            results = self.measure_server(budgets)
+        else:
+            with transaction.atomic(), CacheKeyRecorder(caches['default']) as keys:
+                self.cache_keys = keys
+                samples = self.sample_values()
+                client = self.client()
+                results = [
+                    self.measure(client, name, url, self.budget(budgets, name))
+                    for name, url in self.endpoints(samples, in_process=True)
+                    if options['filter'] in name
+                ]
+                transaction.set_rollback(True)
+                keys.clear()
+
+        report = json.dumps({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'iterations': options['iterations'],
+            'warm_cache': options['warm'] or bool(options['url']),
+            'server': options['url'],
+            'dataset': {
+                model.__name__: model.objects.count()
+                for model in [models.Season, models.Team, models.Player,
+                              models.Fixture, models.MatchEvent]
+            },
+            'endpoints': results,
+            'token_cache': token_cache_stats(),
+            'db_pools': pool_stats(),
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+        violations = [
+            f"{result['name']}: {violation}"
+            for result in results for violation in result['violations']
+        ]
+        if violations:
+            raise CommandError(
+                'Budgets exceeded:\n' + '\n'.join(violations)
+            )
+        self.stderr.write(self.style.SUCCESS(
+            f'{len(results)} endpoints within budget.'
+        ))
+
+    def budget(self, budgets, name) -> dict:
+        return {**budgets['*'], **budgets.get(name, {})}
+
+    def client(self) -> APIClient:
+        """Get a client authenticated by token as a throwaway staff user."""
+        token = self.create_token()
+        hosts = [
+            host for host in settings.ALLOWED_HOSTS
+            if '*' not in host and not host.startswith('.')
+        ]
+        client = APIClient(
+            raise_request_exception=False,
+            SERVER_NAME=hosts[0] if hosts else 'localhost',
+        )
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        return client
+
+    def create_token(self) -> Token:
+        """Create a throwaway staff user and its token.
+
+        Users are named per run, so a killed run leaving its user behind
+        does not stop later runs from creating theirs.
+        """
+        run = uuid.uuid4().hex[:12]
+        user = get_user_model().objects.create_user(
+            email=f'benchmark-{run}@example.com',
+            password='benchmark-password',
+            username=f'benchmark-{run}',
+            first_name='Benchmark',
+            last_name='User',
+            date_of_birth=date(2000, 1, 1),
+            is_staff=True,
+        )
+
+        return Token.objects.create(user=user)
+
+    def sample_values(self) -> dict:
+        """Pick route parameters exercising the busiest season of the dataset."""
+        table = models.LeagueTable.objects.filter(
+            position=1,
+        ).order_by('-season__number_of_matches', '-season_id').first()
+        if table is None:
+            raise CommandError('No league table found, load a dataset first.')
+        top_player = models.PlayerSeasonStats.objects.filter(
+            season_id=table.season_id,
+        ).order_by('-goals', 'player_id').first()
+
+        return {
+            'season_name': table.season.season_name,
+            'league_id': table.league_id,
+            models.Team: table.team_id,
+            models.League: table.league_id,
+            models.Season: table.season_id,
+            models.Player: top_player.player_id if top_player else None,
+        }
+
+    def endpoints(self, samples, in_process=False) -> list:
+        """Get the (URL name, URL) of every GET route under api/.
+
+        Async views run their queries on other threads and connections,
+        which neither see the rolled back data nor have their queries
+        captured, so they are only measured against a running server.
+        """
+        endpoints = {}
+        for pattern, namespaces, params in self.walk(get_resolver()):
+            name = ':'.join(namespaces + [pattern.name])
+            callback = pattern.callback
+            view_class = getattr(callback, 'cls', None) or getattr(
+                callback, 'view_class', None,
+            )
+            actions = getattr(callback, 'actions', None)
+            if actions is not None and 'get' not in actions:
+                continue
+            if actions is None and not hasattr(view_class, 'get'):
+                continue
+            if 'format' in params:
+                continue
+            if in_process and getattr(view_class, 'view_is_async', False):
+                continue
+            kwargs = {}
+            for param in params:
+                value = self.param_value(param, samples, view_class, namespaces)
+                if value is None:
+                    break
+                kwargs[param] = value
+            else:
+                url = reverse(name, kwargs=kwargs)
+                if url.startswith('/api/'):
+                    endpoints.setdefault(url, name)
+
+        return sorted((name, url) for url, name in endpoints.items())
+
+    def walk(self, resolver, namespaces=None, params=()):
+        """Yield every URL pattern with its namespaces and parameter names."""
+        namespaces = namespaces or []
+        for pattern in resolver.url_patterns:
+            names = list(params) + self.pattern_params(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                child = namespaces
+                if pattern.app_name:
+                    child = namespaces + [pattern.app_name]
+                yield from self.walk(pattern, child, names)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                yield pattern, namespaces, names
+
+    def pattern_params(self, pattern) -> list:
+        converters = getattr(pattern, 'converters', None)
+        if converters:
+            return list(converters)
+
+        return list(pattern.regex.groupindex)
+
+    def param_value(self, param, samples, view_class, namespaces):
+        """Get the value a route parameter is benchmarked with."""
+        if param in samples:
+            return samples[param]
+        queryset = getattr(view_class, 'queryset', None)
+        if queryset is not None:
+            model = queryset.model
+        else:
+            model = NAMESPACE_MODELS.get(namespaces[-1] if namespaces else None)
+        if model in samples:
+            return samples[model]
+        if model is not None:
+            return model.objects.order_by('pk').values_list('pk', flat=True).first()
+
+        return None
+
+    def request(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+        return response
+
+    def measure(self, client, name, url, budget) -> dict:
+        """Measure the latency, query count and peak memory of an endpoint."""
+        for _ in range(self.options['warmup']):
+            self.request(client, url)
+        timings = []
+        queries = 0
+        errors = 0
+        for _ in range(self.options['iterations']):
+            if not self.options['warm']:
+                self.cache_keys.clear()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = self.request(client, url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, len(context.captured_queries))
+            errors += is_error(response.status_code)
+
+        if not self.options['warm']:
+            self.cache_keys.clear()
+        tracemalloc.start()
+        self.request(client, url)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+        result = {
+            'name': name,
+            'url': url,
+            'status': response.status_code,
+            'errors': errors,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'queries': queries,
+            'peak_kb': round(peak_kb, 1),
+            'budget': budget,
+        }
+        result['violations'] = self.violations(result, budget)
+
+        return result
+
+    def measure_server(self, budgets) -> list:
+        """Measure every endpoint of a running server with concurrent requests.
+
+        The user and token have to be committed for the server to see
+        them, so they are deleted afterwards instead of rolled back.
+        """
+        samples = self.sample_values()
+        token = self.create_token()
+        try:
+            return [
+                self.measure_url(token.key, name, url, self.budget(budgets, name))
+                for name, url in self.endpoints(samples)
+                if self.options['filter'] in name
+            ]
+        finally:
+            token.user.delete()
+
+    def fetch(self, url, key):
+        """Request a URL of the server, returning its status and latency in ms."""
+        request = urllib.request.Request(url, headers={'Authorization': f'Token {key}'})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                code = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            code = error.code
+
+        return code, (time.perf_counter() - started) * 1000
+
+    def measure_url(self, key, name, path, budget) -> dict:
+        """Measure the latency and throughput of an endpoint of a running server."""
+        url = self.options['url'].rstrip('/') + path
+        with ThreadPoolExecutor(self.options['concurrency']) as pool:
+            list(pool.map(lambda _: self.fetch(url, key), range(self.options['warmup'])))
+            started = time.perf_counter()
+            responses = list(pool.map(
+                lambda _: self.fetch(url, key), range(self.options['iterations']),
+            ))
+            elapsed = time.perf_counter() - started
+        codes, timings = zip(*responses)
+
+        result = {
+            'name': name,
+            'url': path,
+            'status': max(codes),
+            'errors': sum(is_error(code) for code in codes),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'requests_per_s': round(len(timings) / elapsed, 1),
+            'concurrency': self.options['concurrency'],
+            'budget': budget,
+        }
+        result['violations'] = self.violations(result, budget)
+
+        return result
+
+    def violations(self, result, budget) -> list:
+        violations = []
+        if result['errors']:
+            violations.append(
+                f"{result['errors']} non-2xx responses (status {result['status']})"
+            )
+        for metric in ['queries', 'p95_ms', 'peak_kb']:
+            if metric in budget and metric in result and result[metric] > budget[metric]:
+                violations.append(
+                    f'{metric} {result[metric]} > {budget[metric]}'
+                )
+
+        return violations
@@ -0,0 +1,108 @@
+"""
+Django command comparing season filters through joins and denormalized.
+"""
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from goal_maven.core import models
+from goal_maven.core.db.explain import plan_nodes, query_plan
+from goal_maven.core.management.benchmarks import percentile
+from goal_maven.core.stats import aggregate_player_stats
+
+
+# How a match event is filtered to a season, by strategy.
+SEASON_PATHS = {
+    'joined': 'match__fixture__season_id',
+    'denormalized': 'season_id',
+}
+
+JOIN_NODES = ['Nested Loop', 'Hash Join', 'Merge Join']
+
+
+def player_season_stats(player_id, season_id, path):
+    """Aggregate the stats of a player in a season, as the stats APIs do."""
+    return aggregate_player_stats(
+        player_id, models.MatchEvent.objects.filter(**{path: season_id}),
+    )
+
+
+def season_player_totals(season_id, path):
+    """Count the events of every player in a season, as stats rebuilds do."""
+    return list(models.MatchEvent.objects.filter(
+        **{path: season_id},
+    ).values('player').annotate(events=Count('event_id')).order_by())
+
+
+# Query name -> callable taking a sampled (player, season) and a season path.
+QUERIES = {
+    'player_season_stats': player_season_stats,
+    'season_player_totals': lambda player_id, season_id, path: (
+        season_player_totals(season_id, path)
+    ),
+}
+
+
+class Command(BaseCommand):
+    """Django command timing season-scoped event queries per filter strategy."""
+    help = 'Compare season filters joining through fixtures with the copied season.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=20,
+                            help='Player seasons each query is timed on.')
+        parser.add_argument('--output',
+                            help='File to write the JSON results to, else stdout.')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        pairs = list(models.PlayerSeasonStats.objects.order_by(
+            '-appearances', 'stats_id',
+        ).values_list('player', 'season')[:options['samples']])
+        if not pairs:
+            raise CommandError('No player season stats found, load a dataset first.')
+
+        results = [
+            self.measure(name, query, strategy, path, pairs)
+            for name, query in QUERIES.items()
+            for strategy, path in SEASON_PATHS.items()
+        ]
+        report = json.dumps({
+            'events': models.MatchEvent.objects.count(),
+            'samples': len(pairs),
+            'queries': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+    def measure(self, name, query, strategy, path, pairs) -> dict:
+        """Time a query over every sample and count the joins of its plan."""
+        with CaptureQueriesContext(connection) as context:
+            query(*pairs[0], path)
+        plan = query_plan(context.captured_queries[-1]['sql'])
+        nodes = list(plan_nodes(plan))
+
+        timings = []
+        for player_id, season_id in pairs:
+            started = time.perf_counter()
+            query(player_id, season_id, path)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        return {
+            'query': name,
+            'strategy': strategy,
+            'joins': sum(node['Node Type'] in JOIN_NODES for node in nodes),
+            'tables': sorted({
+                node['Relation Name'] for node in nodes if 'Relation Name' in node
+            }),
+            'plan_cost': plan['Total Cost'],
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+        }
@@ -0,0 +1,28 @@
+"""
+Django command to check the player season stats table for drift.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from goal_maven.core.stats import diff_player_season_stats
+
+
+class Command(BaseCommand):
+    """Django command to diff player season stats against a full recompute."""
+    help = 'Compare the PlayerSeasonStats table against match events.'
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        self.stdout.write('Checking player season stats...')
+        diffs = diff_player_season_stats()
+        for player_id, season_id, field, stored, expected in diffs:
+            self.stdout.write(
+                f'player={player_id} season={season_id} {field}: '
+                f'stored {stored}, expected {expected}'
+            )
+        if diffs:
+            raise CommandError(
+                f'{len(diffs)} player season stats are inconsistent. '
+                'Run rebuild_player_stats to fix them.'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Player season stats are consistent.'))
@@ -0,0 +1,476 @@
+"""
+Django command to generate a large synthetic dataset for load testing.
+"""
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from datetime import time as kick_off
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from goal_maven.core import models
+from goal_maven.core.reference_data import EVENT_CATEGORIES
+from goal_maven.core.response_cache import bump_season_revision
+from goal_maven.core.stats import rebuild_player_season_stats
+
+
+EVENT_TYPES = [
+    'Goal', 'Penalty Goal', 'Free Kick Goal', 'Own Goal', 'Shot On',
+    'Shot Off', 'Foul', 'Yellow Card', 'Red Card', 'Corner Kick', 'Offside',
+]
+GOAL_TYPE_WEIGHTS = {
+    'Goal': 85, 'Penalty Goal': 9, 'Free Kick Goal': 3, 'Own Goal': 3,
+}
+PLAYER_ROLES = {
+    'GK': 'goal_keeper', 'CB': 'center_back', 'CM': 'central_midfielder',
+    'CF': 'center_forward',
+}
+SCORING_WEIGHTS = {'GK': 0, 'CB': 1, 'CM': 3, 'CF': 6}
+PITCH_AREAS = ['Attacking Penalty Area', 'Attacking Box edge', 'Attacking half',
+               'Defending half', 'Corner Arc']
+
+
+class Command(BaseCommand):
+    """Django command to generate seasons of leagues played as double round-robins."""
+    help = 'Generate a deterministic synthetic dataset with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', type=int, default=2,
+                            help='Number of seasons.')
+        parser.add_argument('--leagues', type=int, default=2,
+                            help='Number of leagues per season.')
+        parser.add_argument('--teams', type=int, default=20,
+                            help='Number of teams per league.')
+        parser.add_argument('--squad', type=int, default=22,
+                            help='Number of players per team.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed making the dataset reproducible.')
+        parser.add_argument('--start-year', type=int, default=2000,
+                            help='Year the first season starts in.')
+        parser.add_argument('--prefix', default='Synthetic',
+                            help='Prefix of every generated name.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of rows per insert.')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['teams'] < 2 or options['squad'] < 4:
+            raise CommandError('At least 2 teams of 4 players are needed.')
+        self.prefix = options['prefix']
+        if models.Season.objects.filter(
+            season_name__startswith=f'{self.prefix} ',
+        ).exists():
+            raise CommandError(
+                f'Seasons prefixed "{self.prefix}" already exist, '
+                'pick another --prefix.'
+            )
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.rows = Counter()
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            self.reference_data()
+            seasons = self.seasons(options['seasons'], options['start_year'])
+            leagues = self.leagues(seasons, options['leagues'], options['teams'])
+            teams = self.teams(leagues[seasons[-1].pk], options['teams'])
+            self.players(teams, options['squad'])
+        for season in seasons:
+            for league, league_teams in zip(leagues[season.pk], teams):
+                with transaction.atomic():
+                    self.play_league(season, league, league_teams)
+            self.update_season(season)
+
+        self.stdout.write('Rebuilding player season stats...')
+        rebuild_player_season_stats(batch_size=self.batch_size)
+        for season in seasons:
+            bump_season_revision(season.pk)
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.rows.values())
+        for label, count in self.rows.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {total} rows in {elapsed:.2f}s '
+            f'({total / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
+
+    def insert(self, model, objects) -> list:
+        """Bulk insert rows of a model, returning them with their pks."""
+        objects = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.rows[model.__name__] += len(objects)
+
+        return objects
+
+    def reference_data(self):
+        """Get or create the lookup rows the generated data refers to."""
+        continent, _ = models.Continent.objects.get_or_create(
+            continent_name=self.prefix,
+        )
+        self.nation, _ = models.Nation.objects.get_or_create(
+            nation_name=self.prefix, continent=continent,
+        )
+        self.city, _ = models.City.objects.get_or_create(
+            city_name=self.prefix, nation=self.nation,
+        )
+        self.event_types = {
+            name: models.EventType.objects.get_or_create(event_name=name)[0].pk
+            for name in EVENT_TYPES
+        }
+        self.event_names = {pk: name for name, pk in self.event_types.items()}
+        self.roles = {
+            key: models.PlayerRole.objects.get_or_create(
+                role_key=key, defaults={'role_name': name},
+            )[0].pk
+            for key, name in PLAYER_ROLES.items()
+        }
+        self.pitch_areas = [
+            models.PitchLocation.objects.get_or_create(pitch_area_name=name)[0].pk
+            for name in PITCH_AREAS
+        ]
+        self.completed, _ = models.MatchStatus.objects.get_or_create(
+            status_name='Completed',
+        )
+
+    def seasons(self, count, start_year) -> list:
+        return self.insert(models.Season, [
+            models.Season(
+                season_name=f'{self.prefix} {year}-{year + 1}',
+                start_date=date(year, 8, 1),
+                end_date=date(year + 1, 6, 30),
+                is_concluded=index < count - 1,
+            )
+            for index, year in enumerate(range(start_year, start_year + count))
+        ])
+
+    def leagues(self, seasons, count, team_count) -> dict:
+        """Create the leagues of every season, keyed by season id."""
+        leagues = self.insert(models.League, [
+            models.League(
+                league_name=f'{self.prefix} League {number}',
+                nation=self.nation,
+                season=season,
+                total_teams=team_count,
+                match_day=2 * (team_count - 1),
+                is_concluded=season.is_concluded,
+            )
+            for season in seasons
+            for number in range(1, count + 1)
+        ])
+        by_season = defaultdict(list)
+        for league in leagues:
+            by_season[league.season_id].append(league)
+
+        return by_season
+
+    def teams(self, leagues, count) -> list:
+        """Create the teams of every league, with a stadium and a manager each."""
+        names = [
+            f'{league.league_name} Team {number}'
+            for league in leagues for number in range(1, count + 1)
+        ]
+        stadiums = self.insert(models.Stadium, [
+            models.Stadium(
+                stadium_name=f'{name} Stadium',
+                city=self.city,
+                capacity=self.rng.randrange(10000, 90000, 500),
+            )
+            for name in names
+        ])
+        managers = self.insert(models.Manager, [
+            models.Manager(
+                manager_name=f'{name} Manager',
+                nation=self.nation,
+                date_of_birth=date(1960 + self.rng.randrange(20), 1, 1),
+                career_start=date(1995, 1, 1),
+            )
+            for name in names
+        ])
+        self.referees = self.insert(models.Referee, [
+            models.Referee(
+                referee_name=f'{self.prefix} Referee {number}',
+                nation=self.nation,
+                career_start=date(1995, 1, 1),
+            )
+            for number in range(1, max(len(names) // 2, 2) + 1)
+        ])
+        teams = self.insert(models.Team, [
+            models.Team(
+                team_name=name,
+                est_date=date(1880 + self.rng.randrange(100), 1, 1),
+                league=leagues[index // count],
+                stadium=stadium,
+                manager=manager,
+            )
+            for index, (name, stadium, manager) in enumerate(
+                zip(names, stadiums, managers),
+            )
+        ])
+        for team, manager in zip(teams, managers):
+            manager.team = team
+        models.Manager.objects.bulk_update(
+            managers, ['team'], batch_size=self.batch_size,
+        )
+
+        return [teams[index:index + count] for index in range(0, len(teams), count)]
+
+    def players(self, teams, squad):
+        """Create the squads of every team."""
+        role_keys = list(PLAYER_ROLES)
+        players = self.insert(models.Player, [
+            models.Player(
+                player_name=f'{team.team_name} Player {number + 1}',
+                jersy_number=str(number + 1),
+                date_of_birth=date(1985 + self.rng.randrange(20), 1, 1),
+                career_start=date(2005, 1, 1),
+                nation=self.nation,
+                height=round(self.rng.uniform(1.65, 2.0), 2),
+                weight=self.rng.randrange(60, 95),
+                role_id=self.roles[self.squad_role(number, role_keys)],
+                team=team,
+            )
+            for league_teams in teams
+            for team in league_teams
+            for number in range(squad)
+        ])
+        role_keys = {pk: key for key, pk in self.roles.items()}
+        self.squads = defaultdict(list)
+        for player in players:
+            self.squads[player.team_id].append((player.pk, role_keys[player.role_id]))
+
+    def squad_role(self, number, role_keys) -> str:
+        """Get the role of a squad number: two keepers, then the other roles in turn."""
+        if number < 2:
+            return 'GK'
+        return role_keys[1 + (number - 2) % (len(role_keys) - 1)]
+
+    def round_robin(self, teams) -> list:
+        """Get the match days of a double round-robin as (home, away) pairs."""
+        rotation = list(teams)
+        if len(rotation) % 2:
+            rotation.append(None)
+        size = len(rotation)
+        first_half = []
+        for day in range(size - 1):
+            pairs = []
+            for index in range(size // 2):
+                home, away = rotation[index], rotation[size - 1 - index]
+                if (day + index) % 2:
+                    home, away = away, home
+                if home is not None and away is not None:
+                    pairs.append((home, away))
+            first_half.append(pairs)
+            rotation.insert(1, rotation.pop())
+
+        return first_half + [
+            [(away, home) for home, away in pairs] for pairs in first_half
+        ]
+
+    def poisson(self, mean) -> int:
+        """Draw a Poisson distributed count."""
+        limit, count, product = math.exp(-mean), 0, self.rng.random()
+        while product > limit:
+            count += 1
+            product *= self.rng.random()
+
+        return count
+
+    def play_league(self, season, league, teams):
+        """Generate the fixtures, matches, events and table of a league season."""
+        fixtures = []
+        for match_day, pairs in enumerate(self.round_robin(teams), start=1):
+            for home, away in pairs:
+                fixtures.append(models.Fixture(
+                    season=season,
+                    league=league,
+                    match_day=match_day,
+                    home_team=home,
+                    away_team=away,
+                    home_team_manager=f'{home.team_name} Manager',
+                    away_team_manager=f'{away.team_name} Manager',
+                    stadium_id=home.stadium_id,
+                    date=season.start_date + timedelta(weeks=match_day - 1),
+                    time=kick_off(self.rng.choice([13, 15, 17, 20])),
+                    referee=self.rng.choice(self.referees),
+                    match_status=self.completed,
+                ))
+        fixtures = self.insert(models.Fixture, fixtures)
+        matches = self.insert(
+            models.Match, [self.play_match(fixture) for fixture in fixtures],
+        )
+
+        table = defaultdict(Counter)
+        scorers = Counter()
+        assisters = Counter()
+        events = []
+        for fixture, match in zip(fixtures, matches):
+            self.record_result(table, fixture, match)
+            for event in self.match_events(fixture, match):
+                event_name = self.event_names[event.event_type_id]
+                if event_name in EVENT_CATEGORIES['goal']:
+                    scorers[event.player_id] += 1
+                if event.associated_player_id and \
+                        event_name in EVENT_CATEGORIES['assist']:
+                    assisters[event.associated_player_id] += 1
+                events.append(event)
+            if len(events) >= self.batch_size:
+                self.insert(models.MatchEvent, events)
+                events = []
+        self.insert(models.MatchEvent, events)
+
+        standings = sorted(
+            table.items(),
+            key=lambda item: (-item[1]['points'], -item[1]['goal_difference'],
+                              -item[1]['goals_scored'], item[0]),
+        )
+        self.insert(models.LeagueTable, [
+            models.LeagueTable(
+                league=league, season=season, team_id=team_id,
+                position=position, **row,
+            )
+            for position, (team_id, row) in enumerate(standings, start=1)
+        ])
+        league.champion_team_id = standings[0][0]
+        league.runner_up_team_id = standings[1][0]
+        league.top_scorer_id = self.leader(scorers)
+        league.most_assists_id = self.leader(assisters)
+        league.save(update_fields=[
+            'champion_team', 'runner_up_team', 'top_scorer', 'most_assists',
+        ])
+
+    def leader(self, counts):
+        """Get the player with the highest count, lowest id first on ties."""
+        if not counts:
+            return None
+        return min(counts, key=lambda player_id: (-counts[player_id], player_id))
+
+    def play_match(self, fixture) -> type(models.Match):
+        """Draw a final score and team stats which agree with each other."""
+        match = models.Match(
+            fixture=fixture, season_id=fixture.season_id, league_id=fixture.league_id,
+        )
+        possession = self.rng.randint(35, 65)
+        for side, goals_mean, side_possession in [
+            ('home', 1.5, possession), ('away', 1.2, 100 - possession),
+        ]:
+            goals = self.poisson(goals_mean)
+            on_target = goals + self.poisson(3)
+            shots = on_target + self.poisson(6)
+            setattr(match, f'{side}_team_goals', goals)
+            setattr(match, f'{side}_team_possession', side_possession)
+            setattr(match, f'{side}_team_shots', shots)
+            setattr(match, f'{side}_team_shots_on_target', on_target)
+            setattr(match, f'{side}_team_shots_off_target', shots - on_target)
+            setattr(match, f'{side}_team_shots_blocked', on_target - goals)
+            setattr(match, f'{side}_team_corner_kicks', self.poisson(5))
+            setattr(match, f'{side}_team_offsides', self.poisson(2))
+            setattr(match, f'{side}_team_fouls', self.poisson(11))
+            setattr(match, f'{side}_team_throw_ins', self.poisson(22))
+            setattr(match, f'{side}_team_yellow_cards', self.poisson(1.8))
+            setattr(match, f'{side}_team_red_cards', int(self.rng.random() < 0.04))
+        match.attendance = self.rng.randint(5000, 90000)
+        match.result = match.home_team_goals != match.away_team_goals
+        if match.home_team_goals > match.away_team_goals:
+            match.winner_team_id = fixture.home_team_id
+        elif match.away_team_goals > match.home_team_goals:
+            match.winner_team_id = fixture.away_team_id
+
+        return match
+
+    def record_result(self, table, fixture, match):
+        """Add the result of a match to the league table rows of its teams."""
+        for team_id, scored, conceded in [
+            (fixture.home_team_id, match.home_team_goals, match.away_team_goals),
+            (fixture.away_team_id, match.away_team_goals, match.home_team_goals),
+        ]:
+            row = table[team_id]
+            row['matches_played'] += 1
+            row['goals_scored'] += scored
+            row['goals_against'] += conceded
+            row['goal_difference'] += scored - conceded
+            if scored > conceded:
+                row['matches_won'] += 1
+                row['points'] += 3
+            elif scored == conceded:
+                row['matches_drawn'] += 1
+                row['points'] += 1
+            else:
+                row['matches_lost'] += 1
+
+    def pick(self, team_id, weighted=False, exclude=None) -> int:
+        """Pick a player of a team, weighted by scoring threat if asked."""
+        squad = [player for player in self.squads[team_id] if player[0] != exclude]
+        weights = None
+        if weighted:
+            weights = [SCORING_WEIGHTS[role] for player_id, role in squad]
+
+        return self.rng.choices(squad, weights=weights)[0][0]
+
+    def match_events(self, fixture, match) -> list:
+        """Generate the events of a match, consistent with its stats."""
+        events = []
+
+        def add(event_name, player_id, associated_player_id=None):
+            events.append(models.MatchEvent(
+                event_type_id=self.event_types[event_name],
+                match=match,
+                season_id=match.season_id,
+                league_id=match.league_id,
+                player_id=player_id,
+                associated_player_id=associated_player_id,
+                minute=self.rng.randint(1, 90),
+                second=self.rng.randint(0, 59),
+                pitch_area_id=self.rng.choice(self.pitch_areas),
+            ))
+
+        for side, team_id, opponent_id in [
+            ('home', fixture.home_team_id, fixture.away_team_id),
+            ('away', fixture.away_team_id, fixture.home_team_id),
+        ]:
+            goals = getattr(match, f'{side}_team_goals')
+            for _ in range(goals):
+                goal_type = self.rng.choices(
+                    list(GOAL_TYPE_WEIGHTS), weights=GOAL_TYPE_WEIGHTS.values(),
+                )[0]
+                if goal_type == 'Own Goal':
+                    add(goal_type, self.pick(opponent_id))
+                    continue
+                scorer = self.pick(team_id, weighted=True)
+                assister = None
+                if goal_type == 'Goal' and self.rng.random() < 0.7:
+                    assister = self.pick(team_id, weighted=True, exclude=scorer)
+                add(goal_type, scorer, assister)
+            for _ in range(getattr(match, f'{side}_team_shots_blocked')):
+                add('Shot On', self.pick(team_id, weighted=True))
+            for _ in range(getattr(match, f'{side}_team_shots_off_target')):
+                add('Shot Off', self.pick(team_id, weighted=True))
+            for _ in range(getattr(match, f'{side}_team_fouls')):
+                add('Foul', self.pick(team_id), self.pick(opponent_id))
+            for _ in range(getattr(match, f'{side}_team_yellow_cards')):
+                add('Yellow Card', self.pick(team_id))
+            for _ in range(getattr(match, f'{side}_team_red_cards')):
+                add('Red Card', self.pick(team_id))
+            for _ in range(getattr(match, f'{side}_team_corner_kicks')):
+                add('Corner Kick', self.pick(team_id))
+            for _ in range(getattr(match, f'{side}_team_offsides')):
+                add('Offside', self.pick(team_id, weighted=True))
+
+        return sorted(events, key=lambda event: (event.minute, event.second))
+
+    def update_season(self, season):
+        """Store the match and goal totals of a generated season."""
+        totals = models.Match.objects.filter(season=season).aggregate(
+            matches=Count('match_id'),
+            goals=Sum(F('home_team_goals') + F('away_team_goals')),
+        )
+        season.number_of_leagues = models.League.objects.filter(season=season).count()
+        season.number_of_matches = totals['matches']
+        season.goals_scored = totals['goals'] or 0
+        season.avg_goals_per_match = round(
+            season.goals_scored / max(season.number_of_matches, 1), 2,
+        )
+        season.save()
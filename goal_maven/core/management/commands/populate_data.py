@@ -1,12 +1,17 @@
 """
 This command populates database with sample data.
 """
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from goal_maven.core import models
+from goal_maven.core.response_cache import bump_season_revision
+from goal_maven.core.stats import rebuild_player_season_stats
 
 import random
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 
 # import pdb
 
@@ -14,7 +19,27 @@ from datetime import datetime, timedelta
 class Command(BaseCommand):
     help = 'Populate sample data in the database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir', default=settings.APPS_DIR / 'core' / 'tests' / 'test_data',
+            help='Directory holding the sample data files.',
+        )
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Insert each entity with bulk_create instead of row by row.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of rows per insert in bulk mode.',
+        )
+
     def handle(self, *args, **options):
+        self.data_dir = Path(options['data_dir'])
+        self.bulk = options['bulk']
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+        self.rows = 0
+
         self.continents()
         self.nations()
         self.cities()
@@ -22,696 +47,560 @@ class Command(BaseCommand):
         self.managers()
         self.referees()
         self.playerroles()
-        self.players()
         self.seasons()
         self.leagues()
         self.teams()
-        self.delete_all('League')
-        self.leagues()
+        self.players()
+        self.league_awards()
         self.leaguetables()
         self.matchstatuses()
         self.fixtures_matches()
         self.eventtypes()
         self.pitchlocations()
         self.matchevents()
-        # self.delete_all('MatchEvent')
-        self.stdout.write(self.style.SUCCESS('All done.'))
+        if self.bulk:
+            self.refresh_derived_data()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'All done: {self.rows} rows in {elapsed:.2f}s '
+            f'({self.rows / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
 
     def continents(self):
         self.stdout.write('Populating continents')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/continents.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            continent_exist = models.Continent.objects.filter(
-                continent_name=item.strip(),
-            ).exists()
-            if not continent_exist:
-                models.Continent.objects.create(
-                    continent_name=item.strip(),
-                )
+        existing = self.lookup(models.Continent, 'continent_name')
+        objects = []
+        for data in self.read_rows('continents.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.Continent(continent_name=data[0]))
 
-        self.stdout.write(self.style.SUCCESS('Continents have been populated.'))
+        self.insert(models.Continent, objects, 'Continents')
 
     def nations(self):
         self.stdout.write('Populating nations')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/nations.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            nation_exist = models.Nation.objects.filter(
-                nation_name=data[0].strip(),
-            ).exists()
-            if not nation_exist:
-                continent = models.Continent.objects.get(
-                    continent_name=data[1].strip(),
-                )
-                models.Nation.objects.create(
-                    nation_name=data[0].strip(),
-                    continent=continent,
-                )
-
-        self.stdout.write(self.style.SUCCESS('Nations have been populated.'))
+        existing = self.lookup(models.Nation, 'nation_name')
+        continents = self.lookup(models.Continent, 'continent_name')
+        objects = []
+        for data in self.read_rows('nations.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.Nation(
+                    nation_name=data[0],
+                    continent_id=continents[data[1]],
+                ))
+
+        self.insert(models.Nation, objects, 'Nations')
 
     def cities(self):
         self.stdout.write('Populating cities')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/cities.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            city_exist = models.City.objects.filter(
-                city_name=data[1].strip(),
-            ).exists()
-            if not city_exist:
-                nation_exist = models.Nation.objects.filter(
-                    nation_name=data[0].strip(),
-                ).exists()
-                if nation_exist:
-                    nation = models.Nation.objects.get(
-                        nation_name=data[0].strip(),
-                    )
-                    models.City.objects.create(
-                        city_name=data[1].strip(),
-                        nation=nation,
-                    )
-
-        self.stdout.write(self.style.SUCCESS('Cities have been populated.'))
+        existing = self.lookup(models.City, 'city_name')
+        nations = self.lookup(models.Nation, 'nation_name')
+        objects = []
+        for data in self.read_rows('cities.txt'):
+            if data[0] in nations and self.is_new(existing, data[1]):
+                objects.append(models.City(
+                    city_name=data[1],
+                    nation_id=nations[data[0]],
+                ))
+
+        self.insert(models.City, objects, 'Cities')
 
     def stadiums(self):
         self.stdout.write('Populating stadiums')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/stadiums.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            stadium_exist = models.Stadium.objects.filter(
-                stadium_name=data[0].strip(),
-            ).exists()
-            if not stadium_exist:
-                city_exist = models.City.objects.filter(
-                    city_name=data[1].strip(),
-                ).exists()
-                if city_exist:
-                    city = models.City.objects.get(
-                        city_name=data[1].strip(),
-                    )
-                    models.Stadium.objects.create(
-                        stadium_name=data[0].strip(),
-                        capacity=int(data[2].strip()),
-                        city=city,
-                    )
-
-        self.stdout.write(self.style.SUCCESS('Stadiums have been populated.'))
+        existing = self.lookup(models.Stadium, 'stadium_name')
+        cities = self.lookup(models.City, 'city_name')
+        objects = []
+        for data in self.read_rows('stadiums.txt'):
+            if data[1] in cities and self.is_new(existing, data[0]):
+                objects.append(models.Stadium(
+                    stadium_name=data[0],
+                    capacity=int(data[2]),
+                    city_id=cities[data[1]],
+                ))
+
+        self.insert(models.Stadium, objects, 'Stadiums')
 
     def managers(self):
         self.stdout.write('Populating managers')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/managers.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            manager_exist = models.Manager.objects.filter(
-                manager_name=data[0].strip(),
-            ).exists()
-            if not manager_exist:
-                nation_exist = models.Nation.objects.filter(
-                    nation_name=data[1].strip(),
-                ).exists()
-                if nation_exist:
-                    nation = models.Nation.objects.get(
-                        nation_name=data[1].strip(),
-                    )
-                    career_start = self.helper_random_date(
-                        '1970-01-01',
-                        '1980-01-01',
-                        random.random(),
-                    )
-                    date_of_birth = datetime.now() - timedelta(
-                        days=int(data[2].strip())*365,
-                    )
-
-                    models.Manager.objects.create(
-                        manager_name=data[0].strip(),
-                        nation=nation,
-                        career_start=career_start,
-                        date_of_birth=date_of_birth.date(),
-                    )
+        existing = self.lookup(models.Manager, 'manager_name')
+        nations = self.lookup(models.Nation, 'nation_name')
+        objects = []
+        for data in self.read_rows('managers.txt'):
+            if data[1] in nations and self.is_new(existing, data[0]):
+                career_start = self.helper_random_date(
+                    '1970-01-01',
+                    '1980-01-01',
+                    random.random(),
+                )
+                date_of_birth = datetime.now() - timedelta(
+                    days=int(data[2])*365,
+                )
+                objects.append(models.Manager(
+                    manager_name=data[0],
+                    nation_id=nations[data[1]],
+                    career_start=career_start,
+                    date_of_birth=date_of_birth.date(),
+                ))
 
-        self.stdout.write(self.style.SUCCESS('Managers have been populated.'))
+        self.insert(models.Manager, objects, 'Managers')
 
     def referees(self):
         self.stdout.write('Populating referees')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/referees.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            referee_exist = models.Referee.objects.filter(
-                referee_name=data[0].strip(),
-            ).exists()
-            if not referee_exist:
-                nation_exist = models.Nation.objects.filter(
-                    nation_name=data[1].strip(),
-                ).exists()
-                if nation_exist:
-                    nation = models.Nation.objects.get(
-                        nation_name=data[1].strip(),
-                    )
-                    career_start = self.helper_random_date(
-                        '1990-01-01',
-                        '1995-01-01',
-                        random.random(),
-                    )
-                    matches_officiated = self.helper_random_number(50, 250)
-                    yellow_cards_issued = self.helper_random_number(
+        existing = self.lookup(models.Referee, 'referee_name')
+        nations = self.lookup(models.Nation, 'nation_name')
+        objects = []
+        for data in self.read_rows('referees.txt'):
+            if data[1] in nations and self.is_new(existing, data[0]):
+                career_start = self.helper_random_date(
+                    '1990-01-01',
+                    '1995-01-01',
+                    random.random(),
+                )
+                matches_officiated = self.helper_random_number(50, 250)
+                objects.append(models.Referee(
+                    referee_name=data[0],
+                    nation_id=nations[data[1]],
+                    career_start=career_start,
+                    matches_officiated=matches_officiated,
+                    yellow_cards_issued=self.helper_random_number(
                         matches_officiated,
                         matches_officiated*3,
-                    )
-                    red_cards_issued = self.helper_random_number(
+                    ),
+                    red_cards_issued=self.helper_random_number(
                         matches_officiated-40,
                         matches_officiated-30,
-                    )
-                    penalty_decisions_overturned = self.helper_random_number(
-                        5,
-                        30,
-                    )
-                    other_decisions_overturned = self.helper_random_number(
-                        10,
-                        50,
-                    )
-
-                    models.Referee.objects.create(
-                        referee_name=data[0].strip(),
-                        nation=nation,
-                        career_start=career_start,
-                        matches_officiated=matches_officiated,
-                        yellow_cards_issued=yellow_cards_issued,
-                        red_cards_issued=red_cards_issued,
-                        penalty_decisions_overturned=penalty_decisions_overturned,
-                        other_decisions_overturned=other_decisions_overturned,
-                    )
-
-        self.stdout.write(self.style.SUCCESS('Referees have been populated.'))
+                    ),
+                    penalty_decisions_overturned=self.helper_random_number(5, 30),
+                    other_decisions_overturned=self.helper_random_number(10, 50),
+                ))
+
+        self.insert(models.Referee, objects, 'Referees')
 
     def playerroles(self):
         self.stdout.write('Populating Player roles')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/playerroles.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            role_exist = models.PlayerRole.objects.filter(
-                role_name=data[0].strip(),
-            ).exists()
-            if not role_exist:
-                models.PlayerRole.objects.create(
-                    role_name=data[0].strip(),
-                    role_key=data[1].strip(),
-                )
-
-        self.stdout.write(self.style.SUCCESS('Player roles have been populated.'))
+        existing = self.lookup(models.PlayerRole, 'role_name')
+        objects = []
+        for data in self.read_rows('playerroles.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.PlayerRole(
+                    role_name=data[0],
+                    role_key=data[1],
+                ))
 
-    def players(self):
-        self.stdout.write('Populating Players')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/players.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            player_exist = models.Player.objects.filter(
-                player_name=data[1].strip(),
-            ).exists()
-            if not player_exist:
-                nation_exist = models.Nation.objects.filter(
-                    nation_name=data[4].strip(),
-                ).exists()
-                if nation_exist:
-                    nation = models.Nation.objects.get(
-                        nation_name=data[4].strip(),
-                    )
-                    team_exist = models.Team.objects.filter(
-                        team_name=data[3].strip(),
-                    ).exists()
-                    if team_exist:
-                        team = models.Team.objects.get(
-                            team_name=data[3].strip(),
-                        )
-                    else:
-                        team = None
-                    jersy_number = data[0].strip()
-                    date_of_birth = self.helper_random_date(
-                        '1990-01-01',
-                        '2003-01-01',
-                        random.random(),
-                    )
-                    career_start = self.helper_random_date(
-                        '2005-01-01',
-                        '2017-01-01',
-                        random.random(),
-                    )
-                    height = 1.82
-                    weight = self.helper_random_number(60, 85)
-                    role = models.PlayerRole.objects.get(
-                        role_key=data[2].strip(),
-                    )
-                    total_appearances = self.helper_random_number(50, 300)
-
-                    models.Player.objects.create(
-                        player_name=data[1].strip(),
-                        jersy_number=jersy_number,
-                        nation=nation,
-                        date_of_birth=date_of_birth,
-                        career_start=career_start,
-                        height=height,
-                        weight=weight,
-                        role=role,
-                        total_appearances=total_appearances,
-                        team=team,
-                    )
-
-        self.stdout.write(self.style.SUCCESS('Players have been populated.'))
+        self.insert(models.PlayerRole, objects, 'Player roles')
 
     def seasons(self):
         self.stdout.write('Populating Seasons')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/seasons.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            season_name = data[0].strip()
-            season_exist = models.Season.objects.filter(
-                season_name=season_name,
-            ).exists()
-            if not season_exist:
-                start_date = datetime.strptime(data[1].strip(), '%Y-%m-%d')
-                end_date = datetime.strptime(data[2].strip(), '%Y-%m-%d')
-                is_concluded = data[3].strip().lower() == 'true'
-                number_of_leagues = int(data[4].strip())
-                number_of_matches = int(data[5].strip())
-                goals_scored = int(data[6].strip())
-                avg_goals_per_match = float(data[7].strip())
-                models.Season.objects.create(
-                    season_name=season_name,
-                    start_date=start_date,
-                    end_date=end_date,
-                    is_concluded=is_concluded,
-                    number_of_leagues=number_of_leagues,
-                    number_of_matches=number_of_matches,
-                    goals_scored=goals_scored,
-                    avg_goals_per_match=avg_goals_per_match,
-                )
-
-        self.stdout.write(self.style.SUCCESS('Seasons have been populated.'))
+        existing = self.lookup(models.Season, 'season_name')
+        objects = []
+        for data in self.read_rows('seasons.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.Season(
+                    season_name=data[0],
+                    start_date=datetime.strptime(data[1], '%Y-%m-%d').date(),
+                    end_date=datetime.strptime(data[2], '%Y-%m-%d').date(),
+                    is_concluded=data[3].lower() == 'true',
+                    number_of_leagues=int(data[4]),
+                    number_of_matches=int(data[5]),
+                    goals_scored=int(data[6]),
+                    avg_goals_per_match=float(data[7]),
+                ))
+
+        self.insert(models.Season, objects, 'Seasons')
 
     def leagues(self):
+        """Create leagues; players and teams they refer to come later."""
         self.stdout.write('Populating Leagues')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/leagues.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            league_name = data[0].strip()
-            season_name = data[2].strip()
-            season = models.Season.objects.get(
-                season_name=season_name,
-            )
-            league_exist = models.League.objects.filter(
-                league_name=league_name,
-                season=season,
-            ).exists()
-            if not league_exist:
-                nation_exist = models.Nation.objects.filter(
-                    nation_name=data[1].strip(),
-                ).exists()
-                if nation_exist:
-                    nation = models.Nation.objects.get(
-                        nation_name=data[1].strip(),
-                    )
-                    season = models.Season.objects.get(
-                        season_name=season_name,
-                    )
-                    if data[5].strip().lower() == "none":
-                        top_scorer = None
-                    else:
-                        top_scorer = models.Player.objects.get(
-                            player_name=data[5].strip(),
-                        )
-                    if data[6].strip().lower() == "none":
-                        most_assists = None
-                    else:
-                        most_assists = models.Player.objects.get(
-                            player_name=data[6].strip(),
-                        )
-                    total_teams = data[3].strip()
-                    match_day = data[4].strip()
-                    is_concluded = data[7].strip().lower() == 'true'
-                    champion_team_exist = models.Team.objects.filter(
-                        team_name=data[8].strip(),
-                    ).exists()
-                    if champion_team_exist:
-                        champion_team = models.Team.objects.get(
-                            team_name=data[8].strip(),
-                        )
-                    else:
-                        champion_team = None
-                    runner_up_team_exist = models.Team.objects.filter(
-                        team_name=data[9].strip(),
-                    ).exists()
-                    if runner_up_team_exist:
-                        runner_up_team = models.Team.objects.get(
-                            team_name=data[9].strip(),
-                        )
-                    else:
-                        runner_up_team = None
-
-                    models.League.objects.create(
-                        league_name=league_name,
-                        nation=nation,
-                        season=season,
-                        total_teams=total_teams,
-                        match_day=match_day,
-                        top_scorer=top_scorer,
-                        most_assists=most_assists,
-                        is_concluded=is_concluded,
-                        champion_team=champion_team,
-                        runner_up_team=runner_up_team,
-                    )
-
-        self.stdout.write(self.style.SUCCESS('Leagues have been populated.'))
+        existing = self.lookup(models.League, 'league_name', 'season__season_name')
+        seasons = self.lookup(models.Season, 'season_name')
+        nations = self.lookup(models.Nation, 'nation_name')
+        objects = []
+        for data in self.read_rows('leagues.txt'):
+            if data[1] in nations and self.is_new(existing, (data[0], data[2])):
+                objects.append(models.League(
+                    league_name=data[0],
+                    nation_id=nations[data[1]],
+                    season_id=seasons[data[2]],
+                    total_teams=int(data[3]),
+                    match_day=int(data[4]),
+                    is_concluded=data[7].lower() == 'true',
+                ))
+
+        self.insert(models.League, objects, 'Leagues')
 
     def teams(self):
         self.stdout.write('Populating Teams')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/teams.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            team_name = data[0].strip()
-            team_exist = models.Team.objects.filter(
-                team_name=team_name,
-            ).exists()
-            if not team_exist:
-                est_date = datetime.strptime(data[1].strip(), '%Y-%m-%d')
-                league = models.League.objects.get(
-                    league_name=data[2].strip(),
-                    is_concluded=False,
-                )
-                stadium = models.Stadium.objects.get(
-                    stadium_name=data[3].strip(),
-                )
-                manager = models.Manager.objects.get(
-                    manager_name=data[4].strip(),
-                )
-
-                team = models.Team.objects.create(
-                    team_name=team_name,
-                    est_date=est_date,
-                    league=league,
-                    stadium=stadium,
-                    manager=manager,
-                )
-                manager.team = team
-                manager.save()
-            else:
-                team = models.Team.objects.get(
-                    team_name=team_name,
-                )
-                if not team.league:
-                    league = models.League.objects.get(
-                        league_name=data[2].strip(),
-                        is_concluded=False,
-                    )
-                    team.league = league
-                    team.save()
+        existing = dict(models.Team.objects.values_list('team_name', 'league_id'))
+        leagues = self.lookup(models.League, 'league_name', is_concluded=False)
+        stadiums = self.lookup(models.Stadium, 'stadium_name')
+        managers = self.lookup(models.Manager, 'manager_name')
+        objects = []
+        moved = {}
+        for data in self.read_rows('teams.txt'):
+            if data[0] in existing:
+                if existing[data[0]] is None:
+                    moved[data[0]] = leagues[data[2]]
+                continue
+            existing[data[0]] = leagues[data[2]]
+            objects.append(models.Team(
+                team_name=data[0],
+                est_date=datetime.strptime(data[1], '%Y-%m-%d').date(),
+                league_id=leagues[data[2]],
+                stadium_id=stadiums[data[3]],
+                manager_id=managers[data[4]],
+            ))
+
+        self.insert(models.Team, objects, 'Teams')
+        self.update(
+            models.Team,
+            [
+                models.Team(team_id=team_id, league_id=moved[team_name])
+                for team_name, team_id in self.lookup(
+                    models.Team, 'team_name', team_name__in=moved,
+                ).items()
+            ],
+            ['league'],
+        )
+        self.update(
+            models.Manager,
+            [
+                models.Manager(manager_id=manager_id, team_id=team_id)
+                for team_id, manager_id in models.Team.objects.filter(
+                    team_name__in=[team.team_name for team in objects],
+                ).values_list('team_id', 'manager_id')
+                if manager_id is not None
+            ],
+            ['team'],
+        )
 
-        self.stdout.write(self.style.SUCCESS('Teams have been populated.'))
+    def players(self):
+        self.stdout.write('Populating Players')
+        existing = self.lookup(models.Player, 'player_name')
+        nations = self.lookup(models.Nation, 'nation_name')
+        teams = self.lookup(models.Team, 'team_name')
+        roles = self.lookup(models.PlayerRole, 'role_key')
+        objects = []
+        for data in self.read_rows('players.txt'):
+            if data[4] in nations and self.is_new(existing, data[1]):
+                objects.append(models.Player(
+                    player_name=data[1],
+                    jersy_number=data[0],
+                    nation_id=nations[data[4]],
+                    date_of_birth=self.helper_random_date(
+                        '1990-01-01',
+                        '2003-01-01',
+                        random.random(),
+                    ),
+                    career_start=self.helper_random_date(
+                        '2005-01-01',
+                        '2017-01-01',
+                        random.random(),
+                    ),
+                    height=1.82,
+                    weight=self.helper_random_number(60, 85),
+                    role_id=roles[data[2]],
+                    total_appearances=self.helper_random_number(50, 300),
+                    team_id=teams.get(data[3]),
+                ))
+
+        self.insert(models.Player, objects, 'Players')
+
+    def league_awards(self):
+        """Fill the top players and teams of leagues once those exist."""
+        self.stdout.write('Populating League awards')
+        leagues = self.lookup(models.League, 'league_name', 'season__season_name')
+        players = self.lookup(models.Player, 'player_name')
+        teams = self.lookup(models.Team, 'team_name')
+        objects = []
+        for data in self.read_rows('leagues.txt'):
+            if (data[0], data[2]) in leagues:
+                objects.append(models.League(
+                    league_id=leagues[(data[0], data[2])],
+                    top_scorer_id=self.optional(players, data[5]),
+                    most_assists_id=self.optional(players, data[6]),
+                    champion_team_id=teams.get(data[8]),
+                    runner_up_team_id=teams.get(data[9]),
+                ))
+
+        self.update(
+            models.League,
+            objects,
+            ['top_scorer', 'most_assists', 'champion_team', 'runner_up_team'],
+        )
 
     def leaguetables(self):
         self.stdout.write('Populating League tables')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/leaguetables.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            team = models.Team.objects.get(
-                team_name=data[2].strip(),
-            )
-            season = models.Season.objects.get(
-                season_name=data[1].strip(),
-            )
-            league = models.League.objects.get(
-                league_name=data[0].strip(),
-                season=season,
-            )
-            table_exist = models.LeagueTable.objects.filter(
-                team=team,
-                season=season,
-                league=league,
-            ).exists()
-            if not table_exist:
-                points = int(data[3].strip())
-                position = int(data[4].strip())
-                matches_played = int(data[5].strip())
-                matches_won = int(data[6].strip())
-                matches_drawn = int(data[7].strip())
-                maches_lost = int(data[8].strip())
-                goals_scored = int(data[9].strip())
-                goals_against = int(data[10].strip())
-                goal_difference = int(data[11].strip())
-                models.LeagueTable.objects.create(
-                    team=team,
-                    season=season,
-                    league=league,
-                    points=points,
-                    position=position,
-                    matches_played=matches_played,
-                    matches_won=matches_won,
-                    matches_drawn=matches_drawn,
-                    maches_lost=maches_lost,
-                    goals_scored=goals_scored,
-                    goals_against=goals_against,
-                    goal_difference=goal_difference,
-                )
-
-        self.stdout.write(self.style.SUCCESS('League tables have been populated.'))
+        existing = set(models.LeagueTable.objects.values_list(
+            'team__team_name', 'season__season_name', 'league__league_name',
+        ))
+        teams = self.lookup(models.Team, 'team_name')
+        seasons = self.lookup(models.Season, 'season_name')
+        leagues = self.lookup(models.League, 'league_name', 'season__season_name')
+        objects = []
+        for data in self.read_rows('leaguetables.txt'):
+            if self.is_new(existing, (data[2], data[1], data[0])):
+                objects.append(models.LeagueTable(
+                    team_id=teams[data[2]],
+                    season_id=seasons[data[1]],
+                    league_id=leagues[(data[0], data[1])],
+                    points=int(data[3]),
+                    position=int(data[4]),
+                    matches_played=int(data[5]),
+                    matches_won=int(data[6]),
+                    matches_drawn=int(data[7]),
+                    matches_lost=int(data[8]),
+                    goals_scored=int(data[9]),
+                    goals_against=int(data[10]),
+                    goal_difference=int(data[11]),
+                ))
+
+        self.insert(models.LeagueTable, objects, 'League tables')
 
     def matchstatuses(self):
         self.stdout.write('Populating Match statuses')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/matchstatuses.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            match_status_exist = models.MatchStatus.objects.filter(
-                status_name=item.strip(),
-            ).exists()
-            if not match_status_exist:
-                models.MatchStatus.objects.create(
-                    status_name=item.strip(),
-                )
+        existing = self.lookup(models.MatchStatus, 'status_name')
+        objects = []
+        for data in self.read_rows('matchstatuses.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.MatchStatus(status_name=data[0]))
 
-        self.stdout.write(self.style.SUCCESS('Match statuses have been populated.'))
+        self.insert(models.MatchStatus, objects, 'Match statuses')
 
     def fixtures_matches(self):
         self.stdout.write('Populating Fixtures and corresponding matches')
-        with open(
-            r'/Goal-Maven/goal_maven/core/tests/test_data/fixtures_matches.txt',
-        ) as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            season = models.Season.objects.get(
-                season_name=data[0].strip(),
-            )
-            league = models.League.objects.get(
-                league_name=data[1].strip(),
-                season=season,
-            )
-            home_team = models.Team.objects.get(
-                team_name=data[3].strip(),
+        fixture_key = (
+            'season__season_name', 'league__league_name',
+            'home_team__team_name', 'away_team__team_name',
+        )
+        existing = set(models.Fixture.objects.values_list(*fixture_key))
+        seasons = self.lookup(models.Season, 'season_name')
+        leagues = self.lookup(models.League, 'league_name', 'season__season_name')
+        referees = self.lookup(models.Referee, 'referee_name')
+        match_statuses = self.lookup(models.MatchStatus, 'status_name')
+        teams = {
+            team['team_name']: team
+            for team in models.Team.objects.values(
+                'team_id', 'team_name', 'stadium_id', 'stadium__capacity',
+                'manager__manager_name',
             )
-            away_team = models.Team.objects.get(
-                team_name=data[4].strip(),
-            )
-            fixture_exist = models.Fixture.objects.filter(
-                season=season,
-                league=league,
-                home_team=home_team,
-                away_team=away_team,
-            ).exists()
-            if not fixture_exist:
-                match_day = int(data[2].strip())
-                home_team_manager = home_team.manager.manager_name
-                away_team_manager = away_team.manager.manager_name
-                stadium = home_team.stadium
-                date = datetime.strptime(data[5].strip(), '%Y-%m-%d')
-                time = datetime.strptime(data[6].strip(), '%I:%M:%S %p')
-                referee = models.Referee.objects.get(
-                    referee_name=data[7].strip(),
-                )
-                match_status = models.MatchStatus.objects.get(
-                    status_name=data[8].strip(),
+        }
+        fixtures = []
+        matches = {}
+        for data in self.read_rows('fixtures_matches.txt'):
+            key = (data[0], data[1], data[3], data[4])
+            if not self.is_new(existing, key):
+                continue
+            home_team = teams[data[3]]
+            away_team = teams[data[4]]
+            fixtures.append(models.Fixture(
+                season_id=seasons[data[0]],
+                league_id=leagues[(data[1], data[0])],
+                home_team_id=home_team['team_id'],
+                away_team_id=away_team['team_id'],
+                match_day=int(data[2]),
+                home_team_manager=home_team['manager__manager_name'],
+                away_team_manager=away_team['manager__manager_name'],
+                stadium_id=home_team['stadium_id'],
+                date=datetime.strptime(data[5], '%Y-%m-%d').date(),
+                time=datetime.strptime(data[6], '%I:%M:%S %p').time(),
+                referee_id=referees[data[7]],
+                match_status_id=match_statuses[data[8]],
+            ))
+            matches[key] = models.Match()
+            if data[8] == 'Completed':
+                matches[key] = self.completed_match(
+                    data, home_team['stadium__capacity'], teams,
                 )
 
-                fixture = models.Fixture.objects.create(
-                    season=season,
-                    league=league,
-                    home_team=home_team,
-                    away_team=away_team,
-                    match_day=match_day,
-                    home_team_manager=home_team_manager,
-                    away_team_manager=away_team_manager,
-                    stadium=stadium,
-                    date=date,
-                    time=time,
-                    referee=referee,
-                    match_status=match_status,
-                )
-
-                match = models.Match.objects.create(
-                    fixture=fixture,
-                )
-                if data[8].strip() == 'Completed':
-                    match.attendance = fixture.stadium.capacity - 100
-                    match.result = data[9].strip().lower() == 'true'
-                    if not match.result:
-                        match.winner_team = None
-                    else:
-                        match.winner_team = models.Team.objects.get(
-                                                team_name=data[10].strip(),
-                                            )
-                    match.extra_time = data[11].strip().lower() == 'true'
-                    match.injury_time = data[12].strip().lower() == 'true'
-                    match.home_team_goals = int(data[13].strip())
-                    match.away_team_goals = int(data[14].strip())
-                    match.home_team_possession = int(data[15].strip())
-                    match.away_team_possession = int(data[16].strip())
-                    match.home_team_shots = int(data[17].strip())
-                    match.away_team_shots = int(data[18].strip())
-                    match.home_team_shots_on_target = int(data[19].strip())
-                    match.away_team_shots_on_target = int(data[20].strip())
-                    match.home_team_shots_off_target = (
-                        match.home_team_shots - match.home_team_shots_on_target
-                    )
-                    match.away_team_shots_off_target = (
-                        match.away_team_shots - match.away_team_shots_on_target
-                    )
-                    match.home_team_shots_blocked = (
-                        match.home_team_shots_on_target - match.home_team_goals
-                    )
-                    match.away_team_shots_blocked = (
-                        match.away_team_shots_on_target - match.away_team_goals
-                    )
-                    match.home_team_corner_kicks = int(data[21].strip())
-                    match.away_team_corner_kicks = int(data[22].strip())
-                    match.home_team_offsides = int(data[23].strip())
-                    match.away_team_offsides = int(data[24].strip())
-                    match.home_team_fouls = int(data[25].strip())
-                    match.away_team_fouls = int(data[26].strip())
-                    match.home_team_throw_ins = int(data[27].strip())
-                    match.away_team_throw_ins = int(data[28].strip())
-                    match.home_team_yellow_cards = int(data[29].strip())
-                    match.away_team_yellow_cards = int(data[30].strip())
-                    match.home_team_red_cards = int(data[31].strip())
-                    match.away_team_red_cards = int(data[32].strip())
-
-                    match.save()
-                else:
-                    match.save()
-
-        self.stdout.write(self.style.SUCCESS('Fixtures and matches have been populated.'))
+        self.insert(models.Fixture, fixtures, 'Fixtures')
+        for fixture_id, season_id, league_id, *key in models.Fixture.objects.values_list(
+            'fixture_id', 'season_id', 'league_id', *fixture_key,
+        ).iterator():
+            if tuple(key) in matches:
+                match = matches[tuple(key)]
+                match.fixture_id = fixture_id
+                match.season_id = season_id
+                match.league_id = league_id
+        self.insert(models.Match, list(matches.values()), 'Matches')
+
+    def completed_match(self, data, capacity, teams):
+        """Build the match of a completed fixture from its data row."""
+        match = models.Match(
+            attendance=capacity - 100,
+            result=data[9].lower() == 'true',
+            extra_time=data[11].lower() == 'true',
+            injury_time=data[12].lower() == 'true',
+            home_team_goals=int(data[13]),
+            away_team_goals=int(data[14]),
+            home_team_possession=int(data[15]),
+            away_team_possession=int(data[16]),
+            home_team_shots=int(data[17]),
+            away_team_shots=int(data[18]),
+            home_team_shots_on_target=int(data[19]),
+            away_team_shots_on_target=int(data[20]),
+            home_team_corner_kicks=int(data[21]),
+            away_team_corner_kicks=int(data[22]),
+            home_team_offsides=int(data[23]),
+            away_team_offsides=int(data[24]),
+            home_team_fouls=int(data[25]),
+            away_team_fouls=int(data[26]),
+            home_team_throw_ins=int(data[27]),
+            away_team_throw_ins=int(data[28]),
+            home_team_yellow_cards=int(data[29]),
+            away_team_yellow_cards=int(data[30]),
+            home_team_red_cards=int(data[31]),
+            away_team_red_cards=int(data[32]),
+        )
+        if match.result:
+            match.winner_team_id = teams[data[10]]['team_id']
+        match.home_team_shots_off_target = (
+            match.home_team_shots - match.home_team_shots_on_target
+        )
+        match.away_team_shots_off_target = (
+            match.away_team_shots - match.away_team_shots_on_target
+        )
+        match.home_team_shots_blocked = (
+            match.home_team_shots_on_target - match.home_team_goals
+        )
+        match.away_team_shots_blocked = (
+            match.away_team_shots_on_target - match.away_team_goals
+        )
+
+        return match
 
     def eventtypes(self):
         self.stdout.write('Populating Event types')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/eventtypes.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            event_exist = models.EventType.objects.filter(
-                event_name=item.strip(),
-            ).exists()
-            if not event_exist:
-                models.EventType.objects.create(
-                    event_name=item.strip(),
-                )
+        existing = self.lookup(models.EventType, 'event_name')
+        objects = []
+        for data in self.read_rows('eventtypes.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.EventType(event_name=data[0]))
 
-        self.stdout.write(self.style.SUCCESS('Event types have been populated.'))
+        self.insert(models.EventType, objects, 'Event types')
 
     def pitchlocations(self):
         self.stdout.write('Populating Pitch locations')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/pitchlocations.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            location_exist = models.PitchLocation.objects.filter(
-                pitch_area_name=item.strip(),
-            ).exists()
-            if not location_exist:
-                models.PitchLocation.objects.create(
-                    pitch_area_name=item.strip(),
-                )
+        existing = self.lookup(models.PitchLocation, 'pitch_area_name')
+        objects = []
+        for data in self.read_rows('pitchlocations.txt'):
+            if self.is_new(existing, data[0]):
+                objects.append(models.PitchLocation(pitch_area_name=data[0]))
 
-        self.stdout.write(self.style.SUCCESS('Pitch locations have been populated.'))
+        self.insert(models.PitchLocation, objects, 'Pitch locations')
 
     def matchevents(self):
         self.stdout.write('Populating Match events')
-        with open(r'/Goal-Maven/goal_maven/core/tests/test_data/matchevents.txt') as f:
-            lines = f.readlines()
-        for item in lines:
-            data = item.split('|')
-            event_type = models.EventType.objects.get(
-                event_name=data[0].strip(),
-            )
-            season = models.Season.objects.get(
-                season_name=data[4].strip(),
-            )
-            league = models.League.objects.get(
-                league_name=data[1].strip(),
-                season=season,
-            )
-            home_team = models.Team.objects.get(
-                team_name=data[2].strip(),
-            )
-            away_team = models.Team.objects.get(
-                team_name=data[3].strip(),
-            )
-            fixture = models.Fixture.objects.get(
-                season=season,
-                league=league,
-                home_team=home_team,
-                away_team=away_team,
-            )
-            match = models.Match.objects.get(
-                fixture=fixture,
-            )
-            minute = int(data[6].strip())
-            second = int(data[7].strip())
-
-            match_event_exist = models.MatchEvent.objects.filter(
-                match=match,
-                event_type=event_type,
-                minute=minute,
-                second=second,
-            ).exists()
-            if not match_event_exist:
-                if data[5].strip().lower() == "none":
-                    player = None
-                else:
-                    player = models.Player.objects.get(
-                        player_name=data[5].strip(),
-                    )
-                is_extra_time = data[8].strip().lower() == 'true'
-                if data[9].strip().lower() == "none":
-                    pitch_area = None
-                else:
-                    pitch_area = models.PitchLocation.objects.get(
-                        pitch_area_name=data[9].strip(),
-                    )
-                if data[10].strip().lower() == "none":
-                    associated_player = None
-                else:
-                    associated_player = models.Player.objects.get(
-                        player_name=data[10].strip(),
-                    )
-
-                models.MatchEvent.objects.create(
-                    event_type=event_type,
-                    match=match,
-                    player=player,
+        existing = set(models.MatchEvent.objects.values_list(
+            'match_id', 'event_type_id', 'minute', 'second',
+        ))
+        event_types = self.lookup(models.EventType, 'event_name')
+        players = self.lookup(models.Player, 'player_name')
+        pitch_areas = self.lookup(models.PitchLocation, 'pitch_area_name')
+        matches = {
+            tuple(key): (match_id, season_id, league_id)
+            for *key, match_id, season_id, league_id in models.Match.objects.values_list(
+                'fixture__season__season_name', 'fixture__league__league_name',
+                'fixture__home_team__team_name', 'fixture__away_team__team_name',
+                'match_id', 'season_id', 'league_id',
+            ).iterator()
+        }
+        objects = []
+        for data in self.read_rows('matchevents.txt'):
+            match_id, season_id, league_id = matches[(data[4], data[1], data[2], data[3])]
+            event_type_id = event_types[data[0]]
+            minute = int(data[6])
+            second = int(data[7])
+            if self.is_new(existing, (match_id, event_type_id, minute, second)):
+                objects.append(models.MatchEvent(
+                    event_type_id=event_type_id,
+                    match_id=match_id,
+                    season_id=season_id,
+                    league_id=league_id,
+                    player_id=self.optional(players, data[5]),
                     minute=minute,
                     second=second,
-                    is_extra_time=is_extra_time,
-                    pitch_area=pitch_area,
-                    associated_player=associated_player,
+                    is_extra_time=data[8].lower() == 'true',
+                    pitch_area_id=self.optional(pitch_areas, data[9]),
+                    associated_player_id=self.optional(players, data[10]),
+                ))
+
+        self.insert(models.MatchEvent, objects, 'Match events')
+
+    def refresh_derived_data(self):
+        """Rebuild what signals maintain, since bulk writes bypass them."""
+        self.stdout.write('Rebuilding player season stats')
+        rebuild_player_season_stats(batch_size=self.batch_size)
+        for season_id in models.Season.objects.values_list('season_id', flat=True):
+            bump_season_revision(season_id)
+
+    def read_rows(self, file_name):
+        """Read the stripped, pipe separated fields of a data file."""
+        with open(self.data_dir / file_name, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        return [
+            [field.strip() for field in line.split('|')]
+            for line in lines if line.strip()
+        ]
+
+    def lookup(self, model, *key_fields, **filters):
+        """Map the natural key of every stored row of a model to its pk."""
+        rows = model.objects.filter(**filters).values_list(*key_fields, 'pk')
+        if len(key_fields) == 1:
+            return dict(rows)
+
+        return {tuple(key): pk for *key, pk in rows}
+
+    def is_new(self, existing, key):
+        """Check a key was not stored or read before, and remember it."""
+        if key in existing:
+            return False
+        if isinstance(existing, dict):
+            existing[key] = None
+        else:
+            existing.add(key)
+
+        return True
+
+    def optional(self, lookup, name):
+        """Look a name up, unless it is the 'none' placeholder."""
+        if name.lower() == 'none':
+            return None
+
+        return lookup[name]
+
+    def insert(self, model, objects, label):
+        """Insert rows of a model in one transaction and report the rate."""
+        started = time.perf_counter()
+        with transaction.atomic():
+            if self.bulk:
+                model.objects.bulk_create(
+                    objects,
+                    batch_size=self.batch_size,
+                    ignore_conflicts=True,
                 )
+            else:
+                for obj in objects:
+                    obj.save()
+        self.report(label, len(objects), time.perf_counter() - started)
+
+    def update(self, model, objects, fields):
+        """Update fields of stored rows of a model in one transaction."""
+        with transaction.atomic():
+            if self.bulk:
+                model.objects.bulk_update(
+                    objects, fields, batch_size=self.batch_size,
+                )
+            else:
+                for obj in objects:
+                    obj.save(update_fields=fields)
 
-        self.stdout.write(self.style.SUCCESS('Match events have been populated.'))
+    def report(self, label, count, elapsed):
+        self.rows += count
+        self.stdout.write(self.style.SUCCESS(
+            f'{label} have been populated: {count} rows in {elapsed:.2f}s '
+            f'({count / max(elapsed, 1e-9):.0f} rows/s).'
+        ))
 
     def helper_random_date(self, start, end, prop):
         time_format = '%Y-%m-%d'
@@ -724,8 +613,3 @@ class Command(BaseCommand):
 
     def helper_random_number(self, start, end):
         return random.randint(start, end)
-
-    def delete_all(self, model_to_del=None):
-        self.stdout.write(f'Deleting all {model_to_del} objects.')
-        if model_to_del:
-            exec(f'models.{model_to_del}.objects.all().delete()')
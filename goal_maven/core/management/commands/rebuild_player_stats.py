@@ -0,0 +1,26 @@
+"""
+Django command to rebuild the player season stats table.
+"""
+from django.core.management.base import BaseCommand
+
+from goal_maven.core.stats import rebuild_player_season_stats
+
+
+class Command(BaseCommand):
+    """Django command to recompute player season stats from match events."""
+    help = 'Rebuild the PlayerSeasonStats table from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of rows per insert.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        self.stdout.write('Rebuilding player season stats...')
+        count = rebuild_player_season_stats(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Player season stats rebuilt ({count} rows).'
+        ))
@@ -0,0 +1,125 @@
+"""
+Bulk ingestion of the events of a live match.
+"""
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from goal_maven.core import models
+from goal_maven.core.reference_data import reference_table
+from goal_maven.core.response_cache import bump_season_revision
+from goal_maven.core.stats import refresh_season_player_stats
+
+
+# Events accepted in one batch.
+MAX_EVENT_BATCH = 500
+
+PLAYER_FIELDS = ['player', 'associated_player']
+
+
+def match_player_ids(match, names) -> dict:
+    """Get the ids of the players of the two teams of a match by name.
+
+    Names shared by several of those players map to None.
+    """
+    ids = {}
+    for name, player_id in models.Player.objects.filter(
+        player_name__in=names,
+        team_id__in=[match.fixture.home_team_id, match.fixture.away_team_id],
+    ).values_list('player_name', 'pk'):
+        ids[name] = None if name in ids else player_id
+
+    return ids
+
+
+def resolve_event(event, event_type_ids, pitch_area_ids, player_ids) -> tuple:
+    """Get the foreign key ids of an event given by names, and the names not found."""
+    ids = {}
+    errors = {}
+    ids['event_type_id'] = event_type_ids.get(event['event_type'])
+    if ids['event_type_id'] is None:
+        errors['event_type'] = [_('Unknown event type.')]
+    pitch_area = event.get('pitch_area')
+    ids['pitch_area_id'] = pitch_area_ids.get(pitch_area)
+    if pitch_area is not None and ids['pitch_area_id'] is None:
+        errors['pitch_area'] = [_('Unknown pitch area.')]
+    for field in PLAYER_FIELDS:
+        name = event.get(field)
+        ids[f'{field}_id'] = player_ids.get(name)
+        if name is None:
+            continue
+        if name not in player_ids:
+            errors[field] = [_('No player of the match teams has this name.')]
+        elif player_ids[name] is None:
+            errors[field] = [_('Several players of the match teams have this name.')]
+
+    return ids, errors
+
+
+@transaction.atomic
+def ingest_match_events(match, events) -> list:
+    """Insert validated events of a match with one query, skipping duplicates.
+
+    events are dicts naming their event type, players and pitch area.
+    An event is a duplicate of one of the match with the same event type,
+    minute and second, stored or earlier in the batch. Returns the result
+    of each event in order: created with its id, duplicate, or invalid
+    with the names not found. The match row is locked, so concurrent
+    batches of a match cannot both insert an event.
+    """
+    match = models.Match.objects.select_for_update(of=('self',)).select_related(
+        'fixture',
+    ).get(pk=match.pk)
+    event_type_ids = reference_table(models.EventType)[0]
+    pitch_area_ids = reference_table(models.PitchLocation)[0]
+    player_ids = match_player_ids(match, {
+        event[field] for event in events for field in PLAYER_FIELDS
+        if event.get(field) is not None
+    })
+    resolved = [
+        resolve_event(event, event_type_ids, pitch_area_ids, player_ids)
+        for event in events
+    ]
+    seen = set(models.MatchEvent.objects.filter(
+        match_id=match.pk,
+        event_type_id__in={ids['event_type_id'] for ids, errors in resolved},
+    ).values_list('event_type', 'minute', 'second'))
+
+    results = []
+    created = []
+    for event, (ids, errors) in zip(events, resolved):
+        if errors:
+            results.append({'status': 'invalid', 'errors': errors})
+            continue
+        key = (ids['event_type_id'], event['minute'], event['second'])
+        if key in seen:
+            results.append({'status': 'duplicate'})
+            continue
+        seen.add(key)
+        match_event = models.MatchEvent(
+            match_id=match.pk,
+            season_id=match.season_id,
+            league_id=match.league_id,
+            minute=event['minute'],
+            second=event['second'],
+            is_extra_time=event['is_extra_time'],
+            **ids,
+        )
+        created.append(match_event)
+        results.append(match_event)
+
+    # bulk_create sends no signals, so the stats and season revision
+    # they would have updated are refreshed once for the whole batch.
+    models.MatchEvent.objects.bulk_create(created)
+    if created:
+        refresh_season_player_stats(match.season_id, {
+            player_id for match_event in created
+            for player_id in [match_event.player_id, match_event.associated_player_id]
+        })
+        bump_season_revision(match.season_id)
+        transaction.on_commit(lambda: bump_season_revision(match.season_id))
+
+    return [
+        {'status': 'created', 'event_id': result.pk}
+        if isinstance(result, models.MatchEvent) else result
+        for result in results
+    ]
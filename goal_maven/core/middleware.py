@@ -0,0 +1,228 @@
+"""
+Middleware for the core app.
+"""
+import contextvars
+import json
+import logging
+import random
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+
+logger = logging.getLogger('goal_maven.profiling')
+nplusone_logger = logging.getLogger('goal_maven.nplusone')
+
+# Profile of the request being served, read by the serializer timers.
+active_profile = contextvars.ContextVar('active_profile', default=None)
+
+SLOWEST_QUERY_LOG_LENGTH = 500
+
+
+class RequestProfile:
+    """Queries and serializer time of one request.
+
+    Used as a database execute wrapper, so it sees every query the
+    request runs. Serializer time includes the queries fields trigger.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.slowest_time = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed > self.slowest_time:
+                self.slowest_time = elapsed
+                self.slowest_sql = sql
+
+    def server_timing(self, total) -> str:
+        """Get the Server-Timing header value of the profile."""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.2f}',
+            f'slowest-query;dur={self.slowest_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+
+def timed_data(prop):
+    """Wrap a serializer data property to add its time to the active profile."""
+    def data(self):
+        profile = active_profile.get()
+        if profile is None:
+            return prop.fget(self)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile.serializer_depth -= 1
+            if profile.serializer_depth == 0:
+                profile.serializer_time += time.perf_counter() - started
+
+    data.profiled = True
+
+    return property(data)
+
+
+def instrument_serializers():
+    """Time the data of every serializer while a request is profiled."""
+    for serializer_class in [serializers.Serializer, serializers.ListSerializer]:
+        prop = serializer_class.__dict__['data']
+        if not getattr(prop.fget, 'profiled', False):
+            serializer_class.data = timed_data(prop)
+
+
+class QueryProfilingMiddleware:
+    """Profile a sample of requests through Server-Timing and a log line.
+
+    Turned on by setting QUERY_PROFILING_SAMPLE_RATE to the fraction of
+    requests to profile. Queries run while streaming a response body
+    happen after the middleware returns and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.QUERY_PROFILING_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        instrument_serializers()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = active_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            active_profile.reset(token)
+        total = time.perf_counter() - profile.started
+
+        response['Server-Timing'] = profile.server_timing(total)
+        response['X-Query-Count'] = str(profile.queries)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'queries': profile.queries,
+            'db_ms': round(profile.db_time * 1000, 2),
+            'serializer_ms': round(profile.serializer_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'slowest_query_ms': round(profile.slowest_time * 1000, 2),
+            'slowest_query': profile.slowest_sql[:SLOWEST_QUERY_LOG_LENGTH],
+        }))
+
+        return response
+
+
+class NPlusOneError(Exception):
+    """A request repeated the same query shape past the threshold."""
+
+
+def query_shape(sql) -> str:
+    """Get the SQL of a query with its literals and placeholders normalized."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+\b', '?', sql.replace('%s', '?'))
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)*\s*\)', '(?...)', sql)
+
+    return ' '.join(sql.split())
+
+
+def query_source() -> str:
+    """Get the serializer field, admin column or app line running a query."""
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        local = frame.f_locals
+        if code.co_name == 'to_representation' and isinstance(
+            local.get('self'), serializers.Serializer,
+        ) and isinstance(local.get('field'), serializers.Field):
+            return f"{type(local['self']).__name__}.{local['field'].field_name}"
+        if code.co_name == 'items_for_result' and 'field_name' in local:
+            model_admin = type(local['cl'].model_admin).__name__
+            return f"{model_admin}.list_display[{local['field_name']!r}]"
+        if fallback is None and code.co_filename != __file__ and \
+                code.co_filename.startswith(str(settings.APPS_DIR)):
+            fallback = f'{code.co_filename}:{frame.f_lineno}'
+        frame = frame.f_back
+
+    return fallback or 'unknown'
+
+
+class QueryShapeCounter:
+    """Count the queries of a request by shape, noting the repeated ones."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.repeated = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        self.counts[shape] += 1
+        if self.counts[shape] == self.threshold + 1:
+            self.repeated[shape] = query_source()
+
+        return execute(sql, params, many, context)
+
+
+class NPlusOneMiddleware:
+    """Report requests running the same query shape more than K times.
+
+    Turned on by setting NPLUSONE_THRESHOLD to K. Repeats are logged as
+    warnings naming the view and the serializer field or admin column
+    responsible, or raised as NPlusOneError when NPLUSONE_RAISE is set.
+    """
+
+    def __init__(self, get_response):
+        self.threshold = settings.NPLUSONE_THRESHOLD
+        if self.threshold <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryShapeCounter(self.threshold)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        if not counter.repeated:
+            return response
+
+        view = getattr(request.resolver_match, 'view_name', None) or request.path
+        problems = [
+            f'{counter.counts[shape]} queries from {source} in {view}: {shape}'
+            for shape, source in counter.repeated.items()
+        ]
+        if settings.NPLUSONE_RAISE:
+            raise NPlusOneError('\n'.join(problems))
+        for problem in problems:
+            nplusone_logger.warning(problem)
+
+        return response
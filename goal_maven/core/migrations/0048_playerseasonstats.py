@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0047_season_top_scorer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStats',
+            fields=[
+                ('stats_id', models.AutoField(primary_key=True, serialize=False)),
+                ('goals', models.IntegerField(default=0)),
+                ('assists', models.IntegerField(default=0)),
+                ('fouls', models.IntegerField(default=0)),
+                ('yellow_cards', models.IntegerField(default=0)),
+                ('red_cards', models.IntegerField(default=0)),
+                ('shots_on', models.IntegerField(default=0)),
+                ('own_goals', models.IntegerField(default=0)),
+                ('appearances', models.IntegerField(default=0)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.season')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='playerseasonstats',
+            constraint=models.UniqueConstraint(fields=('player', 'season'), name='unique_player_season_stats'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_playerseasonstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fixture',
+            index=models.Index(fields=['season', 'league', 'home_team', 'away_team'], name='fixture_season_league_teams'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['player', 'event_type'], name='matchevent_player_type'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['associated_player', 'event_type'], name='matchevent_assist_type'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['match', 'event_type', 'minute', 'second'], name='matchevent_match_type_time'),
+        ),
+        migrations.AddConstraint(
+            model_name='league',
+            constraint=models.UniqueConstraint(fields=('league_name', 'season'), name='unique_league_season'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaguetable',
+            constraint=models.UniqueConstraint(fields=('team', 'season'), name='unique_leaguetable_team_season'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Copy the season and league of each fixture onto its matches, then of
+# each match onto its events, with one joined UPDATE per table.
+BACKFILL_SQL = [
+    """
+    UPDATE core_match
+    SET season_id = core_fixture.season_id, league_id = core_fixture.league_id
+    FROM core_fixture
+    WHERE core_fixture.fixture_id = core_match.fixture_id
+    """,
+    """
+    UPDATE core_matchevent
+    SET season_id = core_match.season_id, league_id = core_match.league_id
+    FROM core_match
+    WHERE core_match.match_id = core_matchevent.match_id
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0049_indexes_and_unique_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.league'),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='season',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.season'),
+        ),
+        migrations.AddField(
+            model_name='matchevent',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.league'),
+        ),
+        migrations.AddField(
+            model_name='matchevent',
+            name='season',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.season'),
+        ),
+        migrations.RunSQL(
+            sql=BACKFILL_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['player', 'season'], name='matchevent_player_season'),
+        ),
+        migrations.AddIndex(
+            model_name='matchevent',
+            index=models.Index(fields=['associated_player', 'season'], name='matchevent_assist_season'),
+        ),
+    ]
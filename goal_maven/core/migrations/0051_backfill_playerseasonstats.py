@@ -0,0 +1,73 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count, Q
+
+
+# Player stat counter -> (match event role credited, event types counted),
+# as the stats were defined when the table was added.
+PLAYER_COUNTERS = {
+    'goals': ('player', ['Goal', 'Penalty Goal', 'Free Kick Goal']),
+    'assists': ('associated_player', ['Goal']),
+    'fouls': ('player', ['Foul', 'Penalty Foul']),
+    'yellow_cards': ('player', ['Yellow Card']),
+    'red_cards': ('player', ['Red Card']),
+    'shots_on': ('player', ['Shot On']),
+    'own_goals': ('player', ['Own Goal']),
+}
+
+
+def backfill_player_season_stats(apps, schema_editor):
+    """Recompute the PlayerSeasonStats table from the stored match events.
+
+    Rows written since 0048 only hold the deltas of later events, so the
+    table is rebuilt whole rather than filled in.
+    """
+    MatchEvent = apps.get_model('core', 'MatchEvent')
+    PlayerSeasonStats = apps.get_model('core', 'PlayerSeasonStats')
+    stats = defaultdict(dict)
+    for role in ['player', 'associated_player']:
+        counters = {
+            field: Count('event_id', filter=Q(event_type__event_name__in=names))
+            for field, (counter_role, names) in PLAYER_COUNTERS.items()
+            if counter_role == role
+        }
+        rows = MatchEvent.objects.filter(
+            **{f'{role}__isnull': False}, season__isnull=False,
+        ).values(role, 'season').annotate(**counters).order_by()
+        for row in rows.iterator():
+            stats[(row.pop(role), row.pop('season'))].update(row)
+
+    appearances = MatchEvent.objects.filter(
+        player__isnull=False, season__isnull=False,
+    ).values_list('player', 'match', 'season').union(
+        MatchEvent.objects.filter(
+            associated_player__isnull=False, season__isnull=False,
+        ).values_list('associated_player', 'match', 'season'),
+    )
+    for player_id, match_id, season_id in appearances.iterator():
+        row = stats[(player_id, season_id)]
+        row['appearances'] = row.get('appearances', 0) + 1
+
+    PlayerSeasonStats.objects.all().delete()
+    PlayerSeasonStats.objects.bulk_create(
+        [
+            PlayerSeasonStats(player_id=player_id, season_id=season_id, **row)
+            for (player_id, season_id), row in stats.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0050_denormalize_match_season_league'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_player_season_stats,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
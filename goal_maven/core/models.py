@@ -218,6 +218,13 @@ class League(models.Model):
         related_name='runner_up_team', default=None,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league_name', 'season'], name='unique_league_season',
+            ),
+        ]
+
     # objects = SuperuserOnlyManager()
 
     def __str__(self):
@@ -241,6 +248,13 @@ class LeagueTable(models.Model):
     goals_against = models.IntegerField(default=0)
     goal_difference = models.SmallIntegerField(default=0)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['team', 'season'], name='unique_leaguetable_team_season',
+            ),
+        ]
+
     # objects = SuperuserOnlyManager()
 
     def __str__(self):
@@ -270,6 +284,14 @@ class Fixture(models.Model):
     referee = models.ForeignKey('Referee', on_delete=models.CASCADE, blank=False)
     match_status = models.ForeignKey('MatchStatus', on_delete=models.CASCADE, blank=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['season', 'league', 'home_team', 'away_team'],
+                name='fixture_season_league_teams',
+            ),
+        ]
+
     # objects = SuperuserOnlyManager()
 
     def __str__(self):
@@ -279,6 +301,13 @@ class Fixture(models.Model):
 class Match(models.Model):
     match_id = models.AutoField(primary_key=True)
     fixture = models.ForeignKey('Fixture', on_delete=models.CASCADE, blank=False)
+    # Copies of the fixture's season and league, set on save.
+    season = models.ForeignKey(
+        'Season', on_delete=models.CASCADE, null=True, blank=True, editable=False,
+    )
+    league = models.ForeignKey(
+        'League', on_delete=models.CASCADE, null=True, blank=True, editable=False,
+    )
     attendance = models.IntegerField(default=0)
     result = models.BooleanField(default=False)
     winner_team = models.ForeignKey(
@@ -313,6 +342,14 @@ class Match(models.Model):
 
     # objects = SuperuserOnlyManager()
 
+    def save(self, *args, **kwargs):
+        self.season_id = self.fixture.season_id
+        self.league_id = self.fixture.league_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'fixture' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'season', 'league'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.fixture}"
 
@@ -321,6 +358,13 @@ class MatchEvent(models.Model):
     event_id = models.AutoField(primary_key=True)
     event_type = models.ForeignKey('EventType', on_delete=models.CASCADE, blank=False)
     match = models.ForeignKey('Match', on_delete=models.CASCADE, blank=False)
+    # Copies of the match's season and league, set on save.
+    season = models.ForeignKey(
+        'Season', on_delete=models.CASCADE, null=True, blank=True, editable=False,
+    )
+    league = models.ForeignKey(
+        'League', on_delete=models.CASCADE, null=True, blank=True, editable=False,
+    )
     player = models.ForeignKey(
         'Player', on_delete=models.CASCADE, null=True, blank=True, related_name='player',
     )
@@ -335,12 +379,62 @@ class MatchEvent(models.Model):
         related_name='associated_player', default=None,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['player', 'event_type'], name='matchevent_player_type'),
+            models.Index(
+                fields=['associated_player', 'event_type'],
+                name='matchevent_assist_type',
+            ),
+            models.Index(
+                fields=['match', 'event_type', 'minute', 'second'],
+                name='matchevent_match_type_time',
+            ),
+            models.Index(fields=['player', 'season'], name='matchevent_player_season'),
+            models.Index(
+                fields=['associated_player', 'season'],
+                name='matchevent_assist_season',
+            ),
+        ]
+
     # objects = SuperuserOnlyManager()
 
+    def save(self, *args, **kwargs):
+        self.season_id = self.match.season_id
+        self.league_id = self.match.league_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'match' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'season', 'league'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.player} {self.event_type}"
 
 
+class PlayerSeasonStats(models.Model):
+    stats_id = models.AutoField(primary_key=True)
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, blank=False)
+    season = models.ForeignKey('Season', on_delete=models.CASCADE, blank=False)
+    goals = models.IntegerField(default=0)
+    assists = models.IntegerField(default=0)
+    fouls = models.IntegerField(default=0)
+    yellow_cards = models.IntegerField(default=0)
+    red_cards = models.IntegerField(default=0)
+    shots_on = models.IntegerField(default=0)
+    own_goals = models.IntegerField(default=0)
+    appearances = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['player', 'season'], name='unique_player_season_stats',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.player} {self.season}"
+
+
 class EventType(models.Model):
     event_type_id = models.AutoField(primary_key=True)
     event_name = models.CharField(max_length=50, blank=False, unique=True)
@@ -0,0 +1,109 @@
+"""
+Pagination and streaming for the list APIs and the admin.
+"""
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from goal_maven.core.db.explain import query_plan
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination over the auto-increment primary key."""
+    ordering = 'pk'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+def estimated_count(queryset):
+    """Get the planner's estimate of the rows of a queryset, None if unknown."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+
+    return query_plan(sql, params, queryset.db)['Plan Rows']
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting large querysets by the planner's estimate.
+
+    Querysets estimated under exact_count_limit rows are still counted
+    exactly, so small and well filtered pages show true totals.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_limit:
+            return super().count
+
+        return estimate
+
+
+class StreamingListMixin:
+    """List rows page by page, or as one streamed JSON array on ?stream=true.
+
+    Streaming reads the queryset with iterator() and serializes it in
+    chunks, so the response is never held in memory as a whole.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset):
+        """Return a streamed, paginated or plain response for a queryset."""
+        if self.stream_requested():
+            return self.stream_response(queryset)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+
+        return Response(serializer.data)
+
+    def stream_requested(self) -> bool:
+        """Check if the request asks for a streamed response."""
+        value = self.request.query_params.get(self.stream_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def stream_response(self, queryset):
+        """Stream a queryset as a JSON array, one chunk of rows at a time."""
+        response = StreamingHttpResponse(
+            self.stream_rows(queryset.order_by('pk')),
+            content_type='application/json',
+        )
+        response['X-Streamed'] = 'true'
+
+        return response
+
+    def stream_rows(self, queryset):
+        """Yield the JSON encoded rows of a queryset."""
+        yield '['
+        chunk = []
+        first = True
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(instance)
+            if len(chunk) == self.stream_chunk_size:
+                yield self.encode_chunk(chunk, first)
+                chunk, first = [], False
+        if chunk:
+            yield self.encode_chunk(chunk, first)
+        yield ']'
+
+    def encode_chunk(self, chunk, first) -> str:
+        """Encode a chunk of rows as a part of a JSON array."""
+        rows = self.get_serializer(chunk, many=True).data
+        encoded = ','.join(json.dumps(row, cls=JSONEncoder) for row in rows)
+
+        return encoded if first else ',' + encoded
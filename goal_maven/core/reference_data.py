@@ -0,0 +1,114 @@
+"""
+Process-wide cache of the small reference tables match data points into.
+"""
+import time
+
+from django.db import transaction
+
+from goal_maven.core import models
+from goal_maven.core.cache_revisions import bump_cache_revision, cache_revision
+
+
+# Reference model -> field naming its rows.
+REFERENCE_MODELS = {
+    models.EventType: 'event_name',
+    models.PitchLocation: 'pitch_area_name',
+    models.MatchStatus: 'status_name',
+    models.PlayerRole: 'role_key',
+}
+
+# Event category -> names of the event types it is made of.
+EVENT_CATEGORIES = {
+    'goal': ['Goal', 'Penalty Goal', 'Free Kick Goal'],
+    'assist': ['Goal'],
+    'foul': ['Foul', 'Penalty Foul'],
+    'card': ['Yellow Card', 'Red Card'],
+    'yellow_card': ['Yellow Card'],
+    'red_card': ['Red Card'],
+    'shot_on': ['Shot On'],
+    'own_goal': ['Own Goal'],
+}
+
+# Seconds a process trusts its tables before checking their revision again.
+REVISION_CHECK_INTERVAL = 5
+
+# Reference model -> (revision loaded at, name -> id, id -> name,
+# monotonic time the revision was last checked).
+_tables = {}
+
+# (event type name -> id map the categories were built from, category -> ids).
+_category_ids = (None, {})
+
+
+def reference_revision_key(model) -> str:
+    """Get the cache key of the revision of a reference table."""
+    return f'reference-revision:{model._meta.label_lower}'
+
+
+def reference_table(model) -> tuple:
+    """Get the (name -> id, id -> name) maps of a reference table.
+
+    Rows are read once per process and again only after another write
+    to the table has moved its revision in the cache. The revision is
+    checked at most every REVISION_CHECK_INTERVAL seconds, so with a cache
+    shared between processes their writes show within that delay.
+    """
+    table = _tables.get(model)
+    now = time.monotonic()
+    if table is not None and now - table[3] < REVISION_CHECK_INTERVAL:
+        return table[1:3]
+
+    revision = cache_revision(reference_revision_key(model))
+    if table is None or table[0] != revision:
+        ids = dict(model.objects.values_list(REFERENCE_MODELS[model], 'pk'))
+        table = (revision, ids, {pk: name for name, pk in ids.items()}, now)
+    else:
+        table = (*table[:3], now)
+    _tables[model] = table
+
+    return table[1:3]
+
+
+def reference_ids(model, names) -> list:
+    """Get the ids of the rows of a reference table by name, skipping unknowns."""
+    ids = reference_table(model)[0]
+
+    return [ids[name] for name in names if name in ids]
+
+
+def reference_id(model, name):
+    """Get the id of a row of a reference table by name, or None."""
+    return reference_table(model)[0].get(name)
+
+
+def reference_name(model, pk):
+    """Get the name of a row of a reference table by id, or None."""
+    return reference_table(model)[1].get(pk)
+
+
+def event_category_ids(category) -> list:
+    """Get the ids of the event types of an event category.
+
+    The ids of every category are built once per loaded event type table.
+    """
+    global _category_ids
+    ids = reference_table(models.EventType)[0]
+    if _category_ids[0] is not ids:
+        _category_ids = (ids, {
+            name: [ids[event_name] for event_name in event_names if event_name in ids]
+            for name, event_names in EVENT_CATEGORIES.items()
+        })
+
+    return _category_ids[1][category]
+
+
+def reference_table_changed(sender, **kwargs):
+    """Drop the cached rows of a reference table, here and in other processes."""
+    reference_table_revised(sender)
+    transaction.on_commit(lambda: reference_table_revised(sender))
+
+
+def reference_table_revised(model):
+    """Drop the rows of a reference table in this process and move its revision."""
+    _tables.pop(model, None)
+    bump_cache_revision(reference_revision_key(model))
@@ -0,0 +1,101 @@
+"""
+Response cache for the season-scoped read APIs.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from goal_maven.core import models
+from goal_maven.core.cache_revisions import bump_cache_revision, cache_revision
+
+
+SEASON_RESPONSE_CACHE_TIMEOUT = 60 * 15
+
+
+def season_revision_key(season_id) -> str:
+    """Get the cache key of the revision counter of a season."""
+    return f'season-revision:{season_id}'
+
+
+def season_revision(season_id) -> int:
+    """Get the current revision of a season, starting one if there is none."""
+    return cache_revision(season_revision_key(season_id))
+
+
+def bump_season_revision(season_id):
+    """Move a season to a new revision, dropping its cached responses."""
+    if season_id is None:
+        return
+    bump_cache_revision(season_revision_key(season_id))
+
+
+def instance_season_id(instance):
+    """Get the id of the season a season-scoped model instance belongs to."""
+    if isinstance(instance, models.Season):
+        return instance.pk
+
+    return instance.season_id
+
+
+def response_cache_key(request, season_id) -> str:
+    """Get the cache key of a response to a request at the season revision."""
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+    return f'season-response:{season_id}:{season_revision(season_id)}:{url}'
+
+
+def season_etag(season_id) -> str:
+    """Get the entity tag of the responses of a season at its revision."""
+    return f'"{season_id}.{season_revision(season_id)}"'
+
+
+def etag_matches(request, etag) -> bool:
+    """Check if a request already holds the representation tagged etag."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+
+    return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+
+class SeasonResponseCacheMixin:
+    """Cache list responses of a season until the season is written to.
+
+    Entries are keyed by the season revision, so any write bumping it
+    makes them unreachable. Concluded seasons are cached without expiry.
+    The revision is also sent as the ETag, so a client holding the
+    current one gets a 304 before any queryset runs.
+    """
+
+    def season_list_response(self, season, queryset):
+        """Return the list response of a season, from the cache when possible."""
+        etag = season_etag(season.season_id)
+        if etag_matches(self.request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif self.stream_requested():
+            response = self.list_response(queryset)
+        else:
+            response = self.cached_list_response(season, queryset)
+        response['ETag'] = etag
+
+        return response
+
+    def cached_list_response(self, season, queryset):
+        """Return the paginated list response of a season through the cache."""
+        key = response_cache_key(self.request, season.season_id)
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = self.list_response(queryset)
+        timeout = None if season.is_concluded else SEASON_RESPONSE_CACHE_TIMEOUT
+        cache.set(key, response.data, timeout)
+        response['X-Cache'] = 'MISS'
+
+        return response
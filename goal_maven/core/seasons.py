@@ -0,0 +1,95 @@
+"""
+Resolution of the season names routed in URLs to seasons.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+from goal_maven.core import models
+from goal_maven.core.cache_revisions import bump_cache_revision, cache_revision
+
+
+ResolvedSeason = namedtuple(
+    'ResolvedSeason', ['season_id', 'season_name', 'is_concluded'],
+)
+
+SEASONS_REVISION_KEY = 'seasons-revision'
+SEASON_CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_SEASONS_SIZE = 256
+
+# (revision, season name) -> ResolvedSeason, least recently used first.
+_local_seasons = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def season_cache_key(revision, season_name) -> str:
+    """Get the shared cache key of a season name at a revision."""
+    name = hashlib.md5(season_name.encode()).hexdigest()
+
+    return f'season:{revision}:{name}'
+
+
+def resolve_season(season_name):
+    """Get the season named season_name, or None if there is none.
+
+    Seasons are looked up in a per-process LRU, then in the shared cache
+    and only then in the database. Both tiers are keyed by a revision
+    which moves on every Season write, so renamed or deleted seasons are
+    never served. Missing names are not cached, as seasons can also be
+    created in bulk without signals.
+    """
+    if not season_name:
+        return None
+    revision = cache_revision(SEASONS_REVISION_KEY)
+    local_key = (revision, season_name)
+    with _local_lock:
+        season = _local_seasons.get(local_key)
+        if season is not None:
+            _local_seasons.move_to_end(local_key)
+            return season
+
+    key = season_cache_key(revision, season_name)
+    season = cache.get(key)
+    if season is None:
+        row = models.Season.objects.filter(season_name=season_name).values_list(
+            *ResolvedSeason._fields,
+        ).first()
+        if row is None:
+            return None
+        season = ResolvedSeason(*row)
+        cache.set(key, tuple(season), SEASON_CACHE_TIMEOUT)
+    season = ResolvedSeason(*season)
+
+    with _local_lock:
+        _local_seasons[local_key] = season
+        while len(_local_seasons) > LOCAL_SEASONS_SIZE:
+            _local_seasons.popitem(last=False)
+
+    return season
+
+
+def get_season_or_404(season_name) -> ResolvedSeason:
+    """Get the season named season_name, raising Http404 if there is none."""
+    season = resolve_season(season_name)
+    if season is None:
+        raise Http404(_('No season named %(name)s.') % {'name': season_name})
+
+    return season
+
+
+def get_season_id(season_name):
+    """Get the id of the season named season_name, or None."""
+    season = resolve_season(season_name)
+
+    return season.season_id if season is not None else None
+
+
+def season_changed(sender, **kwargs):
+    """Drop every resolved season, here and in other processes."""
+    bump_cache_revision(SEASONS_REVISION_KEY)
+    transaction.on_commit(lambda: bump_cache_revision(SEASONS_REVISION_KEY))
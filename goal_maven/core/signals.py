@@ -0,0 +1,188 @@
+"""
+Signal handlers keeping derived data in sync with model writes.
+"""
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from goal_maven.core import models
+from goal_maven.core.authentication import forget_tokens
+from goal_maven.core.reference_data import (
+    REFERENCE_MODELS,
+    reference_table_changed,
+)
+from goal_maven.core.response_cache import (
+    bump_season_revision,
+    instance_season_id,
+)
+from goal_maven.core.seasons import season_changed
+from goal_maven.core.stats import (
+    invalidate_player_stats,
+    record_match_event,
+    refresh_player_season_stats,
+)
+
+
+def event_signature(event) -> tuple:
+    """Get the fields of a match event which player stats depend on."""
+    return (event.event_type_id, event.match_id, event.player_id,
+            event.associated_player_id)
+
+
+def match_event_changed(event, sign):
+    """Update and invalidate the stats of the players in a match event.
+
+    The cached stats are dropped on commit, as a read before then would
+    cache the stats again from the rows being replaced.
+    """
+    record_match_event(event, event.season_id, sign)
+    player_ids = [event.player_id, event.associated_player_id]
+    season_id = event.season_id
+    transaction.on_commit(lambda: invalidate_player_stats(player_ids, season_id))
+
+
+@receiver(pre_save, sender=models.MatchEvent)
+def remember_previous_event(sender, instance, **kwargs):
+    """Keep the stored version of an edited match event."""
+    instance._previous = None
+    if instance.pk:
+        instance._previous = models.MatchEvent.objects.filter(
+            pk=instance.pk,
+        ).first()
+
+
+@receiver(post_save, sender=models.MatchEvent)
+def match_event_saved(sender, instance, **kwargs):
+    """Apply a created or edited match event to player stats."""
+    previous = getattr(instance, '_previous', None)
+    if previous is not None:
+        if event_signature(previous) == event_signature(instance):
+            return
+        match_event_changed(previous, -1)
+    match_event_changed(instance, 1)
+
+
+@receiver(post_delete, sender=models.MatchEvent)
+def match_event_deleted(sender, instance, **kwargs):
+    """Remove a deleted match event from player stats."""
+    match_event_changed(instance, -1)
+
+
+def move_match_events(events, season_id, league_id):
+    """Copy a season and league onto match events, refreshing moved stats."""
+    moved = events.exclude(season_id=season_id, league_id=league_id)
+    pairs = set()
+    for *player_ids, previous_season_id in moved.values_list(
+        'player', 'associated_player', 'season',
+    ):
+        if previous_season_id != season_id:
+            pairs |= {
+                (player_id, event_season_id)
+                for player_id in player_ids
+                for event_season_id in [previous_season_id, season_id]
+            }
+    moved.update(season_id=season_id, league_id=league_id)
+    refresh_player_season_stats(pairs)
+
+
+@receiver(post_save, sender=models.Fixture)
+def fixture_saved(sender, instance, created, **kwargs):
+    """Copy the season and league of an edited fixture onto its matches."""
+    if created:
+        return
+    models.Match.objects.filter(fixture=instance).exclude(
+        season_id=instance.season_id,
+        league_id=instance.league_id,
+    ).update(season_id=instance.season_id, league_id=instance.league_id)
+    move_match_events(
+        models.MatchEvent.objects.filter(match__fixture=instance),
+        instance.season_id,
+        instance.league_id,
+    )
+
+
+@receiver(post_save, sender=models.Match)
+def match_saved(sender, instance, created, **kwargs):
+    """Copy the season and league of an edited match onto its events."""
+    if created:
+        return
+    move_match_events(
+        models.MatchEvent.objects.filter(match=instance),
+        instance.season_id,
+        instance.league_id,
+    )
+
+
+SEASON_SCOPED_MODELS = [
+    models.Season,
+    models.League,
+    models.LeagueTable,
+    models.Fixture,
+    models.Match,
+    models.MatchEvent,
+]
+
+
+def remember_previous_season(sender, instance, **kwargs):
+    """Keep the season an edited instance belonged to before the write."""
+    instance._previous_season_id = None
+    if instance.pk and not isinstance(instance, models.Season):
+        previous = getattr(instance, '_previous', None)
+        if previous is None:
+            previous = sender.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._previous_season_id = instance_season_id(previous)
+
+
+def season_written(season_id):
+    """Bump the revision of a season now and again when the write commits.
+
+    Responses cached by reads during the transaction hold the old rows
+    under the first new revision, which the second one retires.
+    """
+    bump_season_revision(season_id)
+    transaction.on_commit(lambda: bump_season_revision(season_id))
+
+
+def season_instance_saved(sender, instance, **kwargs):
+    """Bump the revision of the seasons an instance was written to."""
+    season_ids = {
+        getattr(instance, '_previous_season_id', None),
+        instance_season_id(instance),
+    }
+    for season_id in season_ids - {None}:
+        season_written(season_id)
+
+
+def season_instance_deleted(sender, instance, **kwargs):
+    """Bump the revision of the season of a deleted instance."""
+    season_written(instance_season_id(instance))
+
+
+for season_model in SEASON_SCOPED_MODELS:
+    pre_save.connect(remember_previous_season, sender=season_model)
+    post_save.connect(season_instance_saved, sender=season_model)
+    post_delete.connect(season_instance_deleted, sender=season_model)
+
+
+for reference_model in REFERENCE_MODELS:
+    post_save.connect(reference_table_changed, sender=reference_model)
+    post_delete.connect(reference_table_changed, sender=reference_model)
+
+post_save.connect(season_changed, sender=models.Season)
+post_delete.connect(season_changed, sender=models.Season)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Stop accepting a deleted token from the token cache."""
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=models.User)
+def user_saved(sender, instance, created, **kwargs):
+    """Drop the cached user of the tokens of an edited user."""
+    if created:
+        return
+    forget_tokens(Token.objects.filter(user=instance).values_list('key', flat=True))
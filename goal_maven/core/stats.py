@@ -0,0 +1,354 @@
+"""
+Aggregations over match events used by the stats APIs.
+"""
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from goal_maven.core import models
+from goal_maven.core.reference_data import (
+    EVENT_CATEGORIES,
+    event_category_ids,
+    reference_name,
+)
+
+
+# Player stat counter -> (MatchEvent player field credited, event category counted).
+PLAYER_COUNTERS = {
+    'goals': ('player', 'goal'),
+    'assists': ('associated_player', 'assist'),
+    'fouls': ('player', 'foul'),
+    'yellow_cards': ('player', 'yellow_card'),
+    'red_cards': ('player', 'red_card'),
+    'shots_on': ('player', 'shot_on'),
+    'own_goals': ('player', 'own_goal'),
+}
+PLAYER_STAT_FIELDS = list(PLAYER_COUNTERS) + ['appearances']
+
+# Team leaderboard -> (player stat counter ranked, player name key, total key).
+TEAM_LEADERBOARDS = {
+    'most_goals': ('goals', 'player__player_name', 'total_goals'),
+    'most_assists': ('assists', 'associated_player__player_name', 'total_assists'),
+    'most_yellow_cards': (
+        'yellow_cards', 'player__player_name', 'total_yellow_cards',
+    ),
+    'most_red_cards': ('red_cards', 'player__player_name', 'total_red_cards'),
+}
+
+PLAYER_STATS_CACHE_TIMEOUT = 60 * 60
+
+
+def aggregate_player_stats(player, events) -> dict:
+    """Aggregate all stats of a player over a queryset of match events."""
+    roles = {
+        'player': Q(player=player),
+        'associated_player': Q(associated_player=player),
+    }
+    counters = {
+        field: Count('event_id', filter=roles[role] & Q(
+            event_type_id__in=event_category_ids(category),
+        ))
+        for field, (role, category) in PLAYER_COUNTERS.items()
+    }
+
+    return events.filter(roles['player'] | roles['associated_player']).aggregate(
+        **counters,
+        appearances=Count('match', distinct=True),
+    )
+
+
+def compute_player_season_stats(player, season_id) -> dict:
+    """Compute all stats of a player in a season from match events."""
+    return aggregate_player_stats(
+        player, models.MatchEvent.objects.filter(season_id=season_id),
+    )
+
+
+def compute_all_player_season_stats(season_id=None, player_ids=None) -> dict:
+    """Compute the stats of every player in every season from match events.
+
+    Passing season_id and player_ids narrows it to those players in that
+    season, still with one query per role and one for appearances.
+    """
+    stats = defaultdict(lambda: dict.fromkeys(PLAYER_STAT_FIELDS, 0))
+    events = models.MatchEvent.objects.all()
+    if season_id is not None:
+        events = events.filter(season_id=season_id)
+
+    def role_events(role):
+        if player_ids is None:
+            return events.filter(**{f'{role}__isnull': False})
+        return events.filter(**{f'{role}__in': player_ids})
+
+    for role in ['player', 'associated_player']:
+        counters = {
+            field: Count('event_id', filter=Q(
+                event_type_id__in=event_category_ids(category),
+            ))
+            for field, (counter_role, category) in PLAYER_COUNTERS.items()
+            if counter_role == role
+        }
+        rows = role_events(role).values(
+            role, 'season',
+        ).annotate(**counters).order_by()
+        for row in rows.iterator():
+            key = (row.pop(role), row.pop('season'))
+            stats[key].update(row)
+
+    appearances = role_events('player').values_list(
+        'player', 'match', 'season',
+    ).union(
+        role_events('associated_player').values_list(
+            'associated_player', 'match', 'season',
+        ),
+    )
+    for player_id, match_id, event_season_id in appearances.iterator():
+        stats[(player_id, event_season_id)]['appearances'] += 1
+
+    return dict(stats)
+
+
+def player_season_stats(player, season_id) -> dict:
+    """Get the materialized stats of a player in a season."""
+    stats = models.PlayerSeasonStats.objects.filter(
+        player=player,
+        season_id=season_id,
+    ).values(*PLAYER_STAT_FIELDS).first()
+
+    return stats or dict.fromkeys(PLAYER_STAT_FIELDS, 0)
+
+
+def team_leaders(season_id, team_ids) -> dict:
+    """Get the leaderboard leaders of teams in a season with one query.
+
+    Every leaderboard is ranked with a ROW_NUMBER window over the
+    PlayerSeasonStats rows of each team. team_ids may be a list or a
+    queryset of team ids; teams without any leader map to empty boards.
+    """
+    ranks = {
+        f'{board}_rank': Window(
+            expression=RowNumber(),
+            partition_by=[F('player__team')],
+            order_by=[F(counter).desc(), F('player').asc()],
+        )
+        for board, (counter, name_key, total_key) in TEAM_LEADERBOARDS.items()
+    }
+    counters = [counter for counter, name_key, total_key in TEAM_LEADERBOARDS.values()]
+    rows = models.PlayerSeasonStats.objects.filter(
+        season_id=season_id,
+        player__team__in=team_ids,
+    ).annotate(**ranks).values('player__team', 'player__player_name', *counters, *ranks)
+
+    leaders = defaultdict(lambda: dict.fromkeys(TEAM_LEADERBOARDS))
+    for row in rows:
+        for board, (counter, name_key, total_key) in TEAM_LEADERBOARDS.items():
+            if row[f'{board}_rank'] == 1 and row[counter] > 0:
+                leaders[row['player__team']][board] = {
+                    name_key: row['player__player_name'],
+                    total_key: row[counter],
+                }
+
+    return leaders
+
+
+def league_team_leaders(league_id, season_id) -> dict:
+    """Get the leaderboard leaders of every team of a league in a season."""
+    return team_leaders(
+        season_id,
+        models.LeagueTable.objects.filter(
+            league_id=league_id,
+            season_id=season_id,
+        ).values('team'),
+    )
+
+
+def player_stats_cache_key(player_id, season_id) -> str:
+    """Get the cache key of the stats of a player in a season."""
+    return f'player-stats:{player_id}:{season_id}'
+
+
+def cached_player_season_stats(player, season_id) -> dict:
+    """Get the stats of a player in a season, reading them on cache miss."""
+    stats, cached = read_player_season_stats(player.pk, season_id)
+    if not cached:
+        cache_player_season_stats(player.pk, season_id, stats)
+
+    return stats
+
+
+def read_player_season_stats(player_id, season_id) -> tuple:
+    """Get the stats of a player in a season and whether they were cached.
+
+    Stats read from the table are not cached, so callers can first check
+    the player exists.
+    """
+    stats = cache.get(player_stats_cache_key(player_id, season_id))
+    if stats is not None:
+        return stats, True
+
+    return player_season_stats(player_id, season_id), False
+
+
+def cache_player_season_stats(player_id, season_id, stats):
+    """Cache the stats of a player in a season."""
+    cache.set(
+        player_stats_cache_key(player_id, season_id), stats, PLAYER_STATS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_player_stats(player_ids, season_id):
+    """Drop the cached stats of the given players in a season."""
+    cache.delete_many([
+        player_stats_cache_key(player_id, season_id)
+        for player_id in set(player_ids) if player_id is not None
+    ])
+
+
+def count_player_appearances(player_id, season_id) -> int:
+    """Count the matches a player has been involved in during a season."""
+    return models.MatchEvent.objects.filter(
+        Q(player_id=player_id) | Q(associated_player_id=player_id),
+        season_id=season_id,
+    ).values('match').distinct().count()
+
+
+def apply_player_stats_delta(player_id, season_id, delta, appearances):
+    """Add a delta of stat counters to the stats row of a player in a season.
+
+    Appearances are set rather than incremented, so that events removed in
+    bulk cannot be counted as a player leaving the same match twice.
+    """
+    delta = {field: value for field, value in delta.items() if value}
+    rows = models.PlayerSeasonStats.objects.filter(
+        player_id=player_id,
+        season_id=season_id,
+    )
+    updates = {field: F(field) + value for field, value in delta.items()}
+    if rows.update(appearances=appearances, **updates):
+        return
+    if appearances <= 0 and all(value <= 0 for value in delta.values()):
+        return
+    try:
+        with transaction.atomic():
+            models.PlayerSeasonStats.objects.create(
+                player_id=player_id,
+                season_id=season_id,
+                appearances=appearances,
+                **{field: max(value, 0) for field, value in delta.items()},
+            )
+    except IntegrityError:
+        rows.update(appearances=appearances, **updates)
+
+
+def record_match_event(event, season_id, sign=1):
+    """Apply the stats of a match event being added (1) or removed (-1)."""
+    if season_id is None:
+        return
+    event_name = reference_name(models.EventType, event.event_type_id)
+    deltas = defaultdict(Counter)
+    for field, (role, category) in PLAYER_COUNTERS.items():
+        player_id = getattr(event, f'{role}_id')
+        if player_id is not None and event_name in EVENT_CATEGORIES[category]:
+            deltas[player_id][field] += sign
+
+    for player_id in {event.player_id, event.associated_player_id} - {None}:
+        apply_player_stats_delta(
+            player_id,
+            season_id,
+            deltas[player_id],
+            appearances=count_player_appearances(player_id, season_id),
+        )
+
+
+@transaction.atomic
+def rebuild_player_season_stats(batch_size=1000) -> int:
+    """Recompute the whole PlayerSeasonStats table from match events."""
+    stats = compute_all_player_season_stats()
+    stale = list(models.PlayerSeasonStats.objects.values_list('player', 'season'))
+    models.PlayerSeasonStats.objects.all().delete()
+    models.PlayerSeasonStats.objects.bulk_create(
+        [
+            models.PlayerSeasonStats(player_id=player_id, season_id=season_id, **row)
+            for (player_id, season_id), row in stats.items()
+        ],
+        batch_size=batch_size,
+    )
+    keys = [
+        player_stats_cache_key(player_id, season_id)
+        for player_id, season_id in set(stale) | set(stats)
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+    return len(stats)
+
+
+def refresh_player_season_stats(pairs):
+    """Recompute the stored stats of (player_id, season_id) pairs from events."""
+    keys = []
+    for player_id, season_id in set(pairs):
+        if player_id is None or season_id is None:
+            continue
+        rows = models.PlayerSeasonStats.objects.filter(
+            player_id=player_id,
+            season_id=season_id,
+        )
+        stats = compute_player_season_stats(player_id, season_id)
+        if any(stats.values()):
+            rows.update_or_create(
+                player_id=player_id, season_id=season_id, defaults=stats,
+            )
+        else:
+            rows.delete()
+        keys.append(player_stats_cache_key(player_id, season_id))
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@transaction.atomic
+def refresh_season_player_stats(season_id, player_ids):
+    """Recompute the stored stats of many players in a season at once.
+
+    Unlike refresh_player_season_stats, the number of queries does not
+    grow with the number of players. Cached stats are dropped on commit,
+    like those of match event writes.
+    """
+    player_ids = set(player_ids) - {None}
+    if season_id is None or not player_ids:
+        return
+    stats = compute_all_player_season_stats(season_id, player_ids)
+    models.PlayerSeasonStats.objects.filter(
+        season_id=season_id,
+        player_id__in=player_ids,
+    ).delete()
+    models.PlayerSeasonStats.objects.bulk_create([
+        models.PlayerSeasonStats(player_id=player_id, season_id=season_id, **row)
+        for (player_id, _), row in stats.items()
+        if any(row.values())
+    ])
+    transaction.on_commit(lambda: invalidate_player_stats(player_ids, season_id))
+
+
+def diff_player_season_stats() -> list:
+    """Compare the PlayerSeasonStats table against a full recompute.
+
+    Returns (player_id, season_id, field, stored, expected) for each mismatch.
+    """
+    expected = compute_all_player_season_stats()
+    stored = {
+        (row.pop('player'), row.pop('season')): row
+        for row in models.PlayerSeasonStats.objects.values(
+            'player', 'season', *PLAYER_STAT_FIELDS,
+        ).iterator()
+    }
+    zeros = dict.fromkeys(PLAYER_STAT_FIELDS, 0)
+    diffs = []
+    for key in sorted(expected.keys() | stored.keys()):
+        for field in PLAYER_STAT_FIELDS:
+            stored_value = stored.get(key, zeros)[field]
+            expected_value = expected.get(key, zeros)[field]
+            if stored_value != expected_value:
+                diffs.append((*key, field, stored_value, expected_value))
+
+    return diffs
@@ -0,0 +1,20 @@
+"""
+Test runner for the project.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+# Repeats of one query shape allowed per request while testing.
+TEST_NPLUSONE_THRESHOLD = 2
+
+
+class NPlusOneTestRunner(DiscoverRunner):
+    """Test runner failing every request of the suite which has an N+1."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.NPLUSONE_THRESHOLD = (
+            settings.NPLUSONE_THRESHOLD or TEST_NPLUSONE_THRESHOLD
+        )
+        settings.NPLUSONE_RAISE = True
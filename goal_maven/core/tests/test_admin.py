@@ -3,11 +3,17 @@ Tests for the Django admin modifications.
 """
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.test import Client
 
 from datetime import date
+from unittest.mock import patch
 
+from goal_maven.core import models
+from goal_maven.core.admin import MatchEventAdmin, list_display_relations
+from goal_maven.core.pagination import EstimatedCountPaginator, estimated_count
 from goal_maven.core.tests.helper_methods import HelperMethods
 
 # import pdb
@@ -474,6 +480,88 @@ class AdminSiteTests(TestCase):
         self.assertContains(res, self.matchevent.event_type.event_name)
         self.assertContains(res, self.matchevent.player.player_name)
 
+    def test_matchevent_list_select_related(self):
+        """Test the match event changelist joins its columns and their names."""
+        paths = list_display_relations(
+            models.MatchEvent, MatchEventAdmin.list_display,
+        )
+
+        self.assertCountEqual(paths, [
+            'event_type', 'player', 'match', 'match__fixture',
+            'match__fixture__home_team', 'match__fixture__away_team',
+        ])
+
+    def test_matchevent_list_constant_queries(self):
+        """Test the match event changelist queries do not grow with rows."""
+        url = reverse('admin:core_matchevent_changelist')
+        with CaptureQueriesContext(connection) as one_event:
+            self.client.get(url)
+        for number in range(5):
+            self.helper.create_matchevent(
+                event_type=f'event {number}', player=f'player {number}',
+                match=self.matchevent.match,
+            )
+
+        with CaptureQueriesContext(connection) as six_events:
+            res = self.client.get(url)
+
+        self.assertContains(res, 'player 4')
+        self.assertEqual(len(six_events), len(one_event))
+
+    def test_matchevent_list_keyset_pages(self):
+        """Test match events page forward by key after the last one shown."""
+        for number in range(3):
+            self.helper.create_matchevent(
+                event_type=f'event {number}', player=f'player {number}',
+                match=self.matchevent.match,
+            )
+        events = list(models.MatchEvent.objects.order_by('event_id'))
+        url = reverse('admin:core_matchevent_changelist')
+
+        with patch.object(MatchEventAdmin, 'list_per_page', 2):
+            res = self.client.get(url)
+            next_res = self.client.get(url, {'after': events[1].event_id})
+
+        self.assertContains(res, f'?after={events[1].event_id}')
+        self.assertContains(next_res, 'player 2')
+        self.assertNotContains(next_res, 'player 0')
+
+    def test_matchevent_list_filtered_by_match(self):
+        """Test the match changelist links to the events of each match."""
+        other = self.helper.create_matchevent(
+            event_type='other event', player='other player',
+            match=models.Match.objects.create(fixture=self.fixture),
+        )
+        events_url = reverse('admin:core_matchevent_changelist')
+        link = f'{events_url}?match__exact={self.matchevent.match_id}'
+
+        res = self.client.get(reverse('admin:core_match_changelist'))
+        events_res = self.client.get(link)
+
+        self.assertContains(res, link)
+        self.assertContains(events_res, self.matchevent.player.player_name)
+        self.assertNotContains(events_res, other.player.player_name)
+
+    def test_matchevent_list_filtered_by_season(self):
+        """Test match events are filtered by the season of their fixture."""
+        url = reverse('admin:core_matchevent_changelist')
+        season_id = self.matchevent.match.fixture.season_id
+
+        res = self.client.get(url, {'season__season_id__exact': season_id})
+
+        self.assertContains(res, self.matchevent.player.player_name)
+
+    def test_estimated_count_paginator(self):
+        """Test large querysets are counted by the planner's estimate."""
+        queryset = models.MatchEvent.objects.order_by('event_id')
+
+        with patch(
+            'goal_maven.core.pagination.estimated_count', return_value=2_000_000,
+        ):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 2_000_000)
+        self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 1)
+        self.assertIsInstance(estimated_count(queryset), int)
+
     def test_edit_matchevent_page(self):
         """Test the edit match event page works."""
         url = reverse(
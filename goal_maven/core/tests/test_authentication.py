@@ -0,0 +1,109 @@
+"""
+Tests for the cached token authentication.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from goal_maven.core.authentication import (
+    _local_tokens,
+    token_cache_key,
+    token_cache_stats,
+)
+from goal_maven.core.tests.helper_methods import HelperMethods
+
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token users are cached until the token or user changes."""
+
+    def setUp(self):
+        self.user = HelperMethods().get_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def token_queries(self):
+        """Make a request, returning the token queries it ran."""
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return [
+            query for query in context.captured_queries
+            if 'authtoken_token' in query['sql']
+        ]
+
+    def test_token_read_once(self):
+        """Test a token is only read from the database on the first request."""
+        before = token_cache_stats()
+
+        self.assertEqual(len(self.token_queries()), 1)
+        self.assertEqual(self.token_queries(), [])
+        self.assertEqual(self.token_queries(), [])
+
+        after = token_cache_stats()
+        self.assertEqual(after['database'] - before['database'], 1)
+        self.assertEqual(after['local'] - before['local'], 2)
+        self.assertGreater(after['hit_rate'], 0)
+
+    def test_shared_cache_keeps_no_credentials(self):
+        """Test the shared cache only keeps the pk and flags of a token's user."""
+        self.token_queries()
+
+        self.assertEqual(cache.get(token_cache_key(self.token.key)), {
+            'pk': self.user.pk,
+            'is_active': True,
+            'is_staff': self.user.is_staff,
+        })
+
+    def test_shared_cache_hit_reads_user_by_pk(self):
+        """Test a token only in the shared cache is resolved without the token table."""
+        self.token_queries()
+        _local_tokens.clear()
+        before = token_cache_stats()
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['email'], self.user.email)
+        self.assertFalse(any(
+            'authtoken_token' in query['sql'] for query in context.captured_queries
+        ))
+        self.assertEqual(token_cache_stats()['shared'] - before['shared'], 1)
+
+    def test_deleted_token_rejected(self):
+        """Test a cached token stops working once deleted."""
+        self.token_queries()
+
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a cached user is rejected once deactivated."""
+        self.token_queries()
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_edited_user_served_fresh(self):
+        """Test requests see the saved version of a cached user."""
+        self.token_queries()
+
+        self.user.first_name = 'renamed'
+        self.user.save()
+
+        self.assertEqual(self.client.get(ME_URL).data['first_name'], 'renamed')
@@ -1,13 +1,26 @@
 """
 Test custom Django management commands.
 """
+import importlib
+import json
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase
+
+from goal_maven.core import models, stats
+from goal_maven.core.management.commands.benchmark_api import Command
+from goal_maven.core.reference_data import EVENT_CATEGORIES
+from goal_maven.core.tests.helper_methods import HelperMethods
 
 
 @patch('goal_maven.core.management.commands.wait_for_db.Command.check')
@@ -32,3 +45,338 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class PlayerStatsCommandTests(TestCase):
+    """Test player season stats commands."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        self.player = self.helper.create_player(player_name='Scorer')
+        self.match = self.helper.create_match()
+        self.season = self.match.fixture.season
+        for minute in [10, 20]:
+            self.helper.create_matchevent(
+                event_type='Goal',
+                player=self.player,
+                match=self.match,
+                minute=minute,
+            )
+
+    def test_check_player_stats_consistent(self):
+        """Test checking consistent player stats succeeds."""
+        out = StringIO()
+
+        call_command('check_player_stats', stdout=out)
+
+        self.assertIn('consistent', out.getvalue())
+
+    def test_check_player_stats_reports_drift(self):
+        """Test checking drifted player stats raises an error."""
+        models.PlayerSeasonStats.objects.filter(player=self.player).update(goals=5)
+
+        with self.assertRaises(CommandError):
+            call_command('check_player_stats', stdout=StringIO())
+
+    def test_rebuild_player_stats(self):
+        """Test rebuilding player stats recomputes them from match events."""
+        models.PlayerSeasonStats.objects.all().delete()
+
+        call_command('rebuild_player_stats', stdout=StringIO())
+
+        stats = models.PlayerSeasonStats.objects.get(
+            player=self.player, season=self.season,
+        )
+        self.assertEqual(stats.goals, 2)
+        self.assertEqual(stats.appearances, 1)
+        call_command('check_player_stats', stdout=StringIO())
+
+    def test_migration_backfills_player_stats(self):
+        """Test the PlayerSeasonStats migration replaces partial rows from events."""
+        models.PlayerSeasonStats.objects.all().delete()
+        models.PlayerSeasonStats.objects.create(
+            player=self.player, season=self.season, goals=1,
+        )
+        migration = importlib.import_module(
+            'goal_maven.core.migrations.0051_backfill_playerseasonstats',
+        )
+
+        migration.backfill_player_season_stats(apps, None)
+
+        self.assertEqual(stats.diff_player_season_stats(), [])
+        self.assertEqual(models.PlayerSeasonStats.objects.get(
+            player=self.player, season=self.season,
+        ).goals, 2)
+
+
+class PopulateDataCommandTests(TestCase):
+    """Test the populate_data command."""
+
+    def populate(self, *args):
+        out = StringIO()
+        call_command('populate_data', *args, stdout=out)
+
+        return out.getvalue()
+
+    def counts(self):
+        return {
+            model.__name__: model.objects.count()
+            for model in [
+                models.Nation, models.Team, models.Player, models.League,
+                models.LeagueTable, models.Fixture, models.Match,
+                models.MatchEvent, models.PlayerSeasonStats,
+            ]
+        }
+
+    def test_populate_data_bulk(self):
+        """Test bulk loading the sample data, then loading it again."""
+        out = self.populate('--bulk')
+
+        self.assertIn('rows/s', out)
+        counts = self.counts()
+        self.assertGreater(counts['MatchEvent'], 0)
+        self.assertEqual(counts['Match'], counts['Fixture'])
+        self.assertGreater(counts['PlayerSeasonStats'], 0)
+        self.assertEqual(stats.diff_player_season_stats(), [])
+        self.assertTrue(models.Player.objects.filter(team__isnull=False).exists())
+        self.assertFalse(models.Team.objects.filter(league__isnull=True).exists())
+        self.assertTrue(
+            models.League.objects.filter(champion_team__isnull=False).exists()
+        )
+
+        self.populate('--bulk')
+
+        self.assertEqual(self.counts(), counts)
+
+    def test_populate_data_row_by_row_matches_bulk(self):
+        """Test loading row by row stores the same rows as bulk loading."""
+        self.populate()
+        counts = self.counts()
+
+        self.assertEqual(stats.diff_player_season_stats(), [])
+        models.MatchEvent.objects.all().delete()
+        models.Fixture.objects.all().delete()
+        self.populate('--bulk')
+
+        self.assertEqual(self.counts(), counts)
+
+    def test_populate_data_from_data_dir(self):
+        """Test the data files are read from the given directory."""
+        with self.assertRaises(FileNotFoundError):
+            self.populate('--data-dir', '/nonexistent')
+
+
+class GenerateDataCommandTests(TestCase):
+    """Test the generate_data command."""
+
+    def generate(self, **options):
+        options = {'seasons': 2, 'leagues': 1, 'teams': 4, 'squad': 6,
+                   'seed': 7, 'batch_size': 50, **options}
+        call_command('generate_data', stdout=StringIO(), **options)
+
+    def events_signature(self, prefix='Synthetic'):
+        return [
+            (event, player.replace(prefix, ''), minute, second)
+            for event, player, minute, second in models.MatchEvent.objects.filter(
+                match__fixture__season__season_name__startswith=prefix,
+            ).order_by('event_id').values_list(
+                'event_type__event_name', 'player__player_name', 'minute', 'second',
+            )
+        ]
+
+    def test_generate_double_round_robin(self):
+        """Test every team meets every other team home and away each season."""
+        self.generate()
+
+        for season in models.Season.objects.all():
+            pairs = list(models.Fixture.objects.filter(season=season).values_list(
+                'home_team', 'away_team',
+            ))
+            self.assertEqual(len(pairs), 4 * 3)
+            self.assertEqual(len(set(pairs)), len(pairs))
+            tables = models.LeagueTable.objects.filter(season=season)
+            self.assertEqual(
+                sorted(tables.values_list('position', flat=True)), [1, 2, 3, 4],
+            )
+            self.assertTrue(all(table.matches_played == 6 for table in tables))
+        self.assertEqual(models.Match.objects.count(), 2 * 12)
+
+    def test_generated_events_agree_with_matches(self):
+        """Test goal events add up to the scores and player stats are built."""
+        self.generate()
+
+        for match in models.Match.objects.all():
+            goals = models.MatchEvent.objects.filter(
+                match=match,
+                event_type__event_name__in=EVENT_CATEGORIES['goal'] + ['Own Goal'],
+            ).count()
+            self.assertEqual(goals, match.home_team_goals + match.away_team_goals)
+        self.assertEqual(stats.diff_player_season_stats(), [])
+        self.assertTrue(models.PlayerSeasonStats.objects.exists())
+
+    def test_generate_is_deterministic(self):
+        """Test the same seed generates the same events."""
+        self.generate(prefix='First')
+        self.generate(prefix='Second')
+        self.generate(prefix='Other', seed=8)
+
+        first = self.events_signature('First')
+        self.assertEqual(first, self.events_signature('Second'))
+        self.assertNotEqual(first, self.events_signature('Other'))
+
+    def test_generate_refuses_existing_prefix(self):
+        """Test generating twice with the same prefix raises an error."""
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class BenchmarkApiCommandTests(TestCase):
+    """Test the benchmark_api command."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        season = self.helper.create_season(season_name='bench season')
+        league = self.helper.create_league(league_name='bench league', season=season)
+        team = self.helper.create_team(team_name='bench team', league=league)
+        self.helper.create_leaguetable(team=team, league=league, season=season)
+        fixture = self.helper.create_fixture(
+            league=league, season=season.season_name, home_team='bench team',
+        )
+        match = self.helper.create_match(fixture=fixture)
+        self.helper.create_matchevent(event_type='Goal', player='Scorer', match=match)
+        self.output = tempfile.NamedTemporaryFile(suffix='.json')
+        self.addCleanup(self.output.close)
+
+    def benchmark(self, *args):
+        call_command(
+            'benchmark_api', '--iterations', '2', '--warmup', '0',
+            '--output', self.output.name, *args,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    def results(self):
+        with open(self.output.name) as f:
+            return {result['url']: result for result in json.load(f)['endpoints']}
+
+    def test_benchmark_records_every_stats_route(self):
+        """Test the stats routes are measured and within their budgets."""
+        self.benchmark('--filter', 'stats')
+
+        results = self.results()
+        names = {result['name'] for result in results.values()}
+        self.assertEqual(names, {
+            'player:player-season-stats',
+            'team:team-season-stats',
+            'team:league-team-stats',
+        })
+        for result in results.values():
+            self.assertEqual(result['status'], 200)
+            self.assertLessEqual(result['queries'], 3)
+            self.assertGreater(result['p50_ms'], 0)
+            self.assertGreater(result['peak_kb'], 0)
+            self.assertEqual(result['violations'], [])
+
+    def test_benchmark_fails_over_budget(self):
+        """Test exceeding a budget raises an error after writing the results."""
+        budgets = tempfile.NamedTemporaryFile('w', suffix='.json')
+        self.addCleanup(budgets.close)
+        json.dump({'team:team-season-stats': {'queries': 1}}, budgets)
+        budgets.flush()
+
+        with self.assertRaisesMessage(CommandError, 'team:team-season-stats: queries'):
+            self.benchmark('--filter', 'stats', '--budgets', budgets.name)
+
+        self.assertEqual(len(self.results()), 3)
+        self.assertFalse(get_user_model().objects.filter(
+            email__startswith='benchmark-',
+        ).exists())
+
+    def test_benchmark_keeps_other_cache_keys(self):
+        """Test cold runs clear only the cache keys the benchmark used."""
+        cache.set('unrelated', 1)
+        self.addCleanup(cache.delete, 'unrelated')
+
+        self.benchmark('--filter', 'stats')
+
+        self.assertEqual(cache.get('unrelated'), 1)
+
+    def test_client_errors_are_violations(self):
+        """Test 4xx responses are counted as errors, not successful samples."""
+        result = {'status': 404, 'errors': 2}
+
+        self.assertEqual(
+            Command().violations(result, {}),
+            ['2 non-2xx responses (status 404)'],
+        )
+
+
+class BenchmarkApiServerTests(LiveServerTestCase):
+    """Test the benchmark_api command against a running server."""
+
+    def test_server_throughput_measured(self):
+        """Test every stats route of a server is loaded concurrently."""
+        helper = HelperMethods()
+        # The user a killed run leaves behind.
+        leftover = Command().create_token().user
+        season = helper.create_season(season_name='bench season')
+        league = helper.create_league(league_name='bench league', season=season)
+        team = helper.create_team(team_name='bench team', league=league)
+        helper.create_leaguetable(team=team, league=league, season=season)
+        models.PlayerSeasonStats.objects.create(
+            player=helper.create_player(player_name='Scorer', team=team),
+            season=season,
+            goals=1,
+        )
+        output = tempfile.NamedTemporaryFile(suffix='.json')
+        self.addCleanup(output.close)
+
+        call_command(
+            'benchmark_api', '--url', self.live_server_url, '--filter', 'stats',
+            '--iterations', '4', '--warmup', '1', '--concurrency', '2',
+            '--output', output.name, stdout=StringIO(), stderr=StringIO(),
+        )
+
+        with open(output.name) as f:
+            report = json.load(f)
+        self.assertEqual(report['server'], self.live_server_url)
+        self.assertEqual(len(report['endpoints']), 6)
+        for result in report['endpoints']:
+            self.assertEqual(result['status'], 200)
+            self.assertGreater(result['requests_per_s'], 0)
+        self.assertEqual(
+            list(get_user_model().objects.filter(email__startswith='benchmark-')),
+            [leftover],
+        )
+
+
+class BenchmarkSeasonFiltersCommandTests(TestCase):
+    """Test the benchmark_season_filters command."""
+
+    def test_denormalized_season_filter_skips_joins(self):
+        """Test the copied season filters events without joining fixtures."""
+        call_command(
+            'generate_data', stdout=StringIO(),
+            seasons=1, leagues=1, teams=4, squad=6, seed=1,
+        )
+        out = StringIO()
+
+        call_command('benchmark_season_filters', '--samples', '3', stdout=out)
+
+        results = {
+            (result['query'], result['strategy']): result
+            for result in json.loads(out.getvalue())['queries']
+        }
+        for query in ['player_season_stats', 'season_player_totals']:
+            joined = results[(query, 'joined')]
+            denormalized = results[(query, 'denormalized')]
+            self.assertIn('core_fixture', joined['tables'])
+            self.assertNotIn('core_fixture', denormalized['tables'])
+            self.assertNotIn('core_match', denormalized['tables'])
+            self.assertLess(denormalized['joins'], joined['joins'])
+
+    def test_no_dataset_raises_error(self):
+        """Test benchmarking without player stats raises an error."""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_season_filters', stdout=StringIO())
@@ -0,0 +1,96 @@
+"""
+Tests for the pooled database backend.
+"""
+import time
+
+from django.db import OperationalError, connection
+from django.test import TestCase
+from psycopg2 import extensions
+
+from goal_maven.core.db.base import DatabaseWrapper
+from goal_maven.core.db.pool import close_pools, pool_stats
+
+
+class ConnectionPoolTests(TestCase):
+    """Test connections are pooled, checked and capped per process."""
+
+    def setUp(self):
+        self.alias = f'pool-{self._testMethodName}'
+        self.addCleanup(close_pools, alias=self.alias)
+
+    def wrapper(self, max_size=2, timeout=0.1) -> DatabaseWrapper:
+        """Get a connection to the test database with its own pool."""
+        settings_dict = dict(connection.settings_dict)
+        settings_dict['POOL'] = {'MAX_SIZE': max_size, 'TIMEOUT': timeout}
+        wrapper = DatabaseWrapper(settings_dict, alias=self.alias)
+        self.addCleanup(wrapper.close)
+
+        return wrapper
+
+    def stats(self) -> dict:
+        return pool_stats()[f"{self.alias}:{connection.settings_dict['NAME']}"]
+
+    def test_closed_connection_reused(self):
+        """Test closing a connection returns it to the pool for reuse."""
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+
+        wrapper.close()
+        wrapper.ensure_connection()
+
+        self.assertIs(wrapper.connection, raw)
+        stats = self.stats()
+        self.assertEqual((stats['opened'], stats['reused']), (1, 1))
+        self.assertEqual((stats['in_use'], stats['idle']), (1, 0))
+
+    def test_dead_connection_replaced(self):
+        """Test an idle connection ended by the server is not handed out."""
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        pid = wrapper.connection.get_backend_pid()
+        wrapper.close()
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+            for _ in range(50):
+                cursor.execute('SELECT 1 FROM pg_stat_activity WHERE pid = %s', [pid])
+                if cursor.fetchone() is None:
+                    break
+                time.sleep(0.02)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+        self.assertNotEqual(wrapper.connection.get_backend_pid(), pid)
+        self.assertEqual(self.stats()['discarded'], 1)
+        self.assertEqual(self.stats()['opened'], 2)
+
+    def test_pool_size_capped(self):
+        """Test checkouts past the pool size wait, then fail."""
+        first = self.wrapper(max_size=1)
+        second = self.wrapper(max_size=1)
+        first.ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            second.ensure_connection()
+        self.assertEqual(self.stats()['timeouts'], 1)
+
+        first.close()
+        second.ensure_connection()
+        self.assertEqual(self.stats()['reused'], 1)
+
+    def test_open_transaction_rolled_back(self):
+        """Test a connection returned inside a transaction is rolled back."""
+        wrapper = self.wrapper()
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        raw = wrapper.connection
+        self.assertEqual(
+            raw.get_transaction_status(), extensions.TRANSACTION_STATUS_INTRANS,
+        )
+
+        wrapper.close()
+
+        self.assertEqual(raw.get_transaction_status(), extensions.TRANSACTION_STATUS_IDLE)
+        self.assertEqual(self.stats()['idle'], 1)
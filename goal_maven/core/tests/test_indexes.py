@@ -0,0 +1,117 @@
+"""
+Test the hot query paths are served by indexes.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from goal_maven.core import models, stats
+from goal_maven.core.db.explain import plan_nodes, query_plan
+from goal_maven.core.tests.helper_methods import HelperMethods
+
+
+SCAN_NODES = ['Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan']
+
+# Tables growing with the matches played; seasons and the other reference
+# tables stay small enough for the planner to scan them whole.
+LARGE_TABLES = [
+    model._meta.db_table for model in [
+        models.Player, models.Team, models.LeagueTable, models.Fixture,
+        models.Match, models.MatchEvent, models.PlayerSeasonStats,
+    ]
+]
+
+
+class IndexUsageTests(TestCase):
+    """Test the stats queries use index scans on a generated dataset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_data', stdout=StringIO(),
+            seasons=1, leagues=2, teams=6, squad=8, seed=3,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(HelperMethods().get_user())
+        self.table = models.LeagueTable.objects.select_related('season').first()
+        self.player_id = models.PlayerSeasonStats.objects.filter(
+            season=self.table.season,
+        ).values_list('player', flat=True).first()
+
+    def explain(self, sql):
+        """Get the plan of a query with sequential scans and hash or merge joins off.
+
+        The dataset is small enough for the planner to prefer reading
+        whole tables, so those plans are disabled. The planner still
+        falls back to them when no index can serve a filter or join.
+        """
+        return query_plan(
+            sql, disabled=['enable_seqscan', 'enable_hashjoin', 'enable_mergejoin'],
+        )
+
+    def assertIndexScans(self, sql):
+        """Assert every large table a query filters is searched through an index.
+
+        A scan filtering rows without an Index Cond reads the whole table
+        or index, which is what a missing index looks like.
+        """
+        scans = [
+            (node['Node Type'], node['Relation Name'], node['Filter'])
+            for node in plan_nodes(self.explain(sql))
+            if node['Node Type'] in SCAN_NODES and 'Filter' in node
+            and 'Index Cond' not in node and 'Recheck Cond' not in node
+            and node['Relation Name'] in LARGE_TABLES
+        ]
+        self.assertEqual(scans, [], f'Unindexed scans for {sql}')
+
+    def assertEndpointUsesIndexes(self, url):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertIndexScans(sql)
+
+    def test_player_season_stats_use_indexes(self):
+        """Test the player season stats endpoint uses index scans."""
+        self.assertEndpointUsesIndexes(reverse(
+            'player:player-season-stats',
+            args=[self.player_id, self.table.season.season_name],
+        ))
+
+    def test_team_season_stats_use_indexes(self):
+        """Test the team season stats endpoint uses index scans."""
+        self.assertEndpointUsesIndexes(reverse(
+            'team:team-season-stats',
+            args=[self.table.team_id, self.table.season.season_name],
+        ))
+
+    def test_league_team_stats_use_indexes(self):
+        """Test the league team stats endpoint uses index scans."""
+        self.assertEndpointUsesIndexes(reverse(
+            'team:league-team-stats',
+            args=[self.table.league_id, self.table.season.season_name],
+        ))
+
+    def test_player_stats_recompute_uses_indexes(self):
+        """Test recomputing a player's stats from events uses index scans."""
+        with CaptureQueriesContext(connection) as context:
+            stats.compute_player_season_stats(self.player_id, self.table.season_id)
+
+        self.assertIndexScans(context.captured_queries[-1]['sql'])
@@ -0,0 +1,165 @@
+"""
+Tests for core middleware.
+"""
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from goal_maven.core import models
+from goal_maven.core.admin import TeamAdmin
+from goal_maven.core.middleware import (
+    NPlusOneError,
+    QueryShapeCounter,
+    query_shape,
+)
+from goal_maven.core.tests.helper_methods import HelperMethods
+
+
+def fixtures_url(season_name):
+    return reverse('fixture:fixture-list', args=[season_name])
+
+
+class QueryProfilingMiddlewareTests(TestCase):
+    """Test the query profiling middleware."""
+
+    def setUp(self):
+        cache.clear()
+        self.helper = HelperMethods()
+        self.user = self.helper.get_user()
+        self.fixture = self.helper.create_fixture(season='profiled season')
+
+    def client_for_request(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        return client
+
+    def test_profiling_off_by_default(self):
+        """Test no profile is added unless a sample rate is set."""
+        res = self.client_for_request().get(fixtures_url('profiled season'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', res)
+
+    @override_settings(QUERY_PROFILING_SAMPLE_RATE=1.0)
+    def test_profiled_request_headers_and_log(self):
+        """Test a profiled request gets timing headers and a log line."""
+        with self.assertLogs('goal_maven.profiling', 'INFO') as logs:
+            res = self.client_for_request().get(fixtures_url('profiled season'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        timings = [part.split(';')[0] for part in res['Server-Timing'].split(', ')]
+        self.assertEqual(timings, ['db', 'serializer', 'slowest-query', 'total'])
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['view'], 'fixture:fixture-list')
+        self.assertEqual(line['status'], status.HTTP_200_OK)
+        self.assertEqual(line['queries'], int(res['X-Query-Count']))
+        self.assertGreater(line['queries'], 0)
+        self.assertGreater(line['serializer_ms'], 0)
+        self.assertTrue(line['slowest_query'].startswith('SELECT'))
+
+    @override_settings(QUERY_PROFILING_SAMPLE_RATE=0.5)
+    @patch('goal_maven.core.middleware.random.random')
+    def test_requests_outside_sample_not_profiled(self, patched_random):
+        """Test only the sampled fraction of requests is profiled."""
+        client = self.client_for_request()
+        patched_random.return_value = 0.7
+        skipped = client.get(fixtures_url('profiled season'))
+        patched_random.return_value = 0.2
+        with self.assertLogs('goal_maven.profiling', 'INFO'):
+            profiled = client.get(fixtures_url('profiled season'))
+
+        self.assertNotIn('Server-Timing', skipped)
+        self.assertIn('Server-Timing', profiled)
+
+
+class QueryShapeTests(SimpleTestCase):
+    """Test the normalization of queries into shapes."""
+
+    def test_literals_and_placeholders_normalized(self):
+        """Test queries differing only by values share a shape."""
+        self.assertEqual(
+            query_shape('SELECT * FROM "core_team" WHERE "team_id" IN (%s, %s)'),
+            query_shape("SELECT *  FROM \"core_team\" WHERE \"team_id\" IN (7)"),
+        )
+        self.assertNotEqual(
+            query_shape('SELECT * FROM "core_team" WHERE "team_id" = %s'),
+            query_shape('SELECT * FROM "core_team2" WHERE "team_id" = %s'),
+        )
+
+
+class TeamManagerSerializer(serializers.ModelSerializer):
+    manager_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.Team
+        fields = ['team_id', 'manager_name']
+
+    def get_manager_name(self, team):
+        return team.manager.manager_name
+
+
+@override_settings(NPLUSONE_THRESHOLD=2, NPLUSONE_RAISE=True)
+class NPlusOneMiddlewareTests(TestCase):
+    """Test the N+1 query detector."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        for team_name in ['team1', 'team2', 'team3', 'team4']:
+            self.helper.create_team(team_name=team_name)
+        self.admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123',
+            first_name='test',
+            last_name='admin',
+            username='useradmin69',
+            date_of_birth=date(1996, 1, 5),
+        )
+        self.client.force_login(self.admin_user)
+
+    @patch.object(TeamAdmin, 'get_list_select_related', return_value=False)
+    def test_repeated_admin_column_raises(self, patched_select_related):
+        """Test an admin column loading a row per result is reported."""
+        with self.assertRaises(NPlusOneError) as context:
+            self.client.get(reverse('admin:core_team_changelist'))
+
+        self.assertIn("TeamAdmin.list_display['manager']", str(context.exception))
+        self.assertIn('admin:core_team_changelist', str(context.exception))
+
+    @override_settings(NPLUSONE_RAISE=False)
+    @patch.object(TeamAdmin, 'get_list_select_related', return_value=False)
+    def test_repeated_query_logged_when_not_raising(self, patched_select_related):
+        """Test repeats are logged as warnings when raising is off."""
+        with self.assertLogs('goal_maven.nplusone', 'WARNING') as logs:
+            res = self.client.get(reverse('admin:core_team_changelist'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("TeamAdmin.list_display['league']", logs.output[-1])
+
+    def test_no_report_within_threshold(self):
+        """Test a changelist joining its columns is not reported."""
+        res = self.client.get(reverse('admin:core_team_changelist'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_serializer_field_named_as_source(self):
+        """Test repeats from a serializer name the serializer field."""
+        counter = QueryShapeCounter(threshold=2)
+        teams = models.Team.objects.order_by('team_id')
+
+        with connection.execute_wrapper(counter):
+            TeamManagerSerializer(teams, many=True).data
+
+        self.assertEqual(
+            list(counter.repeated.values()),
+            ['TeamManagerSerializer.manager_name'],
+        )
@@ -1,17 +1,30 @@
 """
 Tests for models.
 """
+import time
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
+from unittest import mock
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.test import Client
-
-from goal_maven.core import models
+from django.test.utils import CaptureQueriesContext
+
+from goal_maven.core import models, stats
+from goal_maven.core.cache_revisions import bump_cache_revision
+from goal_maven.core.reference_data import (
+    REVISION_CHECK_INTERVAL,
+    event_category_ids,
+    reference_id,
+    reference_name,
+    reference_revision_key,
+)
+from goal_maven.core.seasons import resolve_season
 from goal_maven.core.tests.helper_methods import HelperMethods
 
 
@@ -533,3 +546,179 @@ class ModelTests(TestCase):
         self.assertEqual(
             match_event.associated_player.player_name, associated_player
         )
+
+    def test_player_season_stats_follow_match_events(self):
+        """Test player season stats are updated on match event writes."""
+        scorer = self.helper.create_player(player_name='Scorer')
+        assistant = self.helper.create_player(player_name='Assistant')
+        match = self.helper.create_match()
+        season = match.fixture.season
+
+        event = self.helper.create_matchevent(
+            event_type='Goal',
+            player=scorer,
+            associated_player=assistant,
+            match=match,
+        )
+        self.helper.create_matchevent(
+            event_type='Yellow Card',
+            player=scorer,
+            associated_player=assistant,
+            match=match,
+            minute=20,
+        )
+
+        scorer_stats = models.PlayerSeasonStats.objects.get(
+            player=scorer, season=season,
+        )
+        assistant_stats = models.PlayerSeasonStats.objects.get(
+            player=assistant, season=season,
+        )
+        self.assertEqual(scorer_stats.goals, 1)
+        self.assertEqual(scorer_stats.yellow_cards, 1)
+        self.assertEqual(scorer_stats.appearances, 1)
+        self.assertEqual(assistant_stats.assists, 1)
+        self.assertEqual(assistant_stats.appearances, 1)
+
+        event.event_type = models.EventType.objects.get(event_name='Yellow Card')
+        event.save()
+        scorer_stats.refresh_from_db()
+        assistant_stats.refresh_from_db()
+        self.assertEqual(scorer_stats.goals, 0)
+        self.assertEqual(scorer_stats.yellow_cards, 2)
+        self.assertEqual(assistant_stats.assists, 0)
+
+        models.MatchEvent.objects.filter(match=match).delete()
+        scorer_stats.refresh_from_db()
+        self.assertEqual(scorer_stats.yellow_cards, 0)
+        self.assertEqual(scorer_stats.appearances, 0)
+
+    def test_match_and_events_carry_fixture_season_and_league(self):
+        """Test matches and events copy the season and league of the fixture."""
+        match = self.helper.create_match()
+        event = self.helper.create_matchevent(match=match)
+
+        self.assertEqual(match.season_id, match.fixture.season_id)
+        self.assertEqual(match.league_id, match.fixture.league_id)
+        self.assertEqual(event.season_id, match.fixture.season_id)
+        self.assertEqual(event.league_id, match.fixture.league_id)
+
+    def test_fixture_moved_between_seasons_moves_events_and_stats(self):
+        """Test moving a fixture moves its matches, events and player stats."""
+        scorer = self.helper.create_player(player_name='Scorer')
+        match = self.helper.create_match()
+        fixture = match.fixture
+        old_season = fixture.season
+        event = self.helper.create_matchevent(
+            event_type='Goal', player=scorer, match=match,
+        )
+        new_season = self.helper.create_season(season_name='new season')
+        new_league = self.helper.create_league(league_name='new', season=new_season)
+
+        fixture.season = new_season
+        fixture.league = new_league
+        fixture.save()
+
+        match.refresh_from_db()
+        event.refresh_from_db()
+        self.assertEqual((match.season, match.league), (new_season, new_league))
+        self.assertEqual((event.season, event.league), (new_season, new_league))
+        self.assertFalse(models.PlayerSeasonStats.objects.filter(
+            player=scorer, season=old_season,
+        ).exists())
+        self.assertEqual(models.PlayerSeasonStats.objects.get(
+            player=scorer, season=new_season,
+        ).goals, 1)
+
+
+class ReferenceDataTests(TestCase):
+    """Test the process-wide cache of reference tables."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        self.yellow = self.helper.create_eventtype(event_name='Yellow Card')
+        self.red = self.helper.create_eventtype(event_name='Red Card')
+
+    def test_lookups_served_from_memory(self):
+        """Test reference lookups only read a table once."""
+        self.assertEqual(
+            sorted(event_category_ids('card')), sorted([self.yellow.pk, self.red.pk]),
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(event_category_ids('red_card'), [self.red.pk])
+            self.assertEqual(
+                reference_name(models.EventType, self.yellow.pk), 'Yellow Card',
+            )
+            self.assertIsNone(reference_id(models.EventType, 'Own Goal'))
+
+    def test_writes_refresh_lookups(self):
+        """Test creating, renaming and deleting rows refreshes the lookups."""
+        self.assertEqual(event_category_ids('goal'), [])
+        goal = self.helper.create_eventtype(event_name='Penalty Goal')
+        self.assertEqual(event_category_ids('goal'), [goal.pk])
+
+        self.red.event_name = 'Straight Red'
+        self.red.save()
+        self.assertEqual(event_category_ids('red_card'), [])
+        self.assertEqual(reference_name(models.EventType, self.red.pk), 'Straight Red')
+
+        self.yellow.delete()
+        self.assertEqual(event_category_ids('card'), [])
+
+    def test_shared_revision_checked_once_per_interval(self):
+        """Test writes of other processes show after the revision check interval."""
+        event_category_ids('card')
+        with mock.patch('goal_maven.core.reference_data.cache_revision') as revision:
+            for _ in range(10):
+                event_category_ids('goal')
+            revision.assert_not_called()
+
+        # Another process adds a row, moving the shared revision.
+        models.EventType.objects.bulk_create([models.EventType(event_name='Own Goal')])
+        bump_cache_revision(reference_revision_key(models.EventType))
+        self.assertEqual(event_category_ids('own_goal'), [])
+
+        later = time.monotonic() + REVISION_CHECK_INTERVAL
+        with mock.patch('goal_maven.core.reference_data.time.monotonic',
+                        return_value=later):
+            self.assertEqual(
+                event_category_ids('own_goal'),
+                [models.EventType.objects.get(event_name='Own Goal').pk],
+            )
+
+    def test_stats_do_not_join_event_types(self):
+        """Test player stats filter events by event type id."""
+        player = self.helper.create_player()
+        event_category_ids('goal')
+        with CaptureQueriesContext(connection) as context:
+            stats.compute_player_season_stats(player.pk, None)
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('core_eventtype', context.captured_queries[0]['sql'])
+
+
+class SeasonResolverTests(TestCase):
+    """Test the resolution of season names to seasons."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        self.season = self.helper.create_season(season_name='2022-2023')
+
+    def test_resolved_once(self):
+        """Test a season name is only read from the database once."""
+        with self.assertNumQueries(1):
+            season = resolve_season('2022-2023')
+            self.assertEqual(resolve_season('2022-2023'), season)
+
+        self.assertEqual(season.season_id, self.season.season_id)
+        self.assertFalse(season.is_concluded)
+
+    def test_season_writes_refresh_resolution(self):
+        """Test edited and deleted seasons are resolved again."""
+        resolve_season('2022-2023')
+        self.season.is_concluded = True
+        self.season.save()
+        self.assertTrue(resolve_season('2022-2023').is_concluded)
+
+        self.season.delete()
+        self.assertIsNone(resolve_season('2022-2023'))
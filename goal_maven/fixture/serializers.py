@@ -71,3 +71,19 @@ class MatchDetailSerializer(MatchSerializer):
             'home_team_red_cards',
             'away_team_red_cards',
         ]
+
+
+class MatchEventInputSerializer(serializers.Serializer):
+    """Serializer for an event of a batch added to a match.
+
+    Its event type, players and pitch area are given by name.
+    """
+    event_type = serializers.CharField(max_length=50)
+    player = serializers.CharField(max_length=50, required=False, allow_null=True)
+    associated_player = serializers.CharField(
+        max_length=50, required=False, allow_null=True,
+    )
+    pitch_area = serializers.CharField(max_length=50, required=False, allow_null=True)
+    minute = serializers.IntegerField(min_value=0, max_value=32767)
+    second = serializers.IntegerField(min_value=0, max_value=59, default=0)
+    is_extra_time = serializers.BooleanField(default=False)
@@ -1,13 +1,17 @@
 """
 Tests for Fixture APIs.
 """
+import json
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from goal_maven.core.models import Match, Fixture
+from goal_maven.core.models import Match, Fixture, MatchEvent, PlayerSeasonStats
 # from goal_maven.core import models
 
 from goal_maven.core.tests.helper_methods import HelperMethods
@@ -18,6 +22,7 @@ from goal_maven.fixture.serializers import (
     MatchSerializer,
     MatchDetailSerializer,
 )
+from goal_maven.fixture.views import FixtureViewSet
 
 # from datetime import date, time
 
@@ -45,6 +50,11 @@ def detail_url_match(match_id):
     return reverse('fixture:match-detail', args=[match_id])
 
 
+def match_events_url(match_id):
+    """Create and return a match event batch URL."""
+    return reverse('fixture:match-events', args=[match_id])
+
+
 class PublicFixtureAPITests(TestCase):
     """Test unauthenticated API requests."""
 
@@ -67,6 +77,7 @@ class PrivateFixtureApiTests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.staff_client = APIClient()
         self.normal_client = APIClient()
         self.helper = HelperMethods()
@@ -87,11 +98,153 @@ class PrivateFixtureApiTests(TestCase):
 
         res = self.normal_client.get(fixtures_url(season.season_name))
 
-        fixtures = Fixture.objects.filter(season=season)
+        fixtures = Fixture.objects.filter(season=season).order_by('pk')
         serializer = FixtureSerializer(fixtures, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_stream_fixtures_in_chunks(self):
+        """Test streaming the fixtures of a season across several chunks."""
+        season = self.helper.create_season(season_name='season1')
+        league = self.helper.create_league(
+            league_name='league1',
+            season=season,
+        )
+        for _ in range(5):
+            self.helper.create_fixture(league=league, season=season)
+        self.helper.create_fixture(league=league, season='other season')
+
+        with mock.patch.object(FixtureViewSet, 'stream_chunk_size', 2):
+            res = self.normal_client.get(
+                fixtures_url(season.season_name), {'stream': 'true'},
+            )
+            content = b''.join(res.streaming_content)
+
+        fixtures = Fixture.objects.filter(season=season).order_by('pk')
+        serializer = FixtureSerializer(fixtures, many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(content), json.loads(json.dumps(serializer.data)))
+
+    def test_fixture_list_cached_until_season_write(self):
+        """Test fixture lists are cached until a fixture of the season changes."""
+        season = self.helper.create_season(season_name='season1')
+        league = self.helper.create_league(league_name='league1', season=season)
+        fixture = self.helper.create_fixture(league=league, season=season)
+        url = fixtures_url(season.season_name)
+
+        res = self.normal_client.get(url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            res = self.normal_client.get(url)
+        self.assertEqual(res['X-Cache'], 'HIT')
+        self.assertEqual(len(res.data['results']), 1)
+
+        self.helper.create_fixture(league=league, season=season)
+        res = self.normal_client.get(url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 2)
+
+        match = self.helper.create_match(fixture=fixture)
+        matches = self.normal_client.get(matches_url(season.season_name))
+        self.assertEqual(matches['X-Cache'], 'MISS')
+        self.helper.create_matchevent(match=match)
+        matches = self.normal_client.get(matches_url(season.season_name))
+        self.assertEqual(matches['X-Cache'], 'MISS')
+
+        fixture.delete()
+        res = self.normal_client.get(url)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_unknown_season_lists_not_found(self):
+        """Test listing fixtures or matches of a missing season returns 404."""
+        for url in [fixtures_url('no season'), matches_url('no season')]:
+            res = self.normal_client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_renamed_season_resolved_by_new_name(self):
+        """Test a renamed season is only listed under its new name."""
+        season = self.helper.create_season(season_name='season1')
+        self.helper.create_fixture(season=season)
+        self.assertEqual(
+            self.normal_client.get(fixtures_url('season1')).status_code,
+            status.HTTP_200_OK,
+        )
+
+        season.season_name = 'season1 renamed'
+        season.save()
+
+        res = self.normal_client.get(fixtures_url('season1'))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.normal_client.get(fixtures_url('season1 renamed'))
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_match_list_conditional_get(self):
+        """Test a current If-None-Match gets a 304 until the season changes."""
+        season = self.helper.create_season(season_name='season1')
+        league = self.helper.create_league(league_name='league1', season=season)
+        fixture = self.helper.create_fixture(league=league, season=season)
+        match = self.helper.create_match(fixture=fixture)
+        url = matches_url(season.season_name)
+
+        res = self.normal_client.get(url)
+        etag = res['ETag']
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.normal_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertFalse(res.content)
+
+        self.helper.create_matchevent(match=match)
+        res = self.normal_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+        other = self.normal_client.get(
+            fixtures_url(season.season_name), HTTP_IF_NONE_MATCH='"stale"',
+        )
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+    def test_etag_changes_when_write_commits(self):
+        """Test an ETag handed out before a write commits is not current after."""
+        season = self.helper.create_season(season_name='season1')
+        league = self.helper.create_league(league_name='league1', season=season)
+        fixture = self.helper.create_fixture(league=league, season=season)
+        match = self.helper.create_match(fixture=fixture)
+        url = matches_url(season.season_name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.helper.create_matchevent(match=match)
+            # A read during the transaction, still seeing the old rows.
+            etag = self.normal_client.get(url)['ETag']
+
+        res = self.normal_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_fixture_moved_between_seasons_invalidates_both(self):
+        """Test moving a fixture drops the cached lists of both seasons."""
+        season1 = self.helper.create_season(season_name='season1')
+        season2 = self.helper.create_season(season_name='season2')
+        fixture = self.helper.create_fixture(season=season1.season_name)
+        self.normal_client.get(fixtures_url(season1.season_name))
+        self.normal_client.get(fixtures_url(season2.season_name))
+
+        fixture.season = season2
+        fixture.save()
+
+        res1 = self.normal_client.get(fixtures_url(season1.season_name))
+        res2 = self.normal_client.get(fixtures_url(season2.season_name))
+        self.assertEqual(res1['X-Cache'], 'MISS')
+        self.assertEqual(res1.data['results'], [])
+        self.assertEqual(res2['X-Cache'], 'MISS')
+        self.assertEqual(len(res2.data['results']), 1)
 
     def test_retrieve_matches(self):
         """Test retrieving a list of matches."""
@@ -105,11 +258,13 @@ class PrivateFixtureApiTests(TestCase):
 
         res = self.normal_client.get(matches_url(season.season_name))
 
-        matches = Match.objects.filter(fixture__in=[fixture1, fixture2])
+        matches = Match.objects.filter(
+            fixture__in=[fixture1, fixture2],
+        ).order_by('pk')
         serializer = MatchSerializer(matches, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_get_fixture_detail(self):
         """Test get fixture detail."""
@@ -512,3 +667,158 @@ class PrivateFixtureApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
         self.assertTrue(Fixture.objects.filter(fixture_id=fixture.fixture_id).exists())
+
+
+class MatchEventBatchApiTests(TestCase):
+    """Test adding live events to a match in batches."""
+
+    def setUp(self):
+        cache.clear()
+        self.staff_client = APIClient()
+        self.normal_client = APIClient()
+        self.helper = HelperMethods()
+        self.staff_client.force_authenticate(self.helper.get_staff())
+        self.normal_client.force_authenticate(self.helper.get_user())
+        self.season = self.helper.create_season(season_name='2022-2023')
+        fixture = self.helper.create_fixture(season='2022-2023')
+        self.match = self.helper.create_match(fixture=fixture)
+        self.scorers = [
+            self.helper.create_player(player_name=f'scorer{i}', team=team)
+            for i, team in enumerate([fixture.home_team, fixture.away_team] * 2)
+        ]
+        self.helper.create_player(player_name='outsider')
+        self.helper.create_eventtype(event_name='Goal')
+        self.helper.create_eventtype(event_name='Yellow Card')
+        self.helper.create_pitchposition(pitch_area_name='Box')
+
+    def test_add_events(self):
+        """Test a batch of events is stored with the match's season and league."""
+        payload = [
+            {
+                'event_type': 'Goal',
+                'player': player.player_name,
+                'associated_player': self.scorers[0].player_name,
+                'pitch_area': 'Box',
+                'minute': minute,
+                'second': 5,
+            }
+            for minute, player in enumerate(self.scorers[1:], start=10)
+        ]
+
+        with self.assertNumQueries(16):
+            res = self.staff_client.post(
+                match_events_url(self.match.match_id), payload, format='json',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 3)
+        events = MatchEvent.objects.filter(match=self.match).order_by('minute')
+        self.assertEqual(
+            [result['event_id'] for result in res.data['results']],
+            [event.event_id for event in events],
+        )
+        for event in events:
+            self.assertEqual(event.season_id, self.match.season_id)
+            self.assertEqual(event.league_id, self.match.league_id)
+            self.assertEqual(event.pitch_area.pitch_area_name, 'Box')
+
+    def test_add_events_updates_player_stats(self):
+        """Test player stats and cached responses see a batch of events."""
+        url = matches_url(self.season.season_name)
+        self.normal_client.get(url)
+        self.assertEqual(self.normal_client.get(url)['X-Cache'], 'HIT')
+        payload = [
+            {'event_type': 'Goal', 'player': 'scorer1', 'minute': 10},
+            {'event_type': 'Goal', 'player': 'scorer1', 'minute': 20},
+            {'event_type': 'Yellow Card', 'player': 'scorer2', 'minute': 30},
+        ]
+
+        self.staff_client.post(
+            match_events_url(self.match.match_id), payload, format='json',
+        )
+
+        stats = {
+            row.player.player_name: row
+            for row in PlayerSeasonStats.objects.filter(season=self.season)
+        }
+        self.assertEqual(stats['scorer1'].goals, 2)
+        self.assertEqual(stats['scorer1'].appearances, 1)
+        self.assertEqual(stats['scorer2'].yellow_cards, 1)
+        self.assertEqual(self.normal_client.get(url)['X-Cache'], 'MISS')
+
+    def test_add_events_skips_duplicates(self):
+        """Test events already stored or repeated in the batch are skipped."""
+        url = match_events_url(self.match.match_id)
+        self.staff_client.post(
+            url, [{'event_type': 'Goal', 'minute': 10, 'second': 5}], format='json',
+        )
+        payload = [
+            {'event_type': 'Goal', 'minute': 10, 'second': 5},
+            {'event_type': 'Goal', 'minute': 11},
+            {'event_type': 'Goal', 'minute': 11},
+            {'event_type': 'Yellow Card', 'minute': 10, 'second': 5},
+        ]
+
+        res = self.staff_client.post(url, payload, format='json')
+
+        self.assertEqual(
+            [result['status'] for result in res.data['results']],
+            ['duplicate', 'created', 'duplicate', 'created'],
+        )
+        self.assertEqual(res.data['duplicate'], 2)
+        self.assertEqual(MatchEvent.objects.filter(match=self.match).count(), 3)
+
+    def test_add_events_reports_invalid_items(self):
+        """Test invalid events are reported without rejecting the batch."""
+        payload = [
+            {'event_type': 'Goal', 'player': 'scorer1', 'minute': 1},
+            {'event_type': 'Header', 'minute': 2},
+            {'event_type': 'Goal', 'player': 'outsider', 'minute': 3},
+            {'event_type': 'Goal', 'pitch_area': 'Moon', 'minute': 4},
+            {'event_type': 'Goal', 'minute': -1},
+            'goal',
+        ]
+
+        res = self.staff_client.post(
+            match_events_url(self.match.match_id), payload, format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        results = res.data['results']
+        self.assertEqual(results[0]['status'], 'created')
+        self.assertIn('event_type', results[1]['errors'])
+        self.assertIn('player', results[2]['errors'])
+        self.assertIn('pitch_area', results[3]['errors'])
+        self.assertIn('minute', results[4]['errors'])
+        self.assertIn('non_field_errors', results[5]['errors'])
+        self.assertEqual(res.data['invalid'], 5)
+        self.assertEqual(MatchEvent.objects.count(), 1)
+
+    def test_add_events_rejects_malformed_batch(self):
+        """Test a body which is not a list of events, or too long, is rejected."""
+        url = match_events_url(self.match.match_id)
+        for payload in [{'event_type': 'Goal', 'minute': 1}, [{}] * 501]:
+            res = self.staff_client.post(url, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_add_events_by_normaluser_returns_error(self):
+        """Test only staff can add events to a match."""
+        res = self.normal_client.post(
+            match_events_url(self.match.match_id),
+            [{'event_type': 'Goal', 'minute': 1}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(MatchEvent.objects.exists())
+
+    def test_add_events_to_unknown_match_not_found(self):
+        """Test adding events to a missing match returns 404."""
+        res = self.staff_client.post(
+            match_events_url(999999),
+            [{'event_type': 'Goal', 'minute': 1}],
+            format='json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -2,24 +2,31 @@
 Views for the fixture APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from goal_maven.core.models import Season, Fixture, Match
+from goal_maven.core.authentication import CachedTokenAuthentication
+from goal_maven.core.match_events import MAX_EVENT_BATCH, ingest_match_events
+from goal_maven.core.models import Fixture, Match
+from goal_maven.core.pagination import StreamingListMixin
+from goal_maven.core.response_cache import SeasonResponseCacheMixin
+from goal_maven.core.seasons import get_season_or_404
 from goal_maven.fixture import serializers
 from django.core.exceptions import PermissionDenied
 # from django.shortcuts import get_object_or_404
+# from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
-# from rest_framework import generics
 
 from django.utils.translation import gettext_lazy as _
 
 # import pdb
 
 
-class BaseView(viewsets.ModelViewSet):
+class BaseView(SeasonResponseCacheMixin, StreamingListMixin,
+               viewsets.ModelViewSet):
     """BaseView containing common fields and methods."""
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     # def get_queryset(self):
@@ -49,13 +56,10 @@ class FixtureViewSet(BaseView):
 
     def list(self, request, *args, **kwargs):
         """Retrieve Fixture for requested season."""
-        season = Season.objects.get(
-            season_name=self.kwargs.get('season_name'),
-        )
-        queryset = self.get_queryset().filter(season=season)
-        serializer = self.get_serializer(queryset, many=True)
+        season = get_season_or_404(self.kwargs.get('season_name'))
+        queryset = self.get_queryset().filter(season_id=season.season_id)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.season_list_response(season, queryset)
 
     def create(self, request, *args, **kwargs):
         """Create a new Fixture object."""
@@ -91,13 +95,10 @@ class MatchViewSet(BaseView):
 
     def list(self, request, *args, **kwargs):
         """Retrieve Matches for requested season."""
-        season = Season.objects.get(
-            season_name=self.kwargs.get('season_name'),
-        )
-        queryset = self.get_queryset().filter(fixture__season=season)
-        serializer = self.get_serializer(queryset, many=True)
+        season = get_season_or_404(self.kwargs.get('season_name'))
+        queryset = self.get_queryset().filter(season_id=season.season_id)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.season_list_response(season, queryset)
 
     def create(self, request, *args, **kwargs):
         """Match object cannot be created directly."""
@@ -107,6 +108,39 @@ class MatchViewSet(BaseView):
         """Match object cannot be deleted directly."""
         raise PermissionDenied('Match object cannot be deleted directly.')
 
+    @action(detail=True, methods=['post'])
+    def events(self, request, *args, **kwargs):
+        """Add a batch of live events to a match, reporting each one's result."""
+        self.validate_staff(request)
+        match = self.get_object()
+        if not isinstance(request.data, list):
+            raise ValidationError(_('Expected a list of events.'))
+        if len(request.data) > MAX_EVENT_BATCH:
+            raise ValidationError(
+                _('A batch holds at most %(limit)d events.') % {'limit': MAX_EVENT_BATCH}
+            )
+
+        results = [None] * len(request.data)
+        events = {}
+        for index, item in enumerate(request.data):
+            serializer = serializers.MatchEventInputSerializer(data=item)
+            if serializer.is_valid():
+                events[index] = serializer.validated_data
+            else:
+                results[index] = {'status': 'invalid', 'errors': serializer.errors}
+        ingested = ingest_match_events(match, list(events.values()))
+        for index, result in zip(events, ingested):
+            results[index] = result
+
+        counts = {
+            result_status: sum(result['status'] == result_status for result in results)
+            for result_status in ['created', 'duplicate', 'invalid']
+        }
+        return Response(
+            {**counts, 'results': results},
+            status=status.HTTP_201_CREATED if counts['created'] else status.HTTP_200_OK,
+        )
+
     def get_serializer_class(self):
         """Return the serializer class for request."""
         if self.action == 'list':
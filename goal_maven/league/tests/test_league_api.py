@@ -1,6 +1,9 @@
 """
 Tests for League APIs.
 """
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -62,6 +65,7 @@ class PrivateLeagueApiTests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.staff_client = APIClient()
         self.normal_client = APIClient()
         self.helper = HelperMethods()
@@ -78,11 +82,33 @@ class PrivateLeagueApiTests(TestCase):
 
         res = self.normal_client.get(leagues_url(season.season_name))
 
-        leagues = League.objects.filter(season=season)
+        leagues = League.objects.filter(season=season).order_by('pk')
         serializer = LeagueSerializer(leagues, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_concluded_season_lists_cached_without_expiry(self):
+        """Test lists of a concluded season are cached until written to."""
+        season = self.helper.create_season(season_name='season1')
+        season.is_concluded = True
+        season.save()
+        league = self.helper.create_league(league_name='league1', season=season)
+
+        with mock.patch('goal_maven.core.response_cache.cache.set') as cache_set:
+            res = self.normal_client.get(leagues_url(season.season_name))
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertIsNone(cache_set.call_args[0][2])
+
+        self.normal_client.get(leagues_url(season.season_name))
+        res = self.normal_client.get(leagues_url(season.season_name))
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+        league.league_name = 'renamed'
+        league.save()
+        res = self.normal_client.get(leagues_url(season.season_name))
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['league_name'], 'renamed')
 
     def test_retrieve_league_tables(self):
         """Test retrieving a list of league tables of leagues."""
@@ -105,11 +131,13 @@ class PrivateLeagueApiTests(TestCase):
 
         res = self.normal_client.get(league_tables_url(season.season_name))
 
-        league_tables = models.LeagueTable.objects.filter(season=season)
+        league_tables = models.LeagueTable.objects.filter(
+            season=season,
+        ).order_by('pk')
 
         serializer = LeagueTableSerializer(league_tables, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_get_league_detail(self):
         """Test get league detail."""
@@ -2,14 +2,15 @@
 Views for the league APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from goal_maven.core.authentication import CachedTokenAuthentication
 from goal_maven.core.models import League, Season, LeagueTable
+from goal_maven.core.pagination import StreamingListMixin
+from goal_maven.core.response_cache import SeasonResponseCacheMixin
+from goal_maven.core.seasons import get_season_or_404
 from goal_maven.league import serializers
 from django.core.exceptions import PermissionDenied
 # from django.shortcuts import get_object_or_404
-from rest_framework.response import Response
-from rest_framework import status
 # from rest_framework import generics
 
 from django.utils.translation import gettext_lazy as _
@@ -17,9 +18,10 @@ from django.utils.translation import gettext_lazy as _
 # import pdb
 
 
-class BaseView(viewsets.ModelViewSet):
+class BaseView(SeasonResponseCacheMixin, StreamingListMixin,
+               viewsets.ModelViewSet):
     """BaseView containing common fields and methods."""
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     # def get_queryset(self):
@@ -27,13 +29,10 @@ class BaseView(viewsets.ModelViewSet):
     #     return self.queryset.filter(season=self.get_season())
 
     def list(self, request, *args, **kwargs):
-        season = Season.objects.get(
-            season_name=self.kwargs.get('season_name'),
-        )
-        queryset = self.get_queryset().filter(season=season)
-        serializer = self.get_serializer(queryset, many=True)
+        season = get_season_or_404(self.kwargs.get('season_name'))
+        queryset = self.get_queryset().filter(season_id=season.season_id)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.season_list_response(season, queryset)
 
     def create(self, request, *args, **kwargs):
         self.validate_staff(request)
@@ -4,7 +4,8 @@ Serializers for player APIs
 from rest_framework import serializers
 
 from goal_maven.core.models import Player
-from goal_maven.core import models
+from goal_maven.core.seasons import get_season_id
+from goal_maven.core.stats import cached_player_season_stats
 
 # import pdb
 
@@ -47,69 +48,42 @@ class PlayerStatsSerializer(serializers.Serializer):
         """get the season for stats"""
         return self.context.get('season_name')
 
+    def stats(self, player) -> dict:
+        """Get the precomputed stats row for a player in a season."""
+        if 'stats' not in self.context:
+            self.context['stats'] = cached_player_season_stats(
+                player, get_season_id(self.get_season(player)),
+            )
+
+        return self.context['stats']
+
     def get_goals(self, player) -> int:
         """Get goals for a player in a season."""
-        goals = models.MatchEvent.objects.filter(
-            player=player,
-            match__fixture__season__season_name=self.get_season(player),
-            event_type__event_name__in=['Goal', 'Penalty Goal', 'Free Kick Goal'],
-        )
-
-        return goals.count()
+        return self.stats(player)['goals']
 
     def get_assists(self, player) -> int:
         """Get assists for a player in a season."""
-        assists = models.MatchEvent.objects.filter(
-            associated_player=player,
-            event_type__event_name='Goal',
-        )
-
-        return assists.count()
+        return self.stats(player)['assists']
 
     def get_fouls(self, player) -> int:
         """Get fouls for a player in a season."""
-        fouls = models.MatchEvent.objects.filter(
-            player=player,
-            event_type__event_name__in=['Foul', 'Penalty Foul'],
-        )
-
-        return fouls.count()
+        return self.stats(player)['fouls']
 
     def get_yellow_cards(self, player) -> int:
         """Get yellow cards for a player in a season."""
-        yellow_cards = models.MatchEvent.objects.filter(
-            player=player,
-            event_type__event_name='Yellow Card',
-        )
-
-        return yellow_cards.count()
+        return self.stats(player)['yellow_cards']
 
     def get_red_cards(self, player) -> int:
         """Get red cards for a player in a season."""
-        red_cards = models.MatchEvent.objects.filter(
-            player=player,
-            event_type__event_name='Red Card',
-        )
-
-        return red_cards.count()
+        return self.stats(player)['red_cards']
 
     def get_shots_on(self, player) -> int:
         """Get shots on for a player in a season."""
-        shots_on = models.MatchEvent.objects.filter(
-            player=player,
-            event_type__event_name='Shot On',
-        )
-
-        return shots_on.count()
+        return self.stats(player)['shots_on']
 
     def get_own_goals(self, player) -> int:
         """Get own goals for a player in a season."""
-        own_goals = models.MatchEvent.objects.filter(
-            player=player,
-            event_type__event_name='Own Goal',
-        )
-
-        return own_goals.count()
+        return self.stats(player)['own_goals']
 
     class Meta(PlayerSerializer.Meta):
         fields = ['player_id', 'player_name', 'team', 'season', 'goals', 'assists',
@@ -1,13 +1,17 @@
 """
 Tests for player APIs.
 """
-from django.test import TestCase
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from goal_maven.core.models import Player
+from goal_maven.core.models import Player, PlayerSeasonStats
+from goal_maven.core.stats import player_stats_cache_key
 
 from goal_maven.core.tests.helper_methods import HelperMethods
 
@@ -36,6 +40,11 @@ def stats_url(player_id, season_name):
     return reverse('player:player-season-stats', args=[player_id, season_name])
 
 
+def async_stats_url(player_id, season_name):
+    """Create and return an async player stats URL."""
+    return reverse('player:player-season-stats-async', args=[player_id, season_name])
+
+
 class PublicPlayerAPITests(TestCase):
     """Test unauthenticated API requests."""
 
@@ -53,6 +62,7 @@ class PrivatePlayerApiTests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.staff_client = APIClient()
         self.normal_client = APIClient()
         self.helper = HelperMethods()
@@ -71,7 +81,42 @@ class PrivatePlayerApiTests(TestCase):
         players = Player.objects.all().order_by('player_id')
         serializer = PlayerSerializer(players, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_retrieve_players_paginated_by_cursor(self):
+        """Test following the cursor through every page of players."""
+        for i in range(5):
+            self.helper.create_player(player_name=f'Player{i}')
+
+        url = PLAYERS_URL + '?page_size=2'
+        results = []
+        pages = 0
+        while url:
+            res = self.normal_client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data['results']), 2)
+            results += res.data['results']
+            url = res.data['next']
+            pages += 1
+
+        players = Player.objects.all().order_by('player_id')
+        serializer = PlayerSerializer(players, many=True)
+        self.assertEqual(pages, 3)
+        self.assertEqual(results, serializer.data)
+
+    def test_stream_players(self):
+        """Test streaming every player as one JSON array."""
+        for i in range(5):
+            self.helper.create_player(player_name=f'Player{i}')
+
+        res = self.normal_client.get(PLAYERS_URL, {'stream': 'true'})
+
+        players = Player.objects.all().order_by('player_id')
+        serializer = PlayerSerializer(players, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        content = b''.join(res.streaming_content)
+        self.assertEqual(json.loads(content), json.loads(json.dumps(serializer.data)))
 
     def test_get_player_detail(self):
         """Test get player detail."""
@@ -325,3 +370,204 @@ class PrivatePlayerApiTests(TestCase):
         self.assertEqual(res.data['red_cards'], 1)
         self.assertEqual(res.data['shots_on'], 1)
         self.assertEqual(res.data['own_goals'], 1)
+
+    def test_player_stats_query_count_is_constant(self):
+        """Test player stats are computed with a constant number of queries."""
+        season = self.helper.create_season(season_name='2022-2023')
+        fixture = self.helper.create_fixture(season=season)
+        match = self.helper.create_match(fixture=fixture)
+        player = self.helper.create_player(player_name='testplayer1')
+        url = stats_url(player.player_id, season.season_name)
+
+        for event_type in ['Goal', 'Foul', 'Yellow Card', 'Red Card', 'Own Goal']:
+            self.helper.create_matchevent(
+                match=match,
+                event_type=event_type,
+                player=player,
+            )
+        with self.assertNumQueries(3):
+            res = self.normal_client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for minute in range(5):
+                self.helper.create_matchevent(
+                    match=match,
+                    event_type='Shot On',
+                    player=player,
+                    minute=minute,
+                )
+        with self.assertNumQueries(2):
+            res = self.normal_client.get(url)
+        self.assertEqual(res.data['shots_on'], 5)
+
+    def test_player_stats_are_season_scoped(self):
+        """Test every player stat counter is restricted to the season."""
+        season = self.helper.create_season(season_name='2022-2023')
+        season1 = self.helper.create_season(season_name='2021-2022')
+        match = self.helper.create_match(
+            fixture=self.helper.create_fixture(season=season),
+        )
+        match1 = self.helper.create_match(
+            fixture=self.helper.create_fixture(season=season1),
+        )
+        player = self.helper.create_player(player_name='testplayer1')
+        for event_type in ['Goal', 'Foul', 'Yellow Card', 'Red Card', 'Shot On',
+                           'Own Goal']:
+            self.helper.create_matchevent(
+                match=match1,
+                event_type=event_type,
+                player=player,
+            )
+        self.helper.create_matchevent(
+            match=match1,
+            event_type='Goal',
+            associated_player=player,
+        )
+        self.helper.create_matchevent(
+            match=match,
+            event_type='Foul',
+            player=player,
+        )
+
+        res = self.normal_client.get(stats_url(player.player_id, season.season_name))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['fouls'], 1)
+        for field in ['goals', 'assists', 'yellow_cards', 'red_cards', 'shots_on',
+                      'own_goals']:
+            self.assertEqual(res.data[field], 0)
+
+    def test_player_stats_cache_invalidated_on_event_change(self):
+        """Test cached player stats are refreshed when match events change."""
+        season = self.helper.create_season(season_name='2022-2023')
+        match = self.helper.create_match(
+            fixture=self.helper.create_fixture(season=season),
+        )
+        player = self.helper.create_player(player_name='testplayer1')
+        url = stats_url(player.player_id, season.season_name)
+        event = self.helper.create_matchevent(
+            match=match,
+            event_type='Goal',
+            player=player,
+        )
+
+        res = self.normal_client.get(url)
+        self.assertEqual(res.data['goals'], 1)
+        with self.assertNumQueries(1):
+            res = self.normal_client.get(url)
+        self.assertEqual(res.data['goals'], 1)
+
+        event.player = self.helper.create_player(player_name='testplayer2')
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        res = self.normal_client.get(url)
+        self.assertEqual(res.data['goals'], 0)
+
+        event.player = player
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        self.assertEqual(self.normal_client.get(url).data['goals'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertEqual(self.normal_client.get(url).data['goals'], 0)
+
+    def test_player_stats_invalidated_on_commit(self):
+        """Test cached player stats are kept until the event write commits."""
+        season = self.helper.create_season(season_name='2022-2023')
+        match = self.helper.create_match(
+            fixture=self.helper.create_fixture(season=season),
+        )
+        player = self.helper.create_player(player_name='testplayer1')
+        url = stats_url(player.player_id, season.season_name)
+        self.normal_client.get(url)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.helper.create_matchevent(match=match, event_type='Goal', player=player)
+        self.assertEqual(self.normal_client.get(url).data['goals'], 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.normal_client.get(url).data['goals'], 1)
+
+    def test_player_stats_read_from_season_stats_table(self):
+        """Test player stats are served from the PlayerSeasonStats table."""
+        season = self.helper.create_season(season_name='2022-2023')
+        player = self.helper.create_player(player_name='testplayer1')
+        PlayerSeasonStats.objects.create(
+            player=player,
+            season=season,
+            goals=7,
+            assists=3,
+        )
+
+        res = self.normal_client.get(stats_url(player.player_id, season.season_name))
+
+        self.assertEqual(res.data['goals'], 7)
+        self.assertEqual(res.data['assists'], 3)
+
+    def test_player_stats_unknown_season_not_found(self):
+        """Test retrieving player stats of a missing season returns 404."""
+        player = self.helper.create_player(player_name='testplayer1')
+
+        res = self.normal_client.get(stats_url(player.player_id, 'no season'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncPlayerStatsApiTests(TransactionTestCase):
+    """Test the async player stats API, whose queries run on other connections."""
+
+    def setUp(self):
+        cache.clear()
+        self.helper = HelperMethods()
+        self.client = APIClient()
+
+    def test_async_player_stats_match_sync(self):
+        """Test the async player stats equal the sync player stats."""
+        season = self.helper.create_season(season_name='2022-2023')
+        player = self.helper.create_player(player_name='testplayer1')
+        PlayerSeasonStats.objects.create(
+            player=player,
+            season=season,
+            goals=7,
+            assists=3,
+        )
+        user = self.helper.get_user()
+        self.client.force_authenticate(user=user)
+
+        res = self.client.get(async_stats_url(player.player_id, season.season_name))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['goals'], 7)
+        self.assertEqual(res.json()['assists'], 3)
+        self.assertEqual(
+            res.json(),
+            self.client.get(stats_url(player.player_id, season.season_name)).json(),
+        )
+
+    def test_async_player_stats_not_found(self):
+        """Test async player stats of a missing season or player return 404."""
+        season = self.helper.create_season(season_name='2022-2023')
+        player = self.helper.create_player(player_name='testplayer1')
+
+        res = self.client.get(async_stats_url(player.player_id, 'no season'))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(async_stats_url(999999, season.season_name))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn('detail', res.json())
+
+    def test_async_player_stats_cached_for_found_players(self):
+        """Test async player stats are only cached for players which exist."""
+        season = self.helper.create_season(season_name='2022-2023')
+        player = self.helper.create_player(player_name='testplayer1')
+
+        self.client.get(async_stats_url(999999, season.season_name))
+        self.client.get(async_stats_url(player.player_id, season.season_name))
+
+        self.assertIsNone(cache.get(player_stats_cache_key(999999, season.season_id)))
+        self.assertIsNotNone(
+            cache.get(player_stats_cache_key(player.player_id, season.season_id)),
+        )
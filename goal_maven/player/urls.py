@@ -23,4 +23,9 @@ urlpatterns = [
         views.PlayerStatsView.as_view(),
         name='player-season-stats',
     ),
+    path(
+        'async/stats/<int:pk>/<str:season_name>/',
+        views.AsyncPlayerStatsView.as_view(),
+        name='player-season-stats-async',
+    ),
 ]
@@ -2,12 +2,21 @@
 Views for the player APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from goal_maven.core.authentication import CachedTokenAuthentication
+from goal_maven.core.async_views import AsyncStatsView, gather_queries, run_sync_query
 from goal_maven.core.models import Player
 # from goal_maven.core import models
 from goal_maven.player import serializers
+from goal_maven.core.pagination import StreamingListMixin
+from goal_maven.core.seasons import get_season_or_404
+from goal_maven.core.stats import (
+    cache_player_season_stats,
+    cached_player_season_stats,
+    read_player_season_stats,
+)
 from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
@@ -18,11 +27,11 @@ from django.utils.translation import gettext_lazy as _
 # import pdb
 
 
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """View for manage player APIs."""
     serializer_class = serializers.PlayerDetailSerializer
     queryset = Player.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     # def get_queryset(self):
@@ -67,9 +76,36 @@ class PlayerStatsView(generics.GenericAPIView):
     def get(self, request, *args, **kwargs):
 
         player = get_object_or_404(Player, pk=kwargs.get('pk'))
+        season = get_season_or_404(kwargs.get('season_name'))
         serializer = self.get_serializer(
             player,
-            context={'season_name': kwargs.get('season_name')},
+            context={
+                'season_name': season.season_name,
+                'stats': cached_player_season_stats(player, season.season_id),
+            },
         )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncPlayerStatsView(AsyncStatsView):
+    """PlayerStatsView reading the player and its stats concurrently."""
+
+    async def get(self, request, pk, season_name):
+        season = await run_sync_query(lambda: get_season_or_404(season_name))
+        player, (player_stats, cached) = await gather_queries(
+            lambda: get_object_or_404(Player, pk=pk),
+            lambda: read_player_season_stats(pk, season.season_id),
+        )
+        # Stats are cached once the player is found, so requests for
+        # missing pks cannot fill the cache.
+        if not cached:
+            await run_sync_query(
+                lambda: cache_player_season_stats(pk, season.season_id, player_stats),
+            )
+        serializer = serializers.PlayerStatsSerializer(
+            player,
+            context={'season_name': season.season_name, 'stats': player_stats},
+        )
+
+        return JsonResponse(serializer.data)
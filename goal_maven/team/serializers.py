@@ -5,7 +5,8 @@ from rest_framework import serializers
 
 from goal_maven.core.models import Team
 from goal_maven.core import models
-from django.db.models import Count
+from goal_maven.core import stats
+from goal_maven.core.seasons import get_season_id
 
 # import pdb
 
@@ -52,12 +53,23 @@ class TeamStatsSerializer(serializers.Serializer):
         """get the season for stats"""
         return self.context.get('season_name')
 
+    def season_id(self, season_name) -> int:
+        """Get the id of the season, resolved once per serialization."""
+        if 'season_id' not in self.context:
+            self.context['season_id'] = get_season_id(season_name)
+
+        return self.context['season_id']
+
     def stat(self, team, season_name) -> type(models.LeagueTable):
-        """Get stats for a team in a season."""
-        return models.LeagueTable.objects.get(
-            team=team,
-            season__season_name=season_name,
-        )
+        """Get stats for a team in a season, fetched once per serialization."""
+        league_tables = self.context.setdefault('league_tables', {})
+        if team.pk not in league_tables:
+            league_tables[team.pk] = models.LeagueTable.objects.get(
+                team=team,
+                season_id=self.season_id(season_name),
+            )
+
+        return league_tables[team.pk]
 
     def get_points(self, team) -> int:
         """Get points for a team in a season."""
@@ -113,61 +125,31 @@ class TeamStatsSerializer(serializers.Serializer):
 
         return stat.goal_difference
 
-    def get_most_goals(self, team) -> int:
+    def leaders(self, team) -> dict:
+        """Get the leaderboards of a team, fetched once per serialization."""
+        team_leaders = self.context.setdefault('team_leaders', {})
+        if team.pk not in team_leaders:
+            season_id = self.season_id(self.get_season(team))
+            leaders = stats.team_leaders(season_id, [team.pk])
+            team_leaders[team.pk] = leaders[team.pk]
+
+        return team_leaders[team.pk]
+
+    def get_most_goals(self, team) -> dict:
         """Get player with most goals for a team in a season."""
-        goal_scorers = models.MatchEvent.objects.filter(
-            match__fixture__season__season_name=self.get_season(team),
-            event_type__event_name__in=['Goal', 'Penalty Goal', 'Free Kick Goal'],
-            player__team=team,
-        ).values('player__player_name').annotate(
-            total_goals=Count('player__player_name')
-        ).order_by('-total_goals')
-
-        if goal_scorers:
-            return goal_scorers[0]
-        return None
-
-    def get_most_assists(self, team) -> int:
+        return self.leaders(team)['most_goals']
+
+    def get_most_assists(self, team) -> dict:
         """Get player with most assists for a team in a season."""
-        assisting_players = models.MatchEvent.objects.filter(
-            match__fixture__season__season_name=self.get_season(team),
-            event_type__event_name='Goal',
-            associated_player__team=team,
-        ).values('associated_player__player_name').annotate(
-            total_assists=Count('associated_player__player_name')
-        ).order_by('-total_assists')
-
-        if assisting_players:
-            return assisting_players[0]
-        return None
-
-    def get_most_yellow_cards(self, team) -> int:
+        return self.leaders(team)['most_assists']
+
+    def get_most_yellow_cards(self, team) -> dict:
         """Get player with most yellow cards for a team in a season."""
-        yellow_card_players = models.MatchEvent.objects.filter(
-            match__fixture__season__season_name=self.get_season(team),
-            event_type__event_name='Yellow Card',
-            player__team=team,
-        ).values('player__player_name').annotate(
-            total_yellow_cards=Count('player__player_name')
-        ).order_by('-total_yellow_cards')
-
-        if yellow_card_players:
-            return yellow_card_players[0]
-        return None
-
-    def get_most_red_cards(self, team) -> int:
+        return self.leaders(team)['most_yellow_cards']
+
+    def get_most_red_cards(self, team) -> dict:
         """Get player with most red cards for a team in a season."""
-        red_card_players = models.MatchEvent.objects.filter(
-            match__fixture__season__season_name=self.get_season(team),
-            event_type__event_name='Red Card',
-            player__team=team,
-        ).values('player__player_name').annotate(
-            total_red_cards=Count('player__player_name')
-        ).order_by('-total_red_cards')
-
-        if red_card_players:
-            return red_card_players[0]
-        return None
+        return self.leaders(team)['most_red_cards']
 
     class Meta(TeamSerializer.Meta):
         fields = TeamSerializer.Meta.fields + ['season', 'points', 'position',
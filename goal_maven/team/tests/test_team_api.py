@@ -1,7 +1,8 @@
 """
 Tests for Team APIs.
 """
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
 from django.urls import reverse
 
 from rest_framework import status
@@ -9,6 +10,7 @@ from rest_framework.test import APIClient
 
 from goal_maven.core.models import Team
 from goal_maven.core import models
+from goal_maven.core import stats
 
 from goal_maven.core.tests.helper_methods import HelperMethods
 
@@ -36,6 +38,21 @@ def stats_url(team_id, season_name):
     return reverse('team:team-season-stats', args=[team_id, season_name])
 
 
+def league_stats_url(league_id, season_name):
+    """Create and return a league team stats URL."""
+    return reverse('team:league-team-stats', args=[league_id, season_name])
+
+
+def async_stats_url(team_id, season_name):
+    """Create and return an async team stats URL."""
+    return reverse('team:team-season-stats-async', args=[team_id, season_name])
+
+
+def async_league_stats_url(league_id, season_name):
+    """Create and return an async league team stats URL."""
+    return reverse('team:league-team-stats-async', args=[league_id, season_name])
+
+
 class PublicTeamAPITests(TestCase):
     """Test unauthenticated API requests."""
 
@@ -71,7 +88,7 @@ class PrivateTeamApiTests(TestCase):
         teams = Team.objects.all().order_by('team_id')
         serializer = TeamSerializer(teams, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_get_team_detail(self):
         """Test get team detail."""
@@ -346,3 +363,217 @@ class PrivateTeamApiTests(TestCase):
             player1.player_name,
         )
         self.assertEqual(res.data['most_red_cards']['total_red_cards'], 1)
+
+    def test_team_stats_query_count(self):
+        """Test team stats read the league table and leaderboards once, cache cold."""
+        season = self.helper.create_season(season_name='2022-2023')
+        league = self.helper.create_league(league_name='my league')
+        team = self.helper.create_team(team_name='my team')
+        models.LeagueTable.objects.create(
+            league=league,
+            season=season,
+            team=team,
+            points=80,
+            position=1,
+        )
+
+        cache.clear()
+        with self.assertNumQueries(2):
+            res = self.normal_client.get(stats_url(team.team_id, season.season_name))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['points'], 80)
+        self.assertIsNone(res.data['most_goals'])
+
+    def test_team_stats_not_found(self):
+        """Test team stats of a missing season, team or league table return 404."""
+        season = self.helper.create_season(season_name='2022-2023')
+        team = self.helper.create_team(team_name='my team')
+
+        for url in [
+            stats_url(team.team_id, 'no season'),
+            stats_url(999999, season.season_name),
+            stats_url(team.team_id, season.season_name),
+        ]:
+            res = self.normal_client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_league_team_leaders_single_query(self):
+        """Test leaders of every team in a league are computed in one query."""
+        season = self.helper.create_season(season_name='2022-2023')
+        league = self.helper.create_league(league_name='my league', season=season)
+        team = self.helper.create_team(team_name='my team', league=league)
+        team2 = self.helper.create_team(team_name='my team2', league=league)
+        player1 = self.helper.create_player(player_name='my player1', team=team)
+        player2 = self.helper.create_player(player_name='my player2', team=team2)
+        fixture = self.helper.create_fixture(
+            home_team=team,
+            away_team=team2,
+            season=season,
+            league=league,
+        )
+        match = self.helper.create_match(fixture=fixture)
+        for minute, player in [(10, player1), (20, player1), (30, player2)]:
+            self.helper.create_matchevent(
+                match=match,
+                player=player,
+                event_type='Goal',
+                associated_player=player2,
+                minute=minute,
+            )
+        for position, table_team in enumerate([team, team2], start=1):
+            self.helper.create_leaguetable(
+                team=table_team,
+                season=season,
+                league=league,
+                position=position,
+            )
+
+        with self.assertNumQueries(1):
+            leaders = stats.league_team_leaders(league.league_id, season.season_id)
+
+        self.assertEqual(leaders[team.team_id]['most_goals'], {
+            'player__player_name': player1.player_name,
+            'total_goals': 2,
+        })
+        self.assertIsNone(leaders[team.team_id]['most_assists'])
+        self.assertEqual(leaders[team2.team_id]['most_goals']['total_goals'], 1)
+        self.assertEqual(leaders[team2.team_id]['most_assists'], {
+            'associated_player__player_name': player2.player_name,
+            'total_assists': 3,
+        })
+        self.assertIsNone(leaders[team2.team_id]['most_red_cards'])
+
+    def test_retrieve_league_team_stats(self):
+        """Test retrieving stats of every team of a league in a season."""
+        season = self.helper.create_season(season_name='2022-2023')
+        league = self.helper.create_league(league_name='my league', season=season)
+        teams = [
+            self.helper.create_team(team_name=f'my team{i}', league=league)
+            for i in range(2)
+        ]
+        player = self.helper.create_player(player_name='my player', team=teams[0])
+        fixture = self.helper.create_fixture(
+            home_team=teams[0],
+            away_team=teams[1],
+            season=season,
+            league=league,
+        )
+        self.helper.create_matchevent(
+            match=self.helper.create_match(fixture=fixture),
+            player=player,
+            event_type='Goal',
+        )
+        for position, team in enumerate(teams, start=1):
+            self.helper.create_leaguetable(
+                team=team,
+                season=season,
+                league=league,
+                position=position,
+                points=10 - position,
+            )
+        url = league_stats_url(league.league_id, season.season_name)
+
+        with self.assertNumQueries(3):
+            res = self.normal_client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            [self.normal_client.get(stats_url(team.team_id, season.season_name)).data
+             for team in teams],
+        )
+        self.assertEqual(res.data[0]['most_goals']['total_goals'], 1)
+
+        for i in range(2, 6):
+            self.helper.create_leaguetable(
+                team=self.helper.create_team(team_name=f'my team{i}', league=league),
+                season=season,
+                league=league,
+                position=i + 1,
+            )
+        with self.assertNumQueries(2):
+            res = self.normal_client.get(url)
+        self.assertEqual(len(res.data), 6)
+
+    def test_retrieve_league_team_stats_unknown_league(self):
+        """Test retrieving league team stats of a missing league returns 404."""
+        res = self.normal_client.get(league_stats_url(999999, '2022-2023'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncTeamStatsApiTests(TransactionTestCase):
+    """Test the async team stats APIs, whose queries run on other connections."""
+
+    def setUp(self):
+        self.helper = HelperMethods()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.helper.get_user())
+        self.season = self.helper.create_season(season_name='2022-2023')
+        self.league = self.helper.create_league(
+            league_name='my league',
+            season=self.season,
+        )
+        self.teams = [
+            self.helper.create_team(team_name=f'my team{i}', league=self.league)
+            for i in range(2)
+        ]
+        player = self.helper.create_player(player_name='my player', team=self.teams[0])
+        fixture = self.helper.create_fixture(
+            home_team=self.teams[0],
+            away_team=self.teams[1],
+            season=self.season,
+            league=self.league,
+        )
+        self.helper.create_matchevent(
+            match=self.helper.create_match(fixture=fixture),
+            player=player,
+            event_type='Goal',
+        )
+        for position, team in enumerate(self.teams, start=1):
+            self.helper.create_leaguetable(
+                team=team,
+                season=self.season,
+                league=self.league,
+                position=position,
+                points=10 - position,
+            )
+
+    def test_async_team_stats_match_sync(self):
+        """Test the async team stats equal the sync team stats."""
+        team = self.teams[0]
+
+        res = self.client.get(async_stats_url(team.team_id, self.season.season_name))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['points'], 9)
+        self.assertEqual(res.json()['most_goals']['total_goals'], 1)
+        self.assertEqual(
+            res.json(),
+            self.client.get(stats_url(team.team_id, self.season.season_name)).json(),
+        )
+
+    def test_async_league_team_stats_match_sync(self):
+        """Test the async league team stats equal the sync league team stats."""
+        season_name = self.season.season_name
+
+        res = self.client.get(async_league_stats_url(self.league.league_id, season_name))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()), 2)
+        self.assertEqual(
+            res.json(),
+            self.client.get(league_stats_url(self.league.league_id, season_name)).json(),
+        )
+
+    def test_async_team_stats_not_found(self):
+        """Test async team stats of a missing team, league or season return 404."""
+        season_name = self.season.season_name
+        for url in [
+            async_stats_url(999999, season_name),
+            async_stats_url(self.teams[0].team_id, 'no season'),
+            async_league_stats_url(999999, season_name),
+        ]:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -23,4 +23,19 @@ urlpatterns = [
         views.TeamStatsView.as_view(),
         name='team-season-stats',
     ),
+    path(
+        'stats/league/<int:league_id>/<str:season_name>/',
+        views.LeagueTeamStatsView.as_view(),
+        name='league-team-stats',
+    ),
+    path(
+        'async/stats/<int:pk>/<str:season_name>/',
+        views.AsyncTeamStatsView.as_view(),
+        name='team-season-stats-async',
+    ),
+    path(
+        'async/stats/league/<int:league_id>/<str:season_name>/',
+        views.AsyncLeagueTeamStatsView.as_view(),
+        name='league-team-stats-async',
+    ),
 ]
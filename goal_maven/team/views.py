@@ -2,12 +2,17 @@
 Views for the team APIs
 """
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from goal_maven.core.models import Team
+from goal_maven.core.authentication import CachedTokenAuthentication
+from goal_maven.core.async_views import AsyncStatsView, gather_queries, run_sync_query
+from goal_maven.core.models import Team, League, LeagueTable
 # from goal_maven.core import models
+from goal_maven.core import stats
+from goal_maven.core.pagination import StreamingListMixin
+from goal_maven.core.seasons import get_season_or_404
 from goal_maven.team import serializers
 from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
@@ -18,11 +23,11 @@ from django.utils.translation import gettext_lazy as _
 # import pdb
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """View for manage team APIs."""
     serializer_class = serializers.TeamDetailSerializer
     queryset = Team.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     # def get_queryset(self):
@@ -60,16 +65,126 @@ class TeamViewSet(viewsets.ModelViewSet):
             )
 
 
+def team_league_table(team_id, season_id):
+    """Get the league table row of a team in a season with its team, 404 if none."""
+    league_table = LeagueTable.objects.filter(
+        team_id=team_id,
+        season_id=season_id,
+    ).select_related('team').first()
+    if league_table is None:
+        get_object_or_404(Team, pk=team_id)
+        raise Http404(_('The team has no league table in this season.'))
+
+    return league_table
+
+
+def league_tables_of_season(league_id, season_id) -> list:
+    """Get the league table rows of a league in a season with their teams."""
+    league_tables = list(LeagueTable.objects.filter(
+        league_id=league_id,
+        season_id=season_id,
+    ).select_related('team').order_by('position', 'team_id'))
+    if not league_tables:
+        get_object_or_404(League, pk=league_id)
+
+    return league_tables
+
+
+def league_team_stats_context(season, league_tables, team_leaders) -> dict:
+    """Get the TeamStatsSerializer context of the teams of a league."""
+    return {
+        'season_name': season.season_name,
+        'season_id': season.season_id,
+        'league_tables': {
+            league_table.team_id: league_table
+            for league_table in league_tables
+        },
+        'team_leaders': {
+            league_table.team_id: team_leaders[league_table.team_id]
+            for league_table in league_tables
+        },
+    }
+
+
 class TeamStatsView(generics.GenericAPIView):
     """View for returning goals of a team."""
     serializer_class = serializers.TeamStatsSerializer
 
     def get(self, request, *args, **kwargs):
 
-        team = get_object_or_404(Team, pk=kwargs.get('pk'))
+        season_name = kwargs.get('season_name')
+        # The season is joined by name, so a cold season cache costs no query.
+        league_table = LeagueTable.objects.filter(
+            team_id=kwargs.get('pk'),
+            season__season_name=season_name,
+        ).select_related('team').first()
+        if league_table is None:
+            # Raises the 404 of whichever of the season, team or row is missing.
+            season = get_season_or_404(season_name)
+            league_table = team_league_table(kwargs.get('pk'), season.season_id)
+        serializer = self.get_serializer(
+            league_table.team,
+            context={
+                'season_name': season_name,
+                'season_id': league_table.season_id,
+                'league_tables': {league_table.team_id: league_table},
+            },
+        )
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class LeagueTeamStatsView(generics.GenericAPIView):
+    """View for returning stats of every team of a league in a season."""
+    serializer_class = serializers.TeamStatsSerializer
+
+    def get(self, request, *args, **kwargs):
+
+        league_id = kwargs.get('league_id')
+        season = get_season_or_404(kwargs.get('season_name'))
+        league_tables = league_tables_of_season(league_id, season.season_id)
+        team_leaders = {}
+        if league_tables:
+            team_leaders = stats.league_team_leaders(league_id, season.season_id)
         serializer = self.get_serializer(
-            team,
-            context={'season_name': kwargs.get('season_name')},
+            [league_table.team for league_table in league_tables],
+            many=True,
+            context=league_team_stats_context(season, league_tables, team_leaders),
         )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncTeamStatsView(AsyncStatsView):
+    """TeamStatsView reading the league table and leaderboards concurrently."""
+
+    async def get(self, request, pk, season_name):
+        season = await run_sync_query(lambda: get_season_or_404(season_name))
+        league_table, team_leaders = await gather_queries(
+            lambda: team_league_table(pk, season.season_id),
+            lambda: stats.team_leaders(season.season_id, [pk]),
+        )
+        serializer = serializers.TeamStatsSerializer(
+            league_table.team,
+            context=league_team_stats_context(season, [league_table], team_leaders),
+        )
+
+        return JsonResponse(serializer.data)
+
+
+class AsyncLeagueTeamStatsView(AsyncStatsView):
+    """LeagueTeamStatsView reading the league tables and leaderboards concurrently."""
+
+    async def get(self, request, league_id, season_name):
+        season = await run_sync_query(lambda: get_season_or_404(season_name))
+        league_tables, team_leaders = await gather_queries(
+            lambda: league_tables_of_season(league_id, season.season_id),
+            lambda: stats.league_team_leaders(league_id, season.season_id),
+        )
+        serializer = serializers.TeamStatsSerializer(
+            [league_table.team for league_table in league_tables],
+            many=True,
+            context=league_team_stats_context(season, league_tables, team_leaders),
+        )
+
+        return JsonResponse(serializer.data, safe=False)
@@ -5,6 +5,7 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -224,3 +225,18 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.favorite_team, payload['favorite_team'])
         self.assertEqual(self.user.favorite_players, payload['favorite_players'])
         self.assertTrue(self.user.check_password(payload['password']))
+
+    def test_update_user_profile_keeps_saves_of_other_processes(self):
+        """Test updates do not save over a cached copy of the user."""
+        token = Token.objects.create(user=self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(last_name='renamed')
+
+        res = client.patch(ME_URL, {'first_name': 'updatedtest'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'updatedtest')
+        self.assertEqual(self.user.last_name, 'renamed')
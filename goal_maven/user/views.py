@@ -1,10 +1,12 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from goal_maven.core.authentication import CachedTokenAuthentication
 from goal_maven.user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
@@ -25,9 +27,18 @@ class CreateTokenView(ObtainAuthToken):
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        """Retrieve and return the authenticated user."""
-        return self.request.user
+        """Retrieve and return the authenticated user.
+
+        Updates load the user again, as the authenticated one may be a copy
+        cached before another process saved it.
+        """
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+
+        return generics.get_object_or_404(
+            get_user_model(), pk=self.request.user.pk, is_active=True,
+        )